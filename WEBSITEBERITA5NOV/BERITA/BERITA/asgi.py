@@ -3,6 +3,10 @@ ASGI config for BERITA project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Di ASGI, endpoint baca async native tersedia di /api/async/BERITA/...
+(FITURBERITA/async_views.py) tanpa perpindahan ke thread executor per request.
+Contoh: uvicorn BERITA.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
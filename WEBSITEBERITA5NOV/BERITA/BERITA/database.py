@@ -0,0 +1,112 @@
+"""
+BERITA/database.py
+Susun settings.DATABASES dari environment (.env lewat decouple)
+
+DB_ENGINE=sqlite (default)
+    File db.sqlite3 dengan tuning untuk banyak pembaca + penulis bersamaan.
+    PRAGMA dijalankan setiap kali koneksi baru dibuat (OPTIONS init_command):
+        journal_mode=WAL      : pembaca tidak lagi diblok penulis (dan sebaliknya)
+        synchronous=NORMAL    : fsync hanya saat checkpoint; aman dengan WAL
+        mmap_size, cache_size : baca halaman lewat memory map / page cache lebih besar
+        temp_store=MEMORY     : sort/temp b-tree di memori
+    Busy timeout (OPTIONS timeout) membuat penulis menunggu lock alih-alih
+    langsung gagal "database is locked", dan transaction_mode IMMEDIATE
+    mengambil write lock di awal transaksi sehingga upgrade read -> write
+    di tengah transaksi (yang tidak bisa menunggu busy timeout) tidak terjadi.
+
+DB_ENGINE=postgresql
+    DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+    DB_POOL=True memakai connection pool bawaan Django (butuh psycopg 3);
+    dengan pool, CONN_MAX_AGE harus 0 (koneksi dikembalikan ke pool)
+
+DB_REPLICAS (opsional, dipisah koma) menambah alias replica_1, replica_2, ...
+dengan konfigurasi yang sama seperti default: untuk SQLite berisi path file,
+untuk PostgreSQL berisi host. Routing baca ada di FITURBERITA/replica.py.
+
+Untuk keduanya: CONN_MAX_AGE (DB_CONN_MAX_AGE) membuat koneksi dipakai ulang
+antar request, dan CONN_HEALTH_CHECKS memeriksa koneksi lama sebelum dipakai.
+"""
+
+DEFAULT_SQLITE_PRAGMA = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negatif = KiB, jadi 64 MiB
+    'temp_store': 'MEMORY',
+}
+
+
+def init_command_sqlite(pragma):
+    """Ubah dict pragma menjadi init_command SQLite (dipisah ';')"""
+    return ';'.join(f'PRAGMA {nama}={nilai}' for nama, nilai in pragma.items())
+
+
+def opsi_sqlite(pragma=None, timeout=20, transaction_mode='IMMEDIATE'):
+    """OPTIONS untuk backend sqlite3"""
+    opsi = {
+        'init_command': init_command_sqlite({**DEFAULT_SQLITE_PRAGMA, **(pragma or {})}),
+        'timeout': timeout,
+    }
+    if transaction_mode:
+        opsi['transaction_mode'] = transaction_mode
+    return opsi
+
+
+def database_dari_env(config, base_dir):
+    """Return dict untuk settings.DATABASES['default']"""
+    engine = config('DB_ENGINE', default='sqlite')
+    database = {
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_HEALTH_CHECKS', default=True, cast=bool),
+    }
+
+    if engine == 'sqlite':
+        database.update({
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(base_dir / 'db.sqlite3')),
+            'OPTIONS': opsi_sqlite(
+                pragma={
+                    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+                    'mmap_size': config('SQLITE_MMAP_SIZE', default=DEFAULT_SQLITE_PRAGMA['mmap_size'], cast=int),
+                    'cache_size': config('SQLITE_CACHE_SIZE', default=DEFAULT_SQLITE_PRAGMA['cache_size'], cast=int),
+                },
+                timeout=config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
+                transaction_mode=config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE') or None,
+            ),
+        })
+        return database
+
+    if engine in ('postgresql', 'postgres'):
+        database.update({
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='berita'),
+            'USER': config('DB_USER', default='berita'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'OPTIONS': {},
+        })
+        if config('DB_POOL', default=False, cast=bool):
+            database['CONN_MAX_AGE'] = 0
+            database['OPTIONS']['pool'] = {
+                'min_size': config('DB_POOL_MIN', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX', default=10, cast=int),
+            }
+        return database
+
+    raise ValueError(f'DB_ENGINE tidak dikenal: {engine!r} (pilih sqlite atau postgresql)')
+
+
+def replika_dari_env(config, default):
+    """Return {alias: konfigurasi} untuk replika dari DB_REPLICAS"""
+    daftar = [nilai.strip() for nilai in config('DB_REPLICAS', default='').split(',') if nilai.strip()]
+    kunci = 'NAME' if default['ENGINE'] == 'django.db.backends.sqlite3' else 'HOST'
+    return {
+        f'replica_{nomor}': {
+            **default,
+            kunci: nilai,
+            # Saat test, replika adalah cermin database test default
+            'TEST': {'MIRROR': 'default'},
+        }
+        for nomor, nilai in enumerate(daftar, start=1)
+    }
@@ -5,7 +5,9 @@ Django settings untuk project BERITA
 
 import os
 from pathlib import Path
-from decouple import config  # untuk baca .env (pastikan python-decouple sudah diinstall)
+from decouple import Csv, config  # untuk baca .env (pastikan python-decouple sudah diinstall)
+
+from .database import database_dari_env, replika_dari_env
 
 # Path dasar project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -48,7 +50,11 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ==============================
 MIDDLEWARE = [
+    'FITURBERITA.metrics.MetricsMiddleware',  # paling luar: ukur seluruh waktu request
+    'FITURBERITA.kompresi.KompresiMiddleware',  # gzip/brotli JSON; di dalam metrics agar waktunya terukur
     'django.middleware.security.SecurityMiddleware',
+    'FITURBERITA.nplus1.NPlusSatuMiddleware',  # laporkan query berulang (N+1) per request
+    'FITURBERITA.replica.ReplicaMiddleware',  # baca GET ke replika, sticky primary setelah tulis
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # letakkan sebelum CommonMiddleware
     'django.middleware.common.CommonMiddleware',
@@ -81,13 +87,120 @@ WSGI_APPLICATION = 'BERITA.wsgi.application'
 # ==============================
 # DATABASE
 # ==============================
+# Default SQLite (WAL + pragma, lihat BERITA/database.py); DB_ENGINE=postgresql untuk PostgreSQL
 DATABASES = {
+    'default': database_dari_env(config, BASE_DIR),
+}
+# Read replica: DB_REPLICAS=path1,path2 (SQLite) atau host1,host2 (PostgreSQL)
+DATABASES.update(replika_dari_env(config, DATABASES['default']))
+DATABASE_ROUTERS = ['FITURBERITA.replica.ReplicaRouter']
+
+BERITA_REPLICA = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY': config('REPLICA_STICKY', default=5, cast=int),
+}
+
+# ==============================
+# CACHE
+# ==============================
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='berita-cache'),
     }
 }
 
+# Response cache untuk GET /api/BERITA/, /api/BERITA/{id}/ dan /api/BERITA/terbaru/
+BERITA_RESPONSE_CACHE = {
+    'ALIAS': config('RESPONSE_CACHE_ALIAS', default='default'),
+    'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int),
+    'ENABLED': config('RESPONSE_CACHE_ENABLED', default=True, cast=bool),
+}
+
+# Kompresi response JSON (gzip, brotli jika terpasang); list halaman pertama dan terbaru
+# disimpan terkompresi di response cache
+BERITA_KOMPRESI = {
+    'ENABLED': config('KOMPRESI_ENABLED', default=True, cast=bool),
+    'MIN_BYTES': config('KOMPRESI_MIN_BYTES', default=1024, cast=int),
+    'ENCODING': config('KOMPRESI_ENCODING', default='br,gzip', cast=Csv()),
+}
+
+# ==============================
+# BACKGROUND TASKS
+# ==============================
+# Task queue berbasis database, worker: python manage.py jalankan_worker
+BERITA_TASKS = {
+    'EAGER': config('TASKS_EAGER', default=False, cast=bool),
+    'MAX_RETRIES': config('TASKS_MAX_RETRIES', default=5, cast=int),
+    'BACKOFF_BASE': 2,
+    'BACKOFF_MAX': 600,
+    'TIMEOUT': 900,
+}
+
+# Komentar per BERITA: jumlah yang di-embed di detail dan ukuran halaman action komentar
+BERITA_KOMENTAR = {
+    'EMBED': config('KOMENTAR_EMBED', default=10, cast=int),
+    'PAGE_SIZE': config('KOMENTAR_PAGE_SIZE', default=50, cast=int),
+}
+
+# Stream komentar live (SSE): GET /api/async/BERITA/{id}/komentar/stream/ (butuh ASGI)
+BERITA_SSE = {
+    'HEARTBEAT': config('SSE_HEARTBEAT', default=15, cast=int),
+    'QUEUE_SIZE': 100,
+    'RETRY': 3000,
+    'MAKS_BACKLOG': 500,
+}
+
+# Instrumentasi per request: header Server-Timing, log JSON dan GET /api/metrics/ (Prometheus)
+BERITA_METRICS = {
+    'ENABLED': config('METRICS_ENABLED', default=True, cast=bool),
+    # Server-Timing berisi jumlah/waktu query: default hanya saat DEBUG
+    'SERVER_TIMING': config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool),
+    'LOG': config('METRICS_LOG', default=True, cast=bool),
+    # /api/metrics/: user staff atau header Authorization: Bearer <METRICS_TOKEN>
+    'TOKEN': config('METRICS_TOKEN', default=''),
+    'IP_DIIZINKAN': config('METRICS_IP', default='', cast=Csv()),
+}
+
+# List read-only tanpa instance model (FITURBERITA/serializer_cepat.py), orjson opsional
+BERITA_SERIALIZER_CEPAT = {
+    'ENABLED': config('SERIALIZER_CEPAT_ENABLED', default=True, cast=bool),
+    'ORJSON': config('SERIALIZER_ORJSON', default=True, cast=bool),
+}
+
+# Rate limit komentar (token bucket per IP / per BERITA, 429) dan load-shedding tulis (503)
+BERITA_THROTTLE = {
+    'ENABLED': config('THROTTLE_ENABLED', default=True, cast=bool),
+    'IP': {
+        'KAPASITAS': config('THROTTLE_IP_KAPASITAS', default=10, cast=int),
+        'PER_DETIK': config('THROTTLE_IP_PER_DETIK', default=0.2, cast=float),
+    },
+    'BERITA': {
+        'KAPASITAS': config('THROTTLE_BERITA_KAPASITAS', default=30, cast=int),
+        'PER_DETIK': config('THROTTLE_BERITA_PER_DETIK', default=1.0, cast=float),
+    },
+    'MAKS_ANTRIAN': config('SHED_MAKS_ANTRIAN', default=8, cast=int),
+    'MAKS_TUNGGU_LOCK': config('SHED_MAKS_TUNGGU_LOCK', default=1.0, cast=float),
+}
+
+# Write-behind POST komentar (FITURBERITA/buffer_komentar.py); DURABILITAS: memori, jurnal, fsync
+BERITA_BUFFER_KOMENTAR = {
+    'ENABLED': config('BUFFER_KOMENTAR_ENABLED', default=False, cast=bool),
+    'INTERVAL_MS': config('BUFFER_KOMENTAR_INTERVAL_MS', default=50, cast=int),
+    'MAKS_BARIS': config('BUFFER_KOMENTAR_MAKS_BARIS', default=200, cast=int),
+    'MAKS_ANTRIAN': config('BUFFER_KOMENTAR_MAKS_ANTRIAN', default=10000, cast=int),
+    'DURABILITAS': config('BUFFER_KOMENTAR_DURABILITAS', default='jurnal'),
+    'JURNAL_DIR': config('BUFFER_KOMENTAR_DIR', default=str(BASE_DIR / 'buffer_komentar')),
+}
+
+# Detektor N+1: MODE log (staging/produksi), raise (test suite), off
+BERITA_NPLUS1 = {
+    'MODE': config('NPLUS1_MODE', default='log'),
+    'AMBANG': config('NPLUS1_AMBANG', default=5, cast=int),
+}
+# Test suite gagal jika ada request dengan N+1 (FITURBERITA/nplus1.py)
+TEST_RUNNER = 'FITURBERITA.nplus1.NPlusSatuTestRunner'
+
 # ==============================
 # PASSWORD VALIDATION
 # ==============================
@@ -144,10 +257,12 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'FITURBERITA.serializer_cepat.JSONRendererCepat',  # orjson jika terpasang
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
+    # Jumlah proxy di depan aplikasi; 0 = IP client dari REMOTE_ADDR (X-Forwarded-For diabaikan)
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'DATE_FORMAT': '%Y-%m-%d',
     'TIME_FORMAT': '%H:%M:%S',
@@ -191,6 +306,9 @@ LOGGING = {
     'loggers': {
         'django': {'handlers': ['console', 'file'], 'level': 'INFO'},
         'FITURBERITA': {'handlers': ['console', 'file'], 'level': 'DEBUG'},
+        # Satu baris JSON per request, hanya ke file agar console tetap bersih
+        'FITURBERITA.metrics': {'handlers': ['file'], 'level': 'INFO', 'propagate': False},
+        'FITURBERITA.nplus1': {'handlers': ['console', 'file'], 'level': 'WARNING', 'propagate': False},
     },
 }
 
@@ -4,8 +4,9 @@ Django Admin configuration untuk BERITA dan Komentar
 """
 
 from django.contrib import admin
+from django.core.files.storage import default_storage
 from django.utils.html import format_html
-from .models import BERITA, Komentar
+from .models import BERITA, Komentar, Tugas
 
 
 @admin.register(BERITA)
@@ -33,7 +34,7 @@ class BERITAAdmin(admin.ModelAdmin):
     search_fields = ['judul', 'isi_BERITA']
     
     # Readonly fields
-    readonly_fields = ['tanggal', 'preview_gambar_besar']
+    readonly_fields = ['tanggal', 'jumlah_komentar', 'preview_gambar_besar']
     
     # Fields grouping di form
     fieldsets = (
@@ -44,7 +45,7 @@ class BERITAAdmin(admin.ModelAdmin):
             'fields': ('gambar', 'preview_gambar_besar')
         }),
         ('Informasi Waktu', {
-            'fields': ('tanggal',),
+            'fields': ('tanggal', 'jumlah_komentar'),
             'classes': ('collapse',)
         }),
     )
@@ -61,8 +62,9 @@ class BERITAAdmin(admin.ModelAdmin):
     def get_jumlah_komentar(self, obj):
         """
         Custom column untuk menampilkan jumlah komentar
+        Dibaca dari counter tersimpan, bukan query COUNT per baris
         """
-        count = obj.komentar.count()
+        count = obj.jumlah_komentar
         if count > 0:
             return format_html(
                 '<span style="background-color: #4CAF50; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>',
@@ -72,20 +74,26 @@ class BERITAAdmin(admin.ModelAdmin):
             '<span style="background-color: #f44336; color: white; padding: 3px 10px; border-radius: 3px;">0</span>'
         )
     get_jumlah_komentar.short_description = 'Jumlah Komentar'
+    get_jumlah_komentar.admin_order_field = 'jumlah_komentar'
     
     def preview_isi(self, obj):
         """
-        Menampilkan preview isi BERITA (100 karakter pertama)
+        Menampilkan preview isi BERITA (ringkasan tersimpan, tanpa memotong isi per baris)
         """
-        if len(obj.isi_BERITA) > 100:
-            return obj.isi_BERITA[:100] + '...'
-        return obj.isi_BERITA
+        return obj.ringkasan
     preview_isi.short_description = 'Preview Isi BERITA'
     
     def preview_gambar(self, obj):
         """
         Menampilkan thumbnail gambar di list view
+        Pakai turunan thumbnail jika ada, bukan file upload aslinya
         """
+        thumbnail = (obj.gambar_turunan or {}).get('thumbnail')
+        if thumbnail:
+            return format_html(
+                '<img src="{}" width="50" height="50" style="object-fit: cover; border-radius: 5px;" />',
+                default_storage.url(thumbnail['jpeg'])
+            )
         if obj.gambar:
             return format_html(
                 '<img src="{}" width="50" height="50" style="object-fit: cover; border-radius: 5px;" />',
@@ -170,6 +178,9 @@ class KomentarAdmin(admin.ModelAdmin):
     # Autocomplete fields (untuk foreign key)
     autocomplete_fields = ['BERITA']
     
+    # JOIN ke BERITA agar get_BERITA_judul tidak query per baris
+    list_select_related = ['BERITA']
+    
     def get_BERITA_judul(self, obj):
         """
         Menampilkan judul BERITA dengan link
@@ -210,6 +221,29 @@ class KomentarAdmin(admin.ModelAdmin):
             self.message_user(request, f'Komentar dari "{obj.nama}" berhasil diupdate!')
 
 
+@admin.register(Tugas)
+class TugasAdmin(admin.ModelAdmin):
+    """
+    Admin configuration untuk model Tugas (status task queue)
+    """
+    list_display = ['id', 'nama', 'status', 'percobaan', 'jadwal', 'mulai', 'selesai']
+    list_filter = ['status', 'nama']
+    search_fields = ['nama', 'error']
+    readonly_fields = ['dibuat', 'mulai', 'selesai', 'percobaan', 'error']
+    list_per_page = 50
+    ordering = ['-jadwal']
+    actions = ['antrikan_ulang']
+    
+    def antrikan_ulang(self, request, queryset):
+        """Masukkan kembali tugas yang gagal ke antrian"""
+        from django.utils import timezone
+        jumlah = queryset.filter(status=Tugas.GAGAL).update(
+            status=Tugas.ANTRI, percobaan=0, jadwal=timezone.now()
+        )
+        self.message_user(request, f'{jumlah} tugas dimasukkan kembali ke antrian')
+    antrikan_ulang.short_description = 'Antrikan ulang tugas yang gagal'
+
+
 # Customize admin site headers
 admin.site.site_header = "BERITA - Admin Panel"
 admin.site.site_title = "BERITA Admin"
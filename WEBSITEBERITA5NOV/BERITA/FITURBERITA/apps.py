@@ -14,6 +14,14 @@ class FITURBERITAConfig(AppConfig):
         Method yang dipanggil ketika Django starts
         Bisa digunakan untuk register signals, dll
         """
-        # Import signals here if needed
-        # import FITURBERITA.signals
-        pass
\ No newline at end of file
+        # Register signals (counter jumlah_komentar, dll)
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+        from . import metrics
+        from . import nplus1
+        from . import signals
+        from . import tasks  # noqa: F401 - daftarkan tugas latar belakang
+        post_migrate.connect(signals.pastikan_indeks_pencarian, sender=self)
+        # Hitung query dan waktu database per request (FITURBERITA/metrics.py)
+        connection_created.connect(metrics.pasang_pencatat_query)
+        connection_created.connect(nplus1.pasang_pencatat_query)
\ No newline at end of file
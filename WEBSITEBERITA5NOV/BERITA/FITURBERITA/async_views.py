@@ -0,0 +1,270 @@
+"""
+FITURBERITA/async_views.py
+Jalur baca async native untuk BERITA (dipakai saat dijalankan di ASGI)
+
+    GET /api/async/BERITA/                 : list (?page=N atau ?paginasi=cursor)
+    GET /api/async/BERITA/terbaru/         : 5 BERITA terbaru
+    GET /api/async/BERITA/{id}/            : detail dengan nested komentar
+    GET /api/async/BERITA/{id}/komentar/   : komentar satu BERITA
+    GET /api/async/BERITA/{id}/komentar/stream/ : komentar baru secara live (Server-Sent Events)
+
+View DRF (FITURBERITA/views.py) bersifat sync, sehingga di ASGI setiap request
+dipindah ke thread executor. View di sini adalah coroutine Django biasa yang
+memakai ORM async (acount, aget, async for) lalu menserialisasi objek yang
+sudah dimuat penuh dengan serializer yang sama, sehingga bentuk JSON identik
+dengan endpoint DRF. Serializer hanya membaca atribut dan komentar yang sudah dimuat,
+tidak pernah menjalankan query sync.
+
+Filter, search, ordering, response cache dan conditional GET tetap hanya ada
+di endpoint DRF; jalur ini untuk baca biasa dengan banyak koneksi lambat.
+"""
+
+import asyncio
+from functools import wraps
+
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .broadcast import IdTerkirim, format_event, get_config as get_sse_config, komentar_broadcaster
+from .models import BERITA, Komentar
+from .pagination import BERITAPagination, KeysetPagination, KomentarPagination
+from .serializers import (
+    BERITAListSerializer,
+    BERITASerializer,
+    KomentarSerializer,
+    amuat_komentar_terbaru,
+    kolom_diminta,
+    perlu_komentar_terbaru,
+)
+from .serializer_cepat import JSONRendererCepat, serializer_cepat
+
+JUMLAH_TERBARU = 5
+
+# Kolom yang dipakai serializer (sama dengan BERITAViewSet)
+LIST_FIELDS = [
+    'id', 'judul', 'tanggal', 'isi_BERITA', 'ringkasan', 'gambar', 'gambar_turunan',
+    'jumlah_komentar'
+]
+KOMENTAR_FIELDS = ['id', 'nama', 'tanggal', 'isi_komentar', 'BERITA']
+
+
+def _komentar_queryset():
+    return Komentar.objects.only(*KOMENTAR_FIELDS).order_by('-tanggal', '-id')
+
+
+def _render(data, status=200):
+    return HttpResponse(
+        JSONRendererCepat().render(data), status=status, content_type='application/json'
+    )
+
+
+def async_api_view(func):
+    """
+    Bungkus coroutine view: hanya GET/HEAD, request dibungkus Request DRF
+    (query_params, build_absolute_uri) dan error API dijawab sebagai JSON
+    """
+    @wraps(func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return _render({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            return await func(Request(request), *args, **kwargs)
+        except Http404 as exc:
+            return _render({'detail': str(NotFound(str(exc)).detail)}, status=404)
+        except APIException as exc:
+            return _render({'detail': exc.detail}, status=exc.status_code)
+    return wrapper
+
+
+async def _paginasi_halaman(request, queryset, page_size):
+    """Versi async PageNumberPagination: satu COUNT lalu satu query LIMIT/OFFSET"""
+    count = await queryset.acount()
+    try:
+        halaman = int(request.query_params.get('page', 1))
+    except ValueError:
+        raise NotFound('Invalid page.')
+    jumlah_halaman = max(1, -(-count // page_size))
+    if halaman < 1 or halaman > jumlah_halaman:
+        raise NotFound('Invalid page.')
+
+    awal = (halaman - 1) * page_size
+    hasil = [obj async for obj in queryset[awal:awal + page_size]]
+    url = request.build_absolute_uri()
+    if halaman < jumlah_halaman:
+        next_url = replace_query_param(url, 'page', halaman + 1)
+    else:
+        next_url = None
+    if halaman == 1:
+        previous_url = None
+    elif halaman == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', halaman - 1)
+    return hasil, {'count': count, 'next': next_url, 'previous': previous_url}
+
+
+async def _paginasi_keyset(request, queryset, page_size):
+    """Versi async KeysetPagination: tanpa COUNT, satu range scan"""
+    paginator = KeysetPagination(page_size=page_size)
+    paginator.siapkan(request)
+    hasil = [obj async for obj in paginator.filter_posisi(queryset)[:page_size + 1]]
+    hasil = paginator.set_halaman(hasil)
+    return hasil, {'next': paginator.get_next_link(), 'previous': paginator.get_previous_link()}
+
+
+@async_api_view
+async def BERITA_list(request):
+    """List BERITA, format response sama dengan GET /api/BERITA/"""
+    pagination = BERITAPagination()
+    page_size = pagination.get_page_size(request)
+    queryset = BERITA.objects.only(*LIST_FIELDS).order_by('-tanggal')
+    cepat = serializer_cepat(BERITAListSerializer, {'request': request})
+    if cepat is not None:
+        queryset = cepat.siapkan(queryset)
+    if pagination.pakai_keyset(request):
+        hasil, meta = await _paginasi_keyset(request, queryset, page_size)
+    else:
+        hasil, meta = await _paginasi_halaman(request, queryset, page_size)
+    if cepat is not None:
+        data = cepat.serialisasi(hasil)
+    else:
+        data = BERITAListSerializer(hasil, many=True, context={'request': request}).data
+    return _render({**meta, 'results': data})
+
+
+def _BERITA_queryset(context):
+    """BERITA untuk BERITASerializer, kolom dipersempit jika ada ?fields="""
+    kolom = kolom_diminta(BERITASerializer, context, wajib=('tanggal',))
+    return BERITA.objects.only(*kolom) if kolom is not None else BERITA.objects.all()
+
+
+@async_api_view
+async def BERITA_terbaru(request):
+    """5 BERITA terbaru dengan nested komentar (komentar ikut dimuat async)"""
+    context = {'request': request}
+    queryset = _BERITA_queryset(context).order_by('-tanggal')
+    hasil = [obj async for obj in queryset[:JUMLAH_TERBARU]]
+    if perlu_komentar_terbaru(context):
+        hasil = await amuat_komentar_terbaru(hasil, _komentar_queryset())
+    return _render(BERITASerializer(hasil, many=True, context=context).data)
+
+
+@async_api_view
+async def BERITA_detail(request, pk):
+    """Detail BERITA dengan nested komentar"""
+    context = {'request': request}
+    obj = await aget_object_or_404(_BERITA_queryset(context), pk=pk)
+    if perlu_komentar_terbaru(context):
+        await amuat_komentar_terbaru([obj], _komentar_queryset())
+    return _render(BERITASerializer(obj, context=context).data)
+
+
+@async_api_view
+async def BERITA_komentar(request, pk):
+    """Komentar satu BERITA (keyset, ?since=), format sama dengan GET /api/BERITA/{id}/komentar/"""
+    obj = await aget_object_or_404(BERITA.objects.only('id', 'judul', 'jumlah_komentar'), pk=pk)
+    paginator = KomentarPagination()
+    paginator.siapkan(request)
+    context = {'request': request}
+    cepat = serializer_cepat(KomentarSerializer, context)
+    queryset = _komentar_queryset().filter(BERITA_id=obj.pk)
+    if cepat is not None:
+        queryset = cepat.siapkan(queryset)
+    else:
+        kolom = kolom_diminta(KomentarSerializer, context, wajib=('tanggal',))
+        if kolom is not None:
+            queryset = queryset.only(*kolom)
+    queryset = paginator.filter_posisi(queryset)
+    komentar = paginator.set_halaman([k async for k in queryset[:paginator.page_size + 1]])
+    if cepat is not None:
+        data = cepat.serialisasi(komentar)
+    else:
+        data = KomentarSerializer(komentar, many=True, context=context).data
+    return _render({
+        'BERITA': obj.judul,
+        'jumlah_komentar': obj.jumlah_komentar,
+        'komentar': data,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+    })
+
+
+def _last_event_id(request):
+    """Last-Event-ID dari header (reconnect EventSource) atau ?last_event_id= (load awal)"""
+    nilai = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    try:
+        return int(nilai) if nilai else None
+    except ValueError:
+        return None
+
+
+async def _komentar_setelah(BERITA_id, terakhir, batas, kecuali=()):
+    """Komentar dengan id > terakhir yang belum dikirim, urut id (untuk resume dan menyusul)"""
+    queryset = _komentar_queryset().filter(BERITA_id=BERITA_id, id__gt=terakhir).order_by('id')
+    if kecuali:
+        queryset = queryset.exclude(id__in=list(kecuali))
+    return [
+        (komentar.pk, format_event(komentar.pk, KomentarSerializer(komentar).data))
+        async for komentar in queryset[:batas]
+    ]
+
+
+async def _stream_komentar(BERITA_id, terakhir):
+    """
+    Generator SSE: backlog sejak Last-Event-ID, lalu event live dari broadcaster.
+    Pendengar didaftarkan sebelum membaca backlog; duplikat dibuang lewat id yang
+    sudah terkirim (bukan id <= terakhir, karena id tidak selalu commit berurutan)
+    """
+    config = get_sse_config()
+    pendengar = komentar_broadcaster.daftar(BERITA_id)
+    terkirim = IdTerkirim(config['MAKS_BACKLOG'])
+    try:
+        yield f'retry: {config["RETRY"]}\n\n'
+        if terakhir is not None:
+            for event_id, event in await _komentar_setelah(BERITA_id, terakhir, config['MAKS_BACKLOG']):
+                terkirim.tambah(event_id)
+                yield event
+        while True:
+            batas_bawah = terkirim.terkecil() if terkirim else terakhir
+            if pendengar.ketinggalan and batas_bawah is not None:
+                pendengar.ketinggalan = False
+                while not pendengar.queue.empty():
+                    pendengar.queue.get_nowait()
+                susulan = await _komentar_setelah(
+                    BERITA_id, batas_bawah, config['MAKS_BACKLOG'], kecuali=terkirim
+                )
+                for event_id, event in susulan:
+                    terkirim.tambah(event_id)
+                    yield event
+            try:
+                event_id, event = await asyncio.wait_for(
+                    pendengar.queue.get(), timeout=config['HEARTBEAT']
+                )
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            if event_id in terkirim:
+                continue
+            terkirim.tambah(event_id)
+            yield event
+    finally:
+        komentar_broadcaster.hapus(pendengar)
+
+
+@async_api_view
+async def BERITA_komentar_stream(request, pk):
+    """
+    Stream komentar baru satu BERITA (text/event-stream)
+    Koneksi idle tidak menjalankan query; hanya menunggu event dari broadcaster
+    """
+    obj = await aget_object_or_404(BERITA.objects.only('id'), pk=pk)
+    response = StreamingHttpResponse(
+        _stream_komentar(obj.pk, _last_event_id(request)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: jangan buffer stream
+    return response
@@ -0,0 +1,397 @@
+"""
+FITURBERITA/benchmark.py
+Harness benchmark API BERITA/Komentar dengan dataset besar
+
+- seed()         : isi database dengan BERITA dan komentar acak yang reproducible
+                   (seed random tetap, tanggal tersebar setahun, komentar
+                   terkonsentrasi di sebagian BERITA seperti trafik asli)
+- SKENARIO       : endpoint yang diukur (list + search/ordering/keyset,
+                   detail, komentar, terbaru, create komentar)
+- jalankan()     : kirim request lewat Django test client (in-process) atau
+                   lewat HTTP ke server WSGI lokal, return p50/p95/p99,
+                   query per request dan waktu kompresi (dari header
+                   Server-Timing), byte response (setelah kompresi, sesuai
+                   Accept-Encoding pengirim), CPU proses per request dan memori
+- banjir_komentar(): thread latar yang terus mengirim komentar ke BERITA
+                   populer selama skenario baca diukur (uji throttle/shedding)
+- bandingkan()   : cek regresi terhadap baseline yang disimpan (JSON)
+
+Dipakai oleh: python manage.py benchmark_api
+"""
+
+import json
+import math
+import platform
+import random
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import django
+from django.core.wsgi import get_wsgi_application
+from django.db import transaction
+from django.db.models import Max, Min
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from . import cache as response_cache
+from .importer import bulk_create_pertahankan_waktu
+from .models import BERITA, Komentar
+from .pagination import BERITAPagination
+
+KATA = (
+    'pemerintah', 'ekonomi', 'banjir', 'pemilu', 'pendidikan', 'kesehatan', 'jakarta',
+    'surabaya', 'teknologi', 'olahraga', 'sepakbola', 'harga', 'beras', 'listrik',
+    'transportasi', 'kereta', 'bandara', 'pariwisata', 'budaya', 'festival', 'musik',
+    'film', 'digital', 'startup', 'investasi', 'pajak', 'anggaran', 'desa', 'petani',
+    'nelayan', 'cuaca', 'gempa', 'vaksin', 'rumah', 'sakit', 'sekolah', 'mahasiswa',
+    'universitas', 'presiden', 'menteri', 'gubernur', 'walikota', 'polisi', 'hukum',
+)
+NAMA = ('Budi', 'Siti', 'Andi', 'Dewi', 'Rina', 'Agus', 'Putri', 'Joko', 'Wati', 'Eko')
+
+# Isi komentar untuk skenario create_komentar
+KOMENTAR_BARU = {'nama': 'Benchmark', 'isi_komentar': 'Komentar dari benchmark'}
+
+
+def _kalimat(rng, jumlah_kata):
+    return ' '.join(rng.choice(KATA) for _ in range(jumlah_kata))
+
+
+def seed(jumlah_BERITA, jumlah_komentar, batch=5000, seed=42, progress=None):
+    """
+    Tambah data sampai tabel berisi minimal jumlah_BERITA / jumlah_komentar baris
+    Return: (BERITA ditambahkan, komentar ditambahkan)
+    """
+    rng = random.Random(seed)
+    sekarang = timezone.now()
+    setahun = 365 * 24 * 3600
+
+    tambah_BERITA = max(jumlah_BERITA - BERITA.objects.count(), 0)
+    for awal in range(0, tambah_BERITA, batch):
+        objs = []
+        for _ in range(min(batch, tambah_BERITA - awal)):
+            tanggal = sekarang - timedelta(seconds=rng.randrange(setahun))
+            objs.append(BERITA(
+                judul=_kalimat(rng, 6).capitalize(),
+                isi_BERITA=_kalimat(rng, 80),
+                tanggal=tanggal,
+                diperbarui=tanggal,
+            ))
+        with transaction.atomic():
+            bulk_create_pertahankan_waktu(BERITA, objs)
+        if progress:
+            progress('BERITA', awal + len(objs), tambah_BERITA)
+
+    tambah_komentar = max(jumlah_komentar - Komentar.objects.count(), 0)
+    ids = list(BERITA.objects.order_by('-tanggal').values_list('pk', flat=True))
+    if ids and tambah_komentar:
+        for awal in range(0, tambah_komentar, batch):
+            objs = [
+                Komentar(
+                    nama=rng.choice(NAMA),
+                    isi_komentar=_kalimat(rng, 12),
+                    # random() ** 3: sebagian kecil BERITA (terbaru) mendapat sebagian besar komentar
+                    BERITA_id=ids[int(len(ids) * rng.random() ** 3)],
+                    tanggal=sekarang - timedelta(seconds=rng.randrange(setahun)),
+                )
+                for _ in range(min(batch, tambah_komentar - awal))
+            ]
+            with transaction.atomic():
+                bulk_create_pertahankan_waktu(Komentar, objs)
+            if progress:
+                progress('komentar', awal + len(objs), tambah_komentar)
+        BERITA.hitung_ulang_jumlah_komentar()
+    response_cache.invalidasi_semua()
+    return tambah_BERITA, tambah_komentar
+
+
+class Konteks:
+    """Data acuan skenario: rentang id BERITA dan BERITA dengan komentar terbanyak"""
+
+    def __init__(self):
+        rentang = BERITA.objects.aggregate(awal=Min('pk'), akhir=Max('pk'))
+        if rentang['awal'] is None:
+            raise ValueError('Database kosong, jalankan dengan --seed-BERITA terlebih dahulu')
+        self.id_awal, self.id_akhir = rentang['awal'], rentang['akhir']
+        self.id_populer = BERITA.objects.order_by('-jumlah_komentar').values_list('pk', flat=True)[0]
+        self.jumlah = {'BERITA': BERITA.objects.count(), 'komentar': Komentar.objects.count()}
+        # Halaman list yang diacak (maksimal 5, tidak melebihi jumlah halaman yang ada)
+        self.halaman_maks = max(1, min(5, -(-self.jumlah['BERITA'] // BERITAPagination.page_size)))
+
+    def id_acak(self, rng):
+        return rng.randint(self.id_awal, self.id_akhir)
+
+
+def _get(nama_url, args=None, params=None):
+    """Pembuat request GET; args dan params boleh callable(konteks, rng)"""
+    def buat(konteks, rng):
+        args_url = args(konteks, rng) if args else ()
+        data = params(konteks, rng) if callable(params) else params
+        return 'GET', reverse(f'FITURBERITA:{nama_url}', args=args_url), data
+    return buat
+
+
+def _post_komentar(konteks, rng):
+    return 'POST', reverse('FITURBERITA:komentar-list'), {**KOMENTAR_BARU, 'BERITA': konteks.id_acak(rng)}
+
+
+SKENARIO = {
+    'list': _get('BERITA-list'),
+    'list_search': _get('BERITA-list', params=lambda konteks, rng: {'search': rng.choice(KATA)}),
+    'list_ordering': _get('BERITA-list', params=lambda konteks, rng: {
+        'ordering': 'judul', 'page': rng.randint(1, konteks.halaman_maks),
+    }),
+    'list_keyset': _get('BERITA-list', params={'paginasi': 'cursor'}),
+    'list_ringkasan': _get('BERITA-list', params={'fields': 'id,judul,tanggal,ringkasan,jumlah_komentar'}),
+    'detail': _get('BERITA-detail', args=lambda konteks, rng: [konteks.id_acak(rng)]),
+    'detail_populer': _get('BERITA-detail', args=lambda konteks, rng: [konteks.id_populer]),
+    'komentar': _get('BERITA-komentar', args=lambda konteks, rng: [konteks.id_populer]),
+    'terbaru': _get('BERITA-terbaru'),
+    'create_komentar': _post_komentar,
+}
+
+
+def persentil(nilai_terurut, p):
+    """Persentil nearest-rank dari list yang sudah diurutkan"""
+    return nilai_terurut[max(math.ceil(p * len(nilai_terurut)) - 1, 0)]
+
+
+def _jumlah_query(server_timing):
+    """Ambil jumlah query dari header Server-Timing (db;...;desc="N query")"""
+    for bagian in (server_timing or '').split(','):
+        if bagian.strip().startswith('db;') and 'desc="' in bagian:
+            return int(bagian.split('desc="')[1].split()[0])
+    return None
+
+
+def _durasi_bagian(server_timing, nama):
+    """Durasi (ms) satu bagian Server-Timing, 0 jika bagian tidak ada"""
+    for bagian in (server_timing or '').split(','):
+        if bagian.strip().startswith(f'{nama};dur='):
+            return float(bagian.split('dur=')[1].split(';')[0])
+    return 0.0
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _HandlerSenyap(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def server_lokal():
+    """Server WSGI di thread latar pada port acak; yield base URL"""
+    server = make_server(
+        '127.0.0.1', 0, get_wsgi_application(),
+        server_class=_ThreadingWSGIServer, handler_class=_HandlerSenyap,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class PengirimClient:
+    """
+    Request lewat Django test client (tanpa jaringan)
+    kirim() return (status, header Server-Timing, byte body)
+    """
+
+    def __init__(self, accept_encoding=''):
+        self._lokal = threading.local()
+        self.headers = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding else {}
+
+    def kirim(self, method, path, data):
+        client = getattr(self._lokal, 'client', None)
+        if client is None:
+            client = self._lokal.client = Client(**self.headers)
+        if method == 'POST':
+            response = client.post(path, data, content_type='application/json')
+        else:
+            response = client.get(path, data)
+        ukuran = None if response.streaming else len(response.content)
+        return response.status_code, response.get('Server-Timing'), ukuran
+
+
+class PengirimHTTP:
+    """Request HTTP sungguhan ke server_lokal() (body dibaca apa adanya, tanpa dekompresi)"""
+
+    def __init__(self, base_url, accept_encoding=''):
+        self.base_url = base_url
+        self.headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if accept_encoding:
+            self.headers['Accept-Encoding'] = accept_encoding
+
+    def kirim(self, method, path, data):
+        url = self.base_url + path
+        body = None
+        if method == 'POST':
+            body = json.dumps(data).encode()
+        elif data:
+            url += '?' + urllib.parse.urlencode(data)
+        request = urllib.request.Request(url, data=body, method=method, headers=self.headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                isi = response.read()
+                return response.status, response.headers.get('Server-Timing'), len(isi)
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers.get('Server-Timing'), None
+
+
+@contextmanager
+def banjir_komentar(pengirim, konteks, jumlah_thread):
+    """
+    Selama blok berjalan, jumlah_thread thread terus mengirim komentar ke
+    BERITA populer; yield Counter status response (201/429/503)
+    """
+    path = reverse('FITURBERITA:komentar-list')
+    status = Counter()
+    kunci = threading.Lock()
+    berhenti = threading.Event()
+
+    def kirim():
+        while not berhenti.is_set():
+            kode = pengirim.kirim('POST', path, {**KOMENTAR_BARU, 'BERITA': konteks.id_populer})[0]
+            with kunci:
+                status[kode] += 1
+
+    threads = [threading.Thread(target=kirim, daemon=True) for _ in range(jumlah_thread)]
+    for thread in threads:
+        thread.start()
+    try:
+        yield status
+    finally:
+        berhenti.set()
+        for thread in threads:
+            thread.join()
+
+
+def jalankan(pengirim, nama, konteks, jumlah, konkurensi=1, seed=42, ukur_memori=False):
+    """Jalankan satu skenario; return dict ringkasan"""
+    buat = SKENARIO[nama]
+    rng = random.Random(seed)
+    rencana = [buat(konteks, rng) for _ in range(jumlah)]
+    latensi, query, ukuran, kompresi, gagal = [], [], [], [], 0
+    kunci = threading.Lock()
+
+    def satu(item):
+        nonlocal gagal
+        method, path, data = item
+        mulai = time.perf_counter()
+        status, server_timing, byte = pengirim.kirim(method, path, data)
+        durasi = time.perf_counter() - mulai
+        with kunci:
+            if status >= 400:
+                gagal += 1
+                return
+            latensi.append(durasi)
+            jumlah_query = _jumlah_query(server_timing)
+            if jumlah_query is not None:
+                query.append(jumlah_query)
+            if byte is not None:
+                ukuran.append(byte)
+            if server_timing:
+                kompresi.append(_durasi_bagian(server_timing, 'kompresi'))
+
+    for item in rencana[:min(5, jumlah)]:  # pemanasan
+        pengirim.kirim(*item)
+    if ukur_memori:
+        tracemalloc.start()
+    mulai = time.perf_counter()
+    # CPU seluruh proses: client/server in-process ikut terhitung, bandingkan antar run yang sama modenya
+    mulai_cpu = time.process_time()
+    if konkurensi > 1:
+        with ThreadPoolExecutor(max_workers=konkurensi) as pool:
+            list(pool.map(satu, rencana))
+    else:
+        for item in rencana:
+            satu(item)
+    total = time.perf_counter() - mulai
+    cpu = time.process_time() - mulai_cpu
+    memori = None
+    if ukur_memori:
+        memori = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+
+    latensi.sort()
+    kosong = not latensi
+    return {
+        'request': jumlah,
+        'gagal': gagal,
+        'req_per_detik': round(len(latensi) / total, 1) if total else 0.0,
+        'p50_ms': 0.0 if kosong else round(persentil(latensi, 0.50) * 1000, 2),
+        'p95_ms': 0.0 if kosong else round(persentil(latensi, 0.95) * 1000, 2),
+        'p99_ms': 0.0 if kosong else round(persentil(latensi, 0.99) * 1000, 2),
+        'query': statistics.median(query) if query else None,
+        'cpu_ms': round(cpu / jumlah * 1000, 2),
+        'kompresi_ms': round(statistics.mean(kompresi), 3) if kompresi else None,
+        'byte': round(statistics.mean(ukuran)) if ukuran else None,
+        'memori_kb': memori,
+        'rss_puncak_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def meta(konteks, mode, konkurensi, accept_encoding=''):
+    return {
+        'waktu': timezone.now().isoformat(),
+        'mode': mode,
+        'konkurensi': konkurensi,
+        'accept_encoding': accept_encoding,
+        'dataset': konteks.jumlah,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+    }
+
+
+def beda_kondisi(meta_baseline, meta_sekarang, selisih_dataset=0.01):
+    """
+    Perbedaan kondisi run yang membuat perbandingan kurang akurat
+    (dataset boleh berbeda sedikit: create_komentar menambah komentar setiap run)
+    """
+    beda = []
+    for kunci in ('mode', 'konkurensi', 'accept_encoding'):
+        if meta_baseline.get(kunci, '') != meta_sekarang[kunci]:
+            beda.append(f'{kunci} {meta_baseline.get(kunci)} vs {meta_sekarang[kunci]}')
+    dataset = meta_baseline.get('dataset') or {}
+    for tabel, jumlah in meta_sekarang['dataset'].items():
+        acuan = dataset.get(tabel) or 0
+        if abs(jumlah - acuan) > max(acuan, 1) * selisih_dataset:
+            beda.append(f'jumlah {tabel} {acuan} vs {jumlah}')
+    return beda
+
+
+def bandingkan(hasil, baseline, toleransi=0.2, batas_ms=2.0):
+    """
+    Bandingkan hasil dengan baseline; return list pesan regresi
+    Regresi: p95 naik lebih dari toleransi (dan lebih dari batas_ms absolut,
+    agar noise endpoint sub-milidetik tidak dihitung) atau query per request bertambah
+    """
+    regresi = []
+    for nama, angka in hasil.items():
+        acuan = baseline.get('hasil', {}).get(nama)
+        if not acuan:
+            continue
+        naik = angka['p95_ms'] - acuan['p95_ms']
+        if angka['p95_ms'] > acuan['p95_ms'] * (1 + toleransi) and naik > batas_ms:
+            regresi.append(f'{nama}: p95 {acuan["p95_ms"]} ms -> {angka["p95_ms"]} ms')
+        if angka['query'] is not None and acuan.get('query') is not None and angka['query'] > acuan['query']:
+            regresi.append(f'{nama}: query per request {acuan["query"]} -> {angka["query"]}')
+    return regresi
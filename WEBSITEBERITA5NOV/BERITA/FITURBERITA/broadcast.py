@@ -0,0 +1,154 @@
+"""
+FITURBERITA/broadcast.py
+Broadcaster in-process untuk stream komentar live (Server-Sent Events)
+
+- Setiap koneksi SSE mendaftarkan Pendengar (asyncio.Queue) per BERITA
+- Signal post_save Komentar (setelah commit) mengirim event ke semua
+  pendengar BERITA tersebut lewat loop.call_soon_threadsafe, sehingga aman
+  dipanggil dari thread view sync maupun dari event loop
+- Pendengar idle hanya berupa satu Queue kosong; tidak ada query sampai ada event
+
+Catatan: fan-out hanya menjangkau pendengar di proses yang sama. Dengan
+beberapa worker, client yang tersambung ke worker lain tetap bisa menyusul
+lewat Last-Event-ID saat reconnect (event id = id komentar).
+
+Id komentar tidak selalu commit berurutan (beberapa penulis di PostgreSQL):
+komentar dengan id lebih kecil bisa commit setelah id yang lebih besar sudah
+terkirim. Karena itu duplikat dibuang lewat IdTerkirim (id yang sudah dikirim
+ke koneksi ini, jendela MAKS_BACKLOG id terakhir), bukan dengan membandingkan
+id. Resume lewat Last-Event-ID hanya membawa satu id, sehingga komentar yang
+commit terlambat tepat di sekitar putusnya koneksi bisa terlewat.
+
+Konfigurasi di settings.BERITA_SSE:
+    HEARTBEAT   : interval komentar ': ping' (detik) agar proxy tidak memutus koneksi idle
+    QUEUE_SIZE  : batas event tertunda per pendengar; jika penuh, pendengar menyusul dari database
+    RETRY       : saran jeda reconnect untuk EventSource (milidetik)
+    MAKS_BACKLOG: batas komentar yang dikirim ulang saat resume dengan Last-Event-ID
+"""
+
+import asyncio
+import json
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import KomentarSerializer
+
+DEFAULT_CONFIG = {
+    'HEARTBEAT': 15,
+    'QUEUE_SIZE': 100,
+    'RETRY': 3000,
+    'MAKS_BACKLOG': 500,
+}
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_SSE', {})}
+
+
+class Pendengar:
+    """Satu koneksi SSE: queue event milik event loop tempat koneksi berjalan"""
+
+    def __init__(self, kunci, maxsize):
+        self.kunci = kunci
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.ketinggalan = False
+
+    def terima(self, event):
+        """Dijalankan di event loop pendengar"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client terlalu lambat: buang antrian, susul dari database
+            self.ketinggalan = True
+
+
+class IdTerkirim:
+    """Id event yang sudah dikirim ke satu koneksi SSE (hanya `ukuran` id terakhir)"""
+
+    def __init__(self, ukuran):
+        self.ukuran = ukuran
+        self._urutan = deque()
+        self._id = set()
+
+    def __contains__(self, event_id):
+        return event_id in self._id
+
+    def __iter__(self):
+        return iter(self._urutan)
+
+    def __len__(self):
+        return len(self._urutan)
+
+    def tambah(self, event_id):
+        self._urutan.append(event_id)
+        self._id.add(event_id)
+        if len(self._urutan) > self.ukuran:
+            self._id.discard(self._urutan.popleft())
+
+    def terkecil(self):
+        """Id terkecil di jendela, batas bawah saat menyusul dari database"""
+        return min(self._urutan) if self._urutan else None
+
+
+class Broadcaster:
+    """Registry pendengar per kunci (id BERITA)"""
+
+    def __init__(self):
+        self._pendengar = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def daftar(self, kunci):
+        """Daftarkan pendengar baru; harus dipanggil dari dalam event loop"""
+        pendengar = Pendengar(kunci, get_config()['QUEUE_SIZE'])
+        with self._lock:
+            self._pendengar[kunci].add(pendengar)
+        return pendengar
+
+    def hapus(self, pendengar):
+        with self._lock:
+            daftar = self._pendengar.get(pendengar.kunci)
+            if daftar is not None:
+                daftar.discard(pendengar)
+                if not daftar:
+                    del self._pendengar[pendengar.kunci]
+
+    def ada_pendengar(self, kunci):
+        return bool(self._pendengar.get(kunci))
+
+    def jumlah_pendengar(self):
+        with self._lock:
+            return sum(len(daftar) for daftar in self._pendengar.values())
+
+    def kirim(self, kunci, event):
+        """Kirim event ke semua pendengar kunci (boleh dari thread mana pun)"""
+        with self._lock:
+            daftar = list(self._pendengar.get(kunci, ()))
+        for pendengar in daftar:
+            try:
+                pendengar.loop.call_soon_threadsafe(pendengar.terima, event)
+            except RuntimeError:  # event loop sudah ditutup
+                self.hapus(pendengar)
+
+
+# Instance global untuk stream komentar
+komentar_broadcaster = Broadcaster()
+
+
+def format_event(event_id, data, event='komentar'):
+    """Format satu event SSE; data di-encode JSON sekali lalu dibagi ke semua pendengar"""
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'
+
+
+def siarkan_komentar(daftar_komentar):
+    """Kirim komentar baru ke pendengar BERITA masing-masing (serialisasi hanya jika ada pendengar)"""
+    for komentar in daftar_komentar:
+        if komentar_broadcaster.ada_pendengar(komentar.BERITA_id):
+            komentar_broadcaster.kirim(komentar.BERITA_id, (
+                komentar.pk, format_event(komentar.pk, KomentarSerializer(komentar).data)
+            ))
@@ -0,0 +1,312 @@
+"""
+FITURBERITA/buffer_komentar.py
+Write-behind opsional untuk POST /api/komentar/ (settings.BERITA_BUFFER_KOMENTAR['ENABLED'])
+
+Tanpa buffer setiap komentar adalah satu transaksi (dan satu commit WAL)
+sendiri; saat ramai, penulis antre di write lock SQLite. Dengan buffer:
+    - view memvalidasi komentar lalu memasukkannya ke antrian di memori
+      proses dan langsung menjawab 202 (tanpa id, belum ada di database)
+    - thread flusher menulis antrian dengan satu bulk_create per batch setiap
+      INTERVAL_MS, atau segera setelah MAKS_BARIS komentar terkumpul
+    - counter jumlah_komentar, invalidasi response cache dan siaran SSE
+      dijalankan sekali per batch (signals.sinkronkan_komentar_massal)
+Komentar baru terlihat di API setelah di-flush (normalnya <= INTERVAL_MS).
+Antrian penuh (MAKS_ANTRIAN) dijawab 503 dengan Retry-After.
+
+Durabilitas (DURABILITAS):
+    memori : hanya di memori; komentar yang belum di-flush hilang jika proses
+             mati mendadak (saat exit normal antrian di-flush lebih dulu)
+    jurnal : setiap komentar ditulis ke file jurnal lokal sebelum dijawab 202;
+             bertahan jika proses crash, tidak jika mesin mati mendadak
+    fsync  : jurnal + fsync per komentar; bertahan saat mati listrik
+Jurnal per proses di JURNAL_DIR (komentar-<pid>.jsonl, dikunci flock selama
+proses hidup). Jurnal proses yang sudah mati diputar ulang saat flusher
+proses lain mulai, atau manual: python manage.py flush_buffer_komentar.
+Jaminannya at-least-once: crash tepat di antara commit batch dan penanda
+selesai di jurnal membuat batch itu tertulis dua kali. Tanpa fcntl
+(Windows) jurnal tidak dikunci dan hanya dipulihkan lewat command saat
+server mati.
+
+Konfigurasi di settings.BERITA_BUFFER_KOMENTAR:
+    ENABLED       : aktifkan write-behind
+    INTERVAL_MS   : jeda maksimal sebelum antrian di-flush
+    MAKS_BARIS    : ukuran batch (flush lebih awal jika tercapai)
+    MAKS_ANTRIAN  : batas komentar tertunda per proses
+    DURABILITAS   : memori / jurnal / fsync
+    JURNAL_DIR    : folder file jurnal (default BASE_DIR/buffer_komentar)
+    FLUSHER_LATAR : jalankan thread flusher (False: panggil flush() sendiri, dipakai test)
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+
+from .models import BERITA, Komentar
+from .signals import sinkronkan_komentar_massal
+from .throttling import LayananSibuk, penjaga_tulis
+
+try:
+    import fcntl
+except ImportError:  # Windows: jurnal tanpa kunci antar proses
+    fcntl = None
+
+logger = logging.getLogger('FITURBERITA.buffer_komentar')
+
+DURABILITAS = ('memori', 'jurnal', 'fsync')
+
+DEFAULT_CONFIG = {
+    'ENABLED': False,
+    'INTERVAL_MS': 50,
+    'MAKS_BARIS': 200,
+    'MAKS_ANTRIAN': 10000,
+    'DURABILITAS': 'jurnal',
+    'JURNAL_DIR': None,
+    'FLUSHER_LATAR': True,
+}
+
+# Kolom Komentar yang disimpan di antrian (tanggal diisi auto_now_add saat flush)
+KOLOM = ('nama', 'isi_komentar', 'BERITA_id')
+
+# Jeda sebelum flusher mencoba lagi setelah flush gagal (detik)
+JEDA_GAGAL = 1.0
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    config = {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_BUFFER_KOMENTAR', {})}
+    if config['DURABILITAS'] not in DURABILITAS:
+        raise ImproperlyConfigured(
+            f'BERITA_BUFFER_KOMENTAR DURABILITAS harus salah satu dari {DURABILITAS}'
+        )
+    config['JURNAL_DIR'] = Path(config['JURNAL_DIR'] or Path(settings.BASE_DIR) / 'buffer_komentar')
+    return config
+
+
+def aktif():
+    return get_config()['ENABLED']
+
+
+def tulis_batch(daftar_baris):
+    """
+    Tulis satu batch komentar dengan bulk_create; return objek yang tersimpan
+    Komentar untuk BERITA yang sudah dihapus sejak diterima dibuang
+    """
+    with penjaga_tulis.tulis():
+        ada = set(
+            BERITA.objects.filter(pk__in={baris['BERITA_id'] for baris in daftar_baris})
+            .values_list('pk', flat=True)
+        )
+        objs = [Komentar(**baris) for baris in daftar_baris if baris['BERITA_id'] in ada]
+        if len(objs) < len(daftar_baris):
+            logger.warning('%d komentar dibuang: BERITA sudah dihapus', len(daftar_baris) - len(objs))
+        if objs:
+            Komentar.objects.bulk_create(objs)
+            sinkronkan_komentar_massal(objs)
+    return objs
+
+
+def baca_jurnal(path):
+    """Baris komentar di jurnal yang belum ditandai selesai, urut saat diterima"""
+    tertunda, selesai = {}, set()
+    with open(path, encoding='utf-8') as file:
+        for baris in file:
+            try:
+                data = json.loads(baris)
+            except ValueError:
+                continue  # baris terakhir yang terpotong saat crash
+            if 'selesai' in data:
+                selesai.update(data['selesai'])
+            else:
+                tertunda[data['k']] = data['d']
+    return [baris for kunci, baris in tertunda.items() if kunci not in selesai]
+
+
+def pulihkan_jurnal(folder=None, batch=None):
+    """
+    Tulis ulang komentar dari jurnal proses yang sudah mati lalu hapus jurnalnya
+    Jurnal yang masih dikunci proses hidup dilewati. Return jumlah komentar
+    """
+    config = get_config()
+    folder = Path(folder or config['JURNAL_DIR'])
+    batch = batch or config['MAKS_BARIS']
+    total = 0
+    for path in sorted(folder.glob('komentar-*.jsonl')):
+        with open(path, 'a+', encoding='utf-8') as file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue  # pemiliknya masih hidup
+            daftar = baca_jurnal(path)
+            for awal in range(0, len(daftar), batch):
+                tulis_batch(daftar[awal:awal + batch])
+            path.unlink()
+        if daftar:
+            logger.warning('%d komentar dipulihkan dari %s', len(daftar), path.name)
+        total += len(daftar)
+    return total
+
+
+class Jurnal:
+    """File jurnal append-only milik proses ini (dikunci flock selama terbuka)"""
+
+    def __init__(self, folder, fsync):
+        folder.mkdir(parents=True, exist_ok=True)
+        self.path = folder / f'komentar-{os.getpid()}.jsonl'
+        self.fsync = fsync
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        if self.path.stat().st_size:
+            # Sisa proses mati dengan pid yang sama: sisihkan agar ikut dipulihkan
+            self.path.rename(folder / f'komentar-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl')
+            self._file.close()
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+
+    def tulis(self, data):
+        self._file.write(json.dumps(data, separators=(',', ':')) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def kosongkan(self):
+        self._file.seek(0)
+        self._file.truncate()
+
+    def tutup(self):
+        kosong = os.fstat(self._file.fileno()).st_size == 0
+        self._file.close()
+        if kosong:
+            self.path.unlink(missing_ok=True)
+
+
+class BufferKomentar:
+    """Antrian komentar tertunda di proses ini beserta jurnal dan thread flusher-nya"""
+
+    def __init__(self):
+        self._kondisi = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._antrian = deque()  # (kunci, baris)
+        self._jurnal = None
+        self._thread = None
+
+    def __len__(self):
+        return len(self._antrian)
+
+    def tambah(self, baris):
+        """Masukkan satu baris komentar; LayananSibuk jika antrian penuh"""
+        config = get_config()
+        with self._kondisi:
+            if len(self._antrian) >= config['MAKS_ANTRIAN']:
+                raise LayananSibuk(wait=math.ceil(config['INTERVAL_MS'] / 1000))
+            kunci = uuid.uuid4().hex
+            if config['DURABILITAS'] != 'memori':
+                if self._jurnal is None:
+                    self._jurnal = Jurnal(config['JURNAL_DIR'], fsync=config['DURABILITAS'] == 'fsync')
+                self._jurnal.tulis({'k': kunci, 'd': baris})
+            self._antrian.append((kunci, baris))
+            if len(self._antrian) >= config['MAKS_BARIS']:
+                self._kondisi.notify()
+        if config['FLUSHER_LATAR']:
+            self._mulai_flusher()
+
+    def flush(self):
+        """Tulis semua komentar tertunda per batch MAKS_BARIS; return jumlah yang ditulis"""
+        batas = get_config()['MAKS_BARIS']
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._kondisi:
+                    batch = [self._antrian.popleft() for _ in range(min(batas, len(self._antrian)))]
+                if not batch:
+                    return total
+                try:
+                    tulis_batch([baris for _, baris in batch])
+                except Exception:
+                    with self._kondisi:
+                        self._antrian.extendleft(reversed(batch))
+                    raise
+                total += len(batch)
+                self._tandai_selesai([kunci for kunci, _ in batch])
+
+    def _tandai_selesai(self, daftar_kunci):
+        with self._kondisi:
+            if self._jurnal is None:
+                return
+            # Antrian kosong: semua isi jurnal sudah tertulis, jurnal bisa dikosongkan
+            if self._antrian:
+                self._jurnal.tulis({'selesai': daftar_kunci})
+            else:
+                self._jurnal.kosongkan()
+
+    def _mulai_flusher(self):
+        if self._thread is not None:
+            return
+        with self._kondisi:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='flusher-komentar', daemon=True)
+                self._thread.start()
+                atexit.register(self.hentikan)
+
+    def _loop(self):
+        config = get_config()
+        if config['DURABILITAS'] != 'memori' and fcntl is not None:
+            try:
+                pulihkan_jurnal(config['JURNAL_DIR'], config['MAKS_BARIS'])
+            except Exception:
+                logger.exception('Pemulihan jurnal buffer komentar gagal')
+        while True:
+            config = get_config()
+            with self._kondisi:
+                self._kondisi.wait_for(
+                    lambda: len(self._antrian) >= config['MAKS_BARIS'],
+                    timeout=config['INTERVAL_MS'] / 1000,
+                )
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                logger.exception('Flush buffer komentar gagal, dicoba lagi')
+                time.sleep(JEDA_GAGAL)
+
+    def hentikan(self):
+        """Flush sisa antrian dan tutup jurnal (dipanggil saat proses exit)"""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Flush terakhir buffer komentar gagal; sisa ada di jurnal')
+        with self._kondisi:
+            if self._jurnal is not None:
+                self._jurnal.tutup()
+                self._jurnal = None
+
+
+_buffer = BufferKomentar()
+
+
+def tambah(validated_data):
+    """Antrikan komentar dari validated_data KomentarCreateSerializer"""
+    komentar = Komentar(**validated_data)
+    _buffer.tambah({kolom: getattr(komentar, kolom) for kolom in KOLOM})
+
+
+def flush():
+    """Flush antrian proses ini sekarang (test / shutdown); return jumlah komentar"""
+    return _buffer.flush()
+
+
+def jumlah_tertunda():
+    return len(_buffer)
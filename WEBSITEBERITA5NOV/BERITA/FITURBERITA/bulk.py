@@ -0,0 +1,173 @@
+"""
+FITURBERITA/bulk.py
+Endpoint bulk create / bulk update untuk ViewSet BERITA dan Komentar
+
+    POST  /api/<resource>/bulk/  : body list objek baru
+    PATCH /api/<resource>/bulk/  : body list objek dengan "id" + field yang diubah
+
+Semua item divalidasi dengan serializer yang sama seperti endpoint biasa.
+Item yang valid ditulis sekaligus (bulk_create / bulk_update) dalam satu
+transaksi; item yang tidak valid dilaporkan per index tanpa membatalkan
+item lainnya.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+DEFAULT_MAKS_ITEM = 1000
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_maks_item():
+    return getattr(settings, 'BERITA_BULK_MAX_ITEMS', DEFAULT_MAKS_ITEM)
+
+
+def _ambil_id(item):
+    """Ambil id integer dari item bulk update, None jika tidak valid"""
+    if not isinstance(item, dict):
+        return None
+    try:
+        return int(item.get('id'))
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkMixin:
+    """
+    Mixin ViewSet untuk action bulk
+
+    Atribut/method yang bisa diatur di ViewSet:
+    - bulk_output_serializer_class : serializer untuk response (default: get_serializer_class())
+    - bulk_batch_size              : batch_size untuk bulk_create / bulk_update
+    - get_bulk_context(data)       : tambahan context serializer (mis. objek relasi yang dimuat sekaligus)
+    - setelah_bulk_create(objs)    : sinkronisasi data turunan (counter, cache, dll)
+    - setelah_bulk_update(objs, nilai_lama)
+    - transaksi_bulk()             : context manager transaksi penulisan (validasi di luarnya)
+    """
+    bulk_output_serializer_class = None
+    bulk_batch_size = DEFAULT_BATCH_SIZE
+    bulk_label = 'Data'
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Bulk create (POST) atau bulk update (PATCH)
+        Endpoint: /api/<resource>/bulk/
+        """
+        data = request.data
+        if not isinstance(data, list):
+            raise ValidationError({'detail': 'Body request harus berupa list'})
+        if len(data) > get_maks_item():
+            raise ValidationError({'detail': f'Maksimal {get_maks_item()} item per request'})
+        if request.method == 'POST':
+            return self.bulk_create(data)
+        return self.bulk_update(data)
+
+    def get_bulk_context(self, data):
+        return {}
+
+    def get_bulk_output_serializer(self, objs):
+        serializer_class = self.bulk_output_serializer_class or self.get_serializer_class()
+        return serializer_class(objs, many=True, context=self.get_serializer_context())
+
+    def setelah_bulk_create(self, objs):
+        pass
+
+    def setelah_bulk_update(self, objs, nilai_lama):
+        pass
+
+    def transaksi_bulk(self):
+        return transaction.atomic()
+
+    def bulk_create(self, data):
+        """Validasi semua item dengan serializer many=True lalu bulk_create item yang valid"""
+        context = {**self.get_serializer_context(), **self.get_bulk_context(data)}
+        serializer = self.get_serializer_class()(data=data, many=True, context=context)
+
+        valid, errors = [], []
+        for index, item in enumerate(serializer.initial_data):
+            try:
+                valid.append(serializer.child.run_validation(item))
+            except ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+
+        model = serializer.child.Meta.model
+        objs = [model(**validated) for validated in valid]
+        if objs:
+            with self.transaksi_bulk():
+                model.objects.bulk_create(objs, batch_size=self.bulk_batch_size)
+                self.setelah_bulk_create(objs)
+        return self._bulk_response(objs, errors, 'dibuat', status.HTTP_201_CREATED)
+
+    def bulk_update(self, data):
+        """Validasi tiap item (partial) terhadap objek lama lalu bulk_update sekaligus"""
+        context = {**self.get_serializer_context(), **self.get_bulk_context(data)}
+        serializer_class = self.get_serializer_class()
+        ids = [_ambil_id(item) for item in data]
+        instances = self.get_queryset().in_bulk([pk for pk in ids if pk is not None])
+
+        objs, errors, fields, nilai_lama = [], [], set(), {}
+        for index, (pk, item) in enumerate(zip(ids, data)):
+            instance = instances.get(pk)
+            if instance is None:
+                errors.append({'index': index, 'errors': {'id': ['Data tidak ditemukan']}})
+                continue
+            if pk in nilai_lama:
+                errors.append({'index': index, 'errors': {'id': ['ID duplikat dalam request']}})
+                continue
+            serializer = serializer_class(instance, data=item, partial=True, context=context)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            nilai_lama[instance.pk] = {
+                field.attname: getattr(instance, field.attname)
+                for field in instance._meta.concrete_fields
+            }
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+            objs.append(instance)
+
+        if objs and fields:
+            fields |= self.get_bulk_update_extra_fields(objs)
+            with self.transaksi_bulk():
+                type(objs[0]).objects.bulk_update(
+                    objs, sorted(fields), batch_size=self.bulk_batch_size
+                )
+                self.setelah_bulk_update(objs, nilai_lama)
+        return self._bulk_response(objs, errors, 'diupdate', status.HTTP_200_OK)
+
+    def get_bulk_update_extra_fields(self, objs):
+        """
+        Field auto_now dan field turunan (punya atribut sumber, mis. RingkasanField)
+        tidak diisi otomatis oleh bulk_update, isi manual di sini
+        """
+        extra = set()
+        for field in objs[0]._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'sumber', None):
+                for obj in objs:
+                    field.pre_save(obj, add=False)
+                extra.add(field.name)
+        return extra
+
+    def _bulk_response(self, objs, errors, kata_kerja, status_sukses):
+        if errors and not objs:
+            status_code = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status_sukses
+        return Response(
+            {
+                'message': f'{len(objs)} {self.bulk_label} berhasil {kata_kerja}, {len(errors)} gagal',
+                'berhasil': len(objs),
+                'gagal': len(errors),
+                'data': self.get_bulk_output_serializer(objs).data,
+                'errors': errors,
+            },
+            status=status_code
+        )
@@ -0,0 +1,237 @@
+"""
+FITURBERITA/cache.py
+Response cache untuk endpoint baca BERITA (list, detail, terbaru)
+
+Cara kerja:
+- Key cache = scope + versi scope + hash(scheme, host, path, query params, renderer);
+  scheme dan host ikut karena response berisi URL absolut (next/previous, gambar)
+- Setiap scope punya nomor versi; invalidasi cukup menaikkan versi
+  (entry lama otomatis tidak terpakai dan kedaluwarsa sendiri)
+- Versi dinaikkan oleh signals di FITURBERITA/signals.py saat BERITA/Komentar berubah
+- Halaman panas (prakompresi, mis. list halaman pertama dan terbaru) menyimpan
+  juga varian gzip/brotli, dipakai KompresiMiddleware saat hit tanpa kompres ulang
+
+Konfigurasi di settings.BERITA_RESPONSE_CACHE:
+    ALIAS   : alias di settings.CACHES (default 'default', LocMemCache)
+    TIMEOUT : umur entry dalam detik
+    ENABLED : aktif/nonaktif
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from . import kompresi
+from .conditional import jawab_conditional
+
+PREFIX = 'berita:resp'
+
+SCOPE_LIST = 'list'
+SCOPE_TERBARU = 'terbaru'
+SCOPE_DETAIL = 'detail'
+
+# Header validator yang ikut disimpan bersama isi response
+HEADER_DISIMPAN = ('ETag', 'Last-Modified')
+
+# Renderer yang output-nya spesifik per user (CSRF token, form), jangan di-cache
+FORMAT_TIDAK_DICACHE = ('api',)
+
+# Query param yang masih dihitung halaman pertama list (lihat halaman_pertama)
+PARAM_HALAMAN_PERTAMA = ('page', 'paginasi', 'fields')
+
+DEFAULT_CONFIG = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'ENABLED': True,
+}
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_RESPONSE_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_config()['ALIAS']]
+
+
+def _version_key(scope, ident=None):
+    return f'{PREFIX}:v:{scope}' if ident is None else f'{PREFIX}:v:{scope}:{ident}'
+
+
+def _stat_key(nama):
+    return f'{PREFIX}:stat:{nama}'
+
+
+def _incr(cache, key, awal=0):
+    """Increment counter di cache; buat dulu jika belum ada / sudah ter-evict"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, awal, timeout=None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            return None
+
+
+def _versi(cache, version_keys):
+    """
+    Ambil versi untuk setiap scope
+    Versi awal memakai timestamp agar key yang ter-evict tidak menghidupkan entry lama
+    """
+    versi = cache.get_many(version_keys)
+    for key in version_keys:
+        if key not in versi:
+            cache.add(key, time.time_ns(), timeout=None)
+            versi[key] = cache.get(key)
+    return [versi[key] for key in version_keys]
+
+
+def _scope_keys(scope, ident):
+    """Scope detail juga bergantung pada versi global BERITA"""
+    if scope == SCOPE_DETAIL:
+        return [_version_key(SCOPE_DETAIL), _version_key(SCOPE_DETAIL, ident)]
+    return [_version_key(scope)]
+
+
+def build_key(request, scope, ident=None):
+    """Susun key cache dari scope, versi, scheme, host, path, query params dan renderer"""
+    cache = get_cache()
+    versi = ':'.join(str(v) for v in _versi(cache, _scope_keys(scope, ident)))
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    renderer = getattr(request, 'accepted_media_type', '')
+    raw = f'{request.scheme}://{request.get_host()}{request.path}|{params}|{renderer}'
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'{PREFIX}:{scope}:{ident or "-"}:{versi}:{digest}'
+
+
+def _bisa_dicache(request):
+    renderer = getattr(request, 'accepted_renderer', None)
+    return (
+        get_config()['ENABLED']
+        and request.method in ('GET', 'HEAD')
+        and getattr(renderer, 'format', None) not in FORMAT_TIDAK_DICACHE
+    )
+
+
+def halaman_pertama(request):
+    """List halaman pertama tanpa filter/search/ordering: halaman yang paling sering dibaca"""
+    params = request.query_params
+    return all(nama in PARAM_HALAMAN_PERTAMA for nama in params) and params.get('page', '1') == '1'
+
+
+def cache_response(scope, ident_kwarg=None, prakompresi=False):
+    """
+    Decorator untuk method view/action DRF yang hasilnya boleh di-cache
+
+    prakompresi: True atau callable(request) -> bool; jika benar, varian
+    terkompresi disimpan bersama entry (FITURBERITA/kompresi.py)
+
+    Contoh:
+        @cache_response(SCOPE_DETAIL, ident_kwarg='pk')
+        def retrieve(self, request, *args, **kwargs): ...
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if not _bisa_dicache(request):
+                return func(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            ident = kwargs.get(ident_kwarg) if ident_kwarg else None
+            key = build_key(request, scope, ident)
+            entry = cache.get(key)
+            if entry is not None:
+                _incr(cache, _stat_key('hit'))
+                # Entry dari versi sebelum prakompresi belum punya varian
+                content, status_code, content_type, headers, *varian = entry
+                response = HttpResponse(content, status=status_code, content_type=content_type)
+                for nama, nilai in headers.items():
+                    response[nama] = nilai
+                response.varian_kompresi = varian[0] if varian else {}
+                response['X-Cache'] = 'HIT'
+                return jawab_conditional(request, response)
+
+            _incr(cache, _stat_key('miss'))
+            response = func(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                timeout = get_config()['TIMEOUT']
+                panas = prakompresi(request) if callable(prakompresi) else prakompresi
+
+                def simpan(rendered):
+                    headers = {
+                        nama: rendered[nama] for nama in HEADER_DISIMPAN if rendered.has_header(nama)
+                    }
+                    # Varian juga dipakai middleware untuk response miss ini
+                    rendered.varian_kompresi = kompresi.varian(rendered) if panas else {}
+                    cache.set(
+                        key,
+                        (
+                            rendered.content, rendered.status_code, rendered['Content-Type'],
+                            headers, rendered.varian_kompresi
+                        ),
+                        timeout
+                    )
+
+                response.add_post_render_callback(simpan)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def _naikkan_versi(version_keys):
+    cache = get_cache()
+    for key in version_keys:
+        _incr(cache, key, awal=time.time_ns())
+
+
+def invalidasi(scopes=(), detail_ids=()):
+    """
+    Naikkan versi scope yang terdampak perubahan data
+    Dijalankan langsung dan sekali lagi setelah commit, supaya request lain
+    yang sempat meng-cache data lama sebelum commit tidak bertahan
+    """
+    version_keys = [_version_key(scope) for scope in scopes]
+    version_keys += [
+        _version_key(SCOPE_DETAIL, ident)
+        for ident in {str(ident) for ident in detail_ids if ident is not None}
+    ]
+    if not version_keys:
+        return
+    _naikkan_versi(version_keys)
+    transaction.on_commit(lambda: _naikkan_versi(version_keys))
+
+
+def invalidasi_semua():
+    """Invalidasi semua response BERITA (dipakai setelah bulk write)"""
+    invalidasi(scopes=(SCOPE_LIST, SCOPE_TERBARU, SCOPE_DETAIL))
+
+
+def statistik():
+    """Counter hit/miss untuk monitoring"""
+    cache = get_cache()
+    nilai = cache.get_many([_stat_key('hit'), _stat_key('miss')])
+    hit = nilai.get(_stat_key('hit'), 0)
+    miss = nilai.get(_stat_key('miss'), 0)
+    total = hit + miss
+    return {
+        'hit': hit,
+        'miss': miss,
+        'hit_ratio': round(hit / total, 4) if total else 0.0,
+        'alias': get_config()['ALIAS'],
+    }
+
+
+def reset_statistik():
+    get_cache().delete_many([_stat_key('hit'), _stat_key('miss')])
@@ -0,0 +1,121 @@
+"""
+FITURBERITA/conditional.py
+Conditional GET (ETag / Last-Modified) untuk endpoint baca BERITA
+
+Validator dihitung dari data yang murah di-query (kolom BERITA.diperbarui yang
+terindeks dan jumlah baris), bukan dari hasil serialisasi. Jika client mengirim
+If-None-Match / If-Modified-Since yang masih cocok, view langsung menjawab 304
+tanpa menjalankan query utama maupun serializer.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import BERITA
+
+
+def buat_etag(request, *bagian):
+    """
+    ETag strong: unik per representasi (path + query params + media type)
+    dan per versi data
+    """
+    raw = '|'.join(
+        [request.get_full_path(), getattr(request, 'accepted_media_type', '')]
+        + [str(b) for b in bagian]
+    )
+    return '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _timestamp(waktu):
+    return int(waktu.timestamp()) if waktu is not None else None
+
+
+def validator_list(view, request, **kwargs):
+    """
+    List: perubahan terakhir + jumlah baris pada queryset yang sudah difilter
+    Mode keyset tidak diberi validator agar tetap bebas query COUNT(*)
+    """
+    pakai_keyset = getattr(view.paginator, 'pakai_keyset', None)
+    if pakai_keyset is not None and pakai_keyset(request):
+        return None
+    queryset = view.filter_queryset(view.get_queryset()).order_by()
+    data = queryset.aggregate(terakhir=Max('diperbarui'), jumlah=Count('pk'))
+    return buat_etag(request, data['terakhir'], data['jumlah']), data['terakhir']
+
+
+def validator_semua_BERITA(view, request, **kwargs):
+    """Terbaru: bergantung pada seluruh tabel BERITA (termasuk penghapusan)"""
+    data = BERITA.objects.order_by().aggregate(terakhir=Max('diperbarui'), jumlah=Count('pk'))
+    return buat_etag(request, data['terakhir'], data['jumlah']), data['terakhir']
+
+
+def validator_detail(view, request, pk=None, **kwargs):
+    """Detail / komentar: waktu diperbarui satu BERITA (lookup primary key)"""
+    try:
+        terakhir = (
+            BERITA.objects.filter(pk=pk).values_list('diperbarui', flat=True).first()
+        )
+    except (TypeError, ValueError):
+        return None
+    if terakhir is None:
+        return None  # Biarkan view yang menjawab 404
+    return buat_etag(request, pk, terakhir), terakhir
+
+
+def pasang_header(response, etag, terakhir):
+    """Tambahkan header ETag dan Last-Modified ke response"""
+    if etag and not response.has_header('ETag'):
+        response['ETag'] = etag
+    if terakhir is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(_timestamp(terakhir))
+    return response
+
+
+def jawab_conditional(request, response):
+    """
+    Cek header conditional request terhadap ETag/Last-Modified pada response
+    (dipakai untuk response yang diambil dari cache)
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return response
+    last_modified = response.get('Last-Modified')
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+        response=response,
+    )
+
+
+def conditional_response(validator):
+    """
+    Decorator untuk method view/action DRF: jawab 304 sebelum view dijalankan
+    jika validator dari database masih cocok dengan header request
+
+    validator(view, request, **kwargs) -> (etag, datetime terakhir) atau None
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return func(self, request, *args, **kwargs)
+
+            hasil = validator(self, request, **kwargs)
+            if hasil is None:
+                return func(self, request, *args, **kwargs)
+
+            etag, terakhir = hasil
+            response = get_conditional_response(
+                request, etag=etag, last_modified=_timestamp(terakhir)
+            )
+            if response is None:
+                response = func(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return pasang_header(response, etag, terakhir)
+        return wrapper
+    return decorator
@@ -0,0 +1,155 @@
+"""
+FITURBERITA/export.py
+Export streaming (NDJSON / CSV) untuk seluruh arsip BERITA dan Komentar
+
+    GET /api/<resource>/export/                         : NDJSON (default)
+    GET /api/<resource>/export/?jenis=csv               : CSV
+    GET /api/<resource>/export/?since=2025-11-01T00:00  : hanya data dengan tanggal > since
+
+Baris diambil dengan values() + iterator(chunk_size) lalu langsung ditulis ke
+StreamingHttpResponse, sehingga memori tetap konstan berapa pun ukuran tabel.
+Urutan selalu (tanggal, id) agar export incremental bisa dilanjutkan dari
+tanggal terakhir yang sudah diterima: tanggal ditulis lengkap sampai
+mikrodetik (ISO 8601) di NDJSON maupun CSV, sama presisinya dengan since.
+"""
+
+import csv
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+DEFAULT_CHUNK_SIZE = 2000
+
+JENIS_EXPORT = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def get_chunk_size():
+    return getattr(settings, 'BERITA_EXPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def parse_waktu(nilai):
+    """
+    Parse ISO datetime atau tanggal saja menjadi datetime aware
+    Return None jika format tidak dikenal
+    """
+    try:
+        waktu = parse_datetime(nilai)
+        if waktu is None:
+            tanggal = parse_date(nilai)
+            if tanggal is not None:
+                waktu = datetime.combine(tanggal, time.min)
+    except ValueError:
+        return None
+    if waktu is not None and timezone.is_naive(waktu):
+        waktu = timezone.make_aware(waktu)
+    return waktu
+
+
+def parse_since(nilai):
+    """Parse parameter since=, raise ValidationError jika format tidak dikenal"""
+    waktu = parse_waktu(nilai)
+    if waktu is None:
+        raise ValidationError({'since': ['Format harus ISO 8601, contoh 2025-11-05T10:00:00']})
+    return waktu
+
+
+class _Echo:
+    """Pseudo-buffer untuk csv.writer: write() mengembalikan baris, bukan menyimpannya"""
+    def write(self, value):
+        return value
+
+
+def _kelompokkan(baris_iter, ukuran):
+    """Gabungkan potongan output per `ukuran` baris agar jumlah chunk HTTP tidak berlebihan"""
+    buffer = []
+    for baris in baris_iter:
+        buffer.append(baris)
+        if len(buffer) >= ukuran:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """
+    datetime ditulis penuh sampai mikrodetik (isoformat, sama dengan CSV);
+    DjangoJSONEncoder memotongnya ke milidetik sehingga since=<tanggal terakhir>
+    mengembalikan baris terakhir itu lagi
+    """
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def stream_ndjson(rows):
+    encoder = ExportJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def stream_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_nilai_csv(row[field]) for field in fields])
+
+
+def _nilai_csv(nilai):
+    if hasattr(nilai, 'isoformat'):
+        return nilai.isoformat()
+    return '' if nilai is None else nilai
+
+
+class ExportMixin:
+    """
+    Mixin ViewSet untuk action export
+
+    Atribut yang harus diatur di ViewSet:
+    - export_fields : nama kolom untuk values() (boleh attname FK, mis. 'BERITA_id')
+    - export_nama   : prefix nama file download
+    """
+    export_fields = ()
+    export_nama = 'export'
+
+    def get_export_queryset(self, request):
+        queryset = self.queryset.model.objects.all()
+        since = request.query_params.get('since')
+        if since:
+            queryset = queryset.filter(tanggal__gt=parse_since(since))
+        return queryset.order_by('tanggal', 'id').values(*self.export_fields)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Export seluruh data secara streaming
+        Endpoint: /api/<resource>/export/?jenis=ndjson|csv&since=<ISO datetime>
+        """
+        jenis = request.query_params.get('jenis', 'ndjson')
+        if jenis not in JENIS_EXPORT:
+            raise ValidationError({'jenis': [f'Pilihan: {", ".join(JENIS_EXPORT)}']})
+
+        rows = self.get_export_queryset(request).iterator(chunk_size=get_chunk_size())
+        if jenis == 'csv':
+            baris = stream_csv(rows, self.export_fields)
+        else:
+            baris = stream_ndjson(rows)
+
+        response = StreamingHttpResponse(
+            _kelompokkan(baris, ukuran=500),
+            content_type=JENIS_EXPORT[jenis]
+        )
+        nama_file = f'{self.export_nama}-{timezone.now():%Y%m%d%H%M%S}.{jenis}'
+        response['Content-Disposition'] = f'attachment; filename="{nama_file}"'
+        response['Cache-Control'] = 'no-store'
+        return response
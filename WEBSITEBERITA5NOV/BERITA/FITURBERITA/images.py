@@ -0,0 +1,180 @@
+"""
+FITURBERITA/images.py
+Pipeline gambar turunan (derivative) untuk BERITA.gambar
+
+Setiap upload gambar menghasilkan beberapa ukuran (thumbnail, card, full),
+masing-masing dalam format WebP dan JPEG (fallback). Nama file memakai hash
+isi file sehingga aman di-cache selamanya oleh browser/CDN, dan proses yang
+diulang untuk gambar yang sama tidak membuat file baru.
+
+Hasilnya disimpan di BERITA.gambar_turunan, contoh:
+    {
+        "thumbnail": {"webp": "BERITA_images/turunan/thumbnail.1a2b3c4d5e6f.webp",
+                      "jpeg": "BERITA_images/turunan/thumbnail.9f8e7d6c5b4a.jpg",
+                      "width": 150, "height": 150},
+        ...
+    }
+"""
+
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import cache as response_cache
+from .models import BERITA
+
+logger = logging.getLogger(__name__)
+
+FOLDER_TURUNAN = 'BERITA_images/turunan'
+
+# nama: (lebar, tinggi, crop). crop=True memotong agar pas, False hanya memperkecil
+UKURAN_TURUNAN = {
+    'thumbnail': (150, 150, True),
+    'card': (640, 360, True),
+    'full': (1600, 1600, False),
+}
+
+FORMAT_OUTPUT = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def _buka_gambar(file_gambar):
+    """Buka gambar, koreksi orientasi EXIF dan ubah ke RGB (background putih)"""
+    file_gambar.open('rb')
+    try:
+        gambar = Image.open(file_gambar)
+        gambar.load()
+    finally:
+        file_gambar.close()
+    gambar = ImageOps.exif_transpose(gambar)
+    if gambar.mode in ('RGBA', 'LA', 'P'):
+        gambar = gambar.convert('RGBA')
+        latar = Image.new('RGB', gambar.size, (255, 255, 255))
+        latar.paste(gambar, mask=gambar.split()[-1])
+        return latar
+    return gambar.convert('RGB')
+
+
+def _ubah_ukuran(gambar, lebar, tinggi, crop):
+    if crop:
+        return ImageOps.fit(gambar, (lebar, tinggi), method=Image.LANCZOS)
+    hasil = gambar.copy()
+    hasil.thumbnail((lebar, tinggi), Image.LANCZOS)  # tidak pernah memperbesar
+    return hasil
+
+
+def _simpan(gambar, nama, format_key):
+    """Encode gambar lalu simpan dengan nama berbasis hash isi file"""
+    format_pil, ekstensi, opsi = FORMAT_OUTPUT[format_key]
+    buffer = io.BytesIO()
+    gambar.save(buffer, format=format_pil, **opsi)
+    data = buffer.getvalue()
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    path = f'{FOLDER_TURUNAN}/{nama}.{digest}.{ekstensi}'
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(data))
+    return path
+
+
+def buat_turunan(file_gambar):
+    """
+    Buat semua gambar turunan dari sebuah FieldFile / File
+    Return: dict untuk disimpan di BERITA.gambar_turunan
+    """
+    asli = _buka_gambar(file_gambar)
+    hasil = {}
+    for nama, (lebar, tinggi, crop) in UKURAN_TURUNAN.items():
+        gambar = _ubah_ukuran(asli, lebar, tinggi, crop)
+        hasil[nama] = {
+            format_key: _simpan(gambar, nama, format_key)
+            for format_key in FORMAT_OUTPUT
+        }
+        hasil[nama].update(width=gambar.width, height=gambar.height)
+    return hasil
+
+
+def path_turunan(turunan):
+    """Semua path file di dict gambar_turunan"""
+    return {
+        nilai
+        for varian in (turunan or {}).values()
+        for key, nilai in varian.items() if key in FORMAT_OUTPUT
+    }
+
+
+def hapus_turunan_lama(BERITA_id, lama, baru):
+    """
+    Hapus file turunan lama yang tidak dipakai lagi (gambar diganti/dihapus)
+    Nama file berbasis hash isi, sehingga file yang masih dipakai BERITA lain dibiarkan
+    """
+    kandidat = path_turunan(lama) - path_turunan(baru)
+    if not kandidat:
+        return
+    dipakai = Q()
+    for turunan in (lama, baru):
+        for nama, varian in (turunan or {}).items():
+            for format_key in FORMAT_OUTPUT:
+                if varian.get(format_key) in kandidat:
+                    dipakai |= Q(**{f'gambar_turunan__{nama}__{format_key}': varian[format_key]})
+    for turunan in BERITA.objects.exclude(pk=BERITA_id).filter(dipakai).values_list('gambar_turunan', flat=True):
+        kandidat -= path_turunan(turunan)
+    for path in kandidat:
+        default_storage.delete(path)
+
+
+def proses_gambar_BERITA(BERITA_id):
+    """
+    Buat turunan untuk BERITA tertentu dan simpan hasilnya, lalu hapus file
+    turunan gambar sebelumnya. File yang bukan gambar valid hanya di-log;
+    error lain (storage/disk) diteruskan agar tugasnya dicoba ulang
+    Return: dict turunan, atau None jika BERITA tidak ada atau gambar tidak valid
+    """
+    BERITA_obj = BERITA.objects.filter(pk=BERITA_id).only('id', 'gambar', 'gambar_turunan').first()
+    if BERITA_obj is None:
+        return None
+
+    if not BERITA_obj.gambar:
+        turunan = {}
+    else:
+        try:
+            turunan = buat_turunan(BERITA_obj.gambar)
+        except (UnidentifiedImageError, Image.DecompressionBombError) as exc:
+            logger.warning('Gagal membuat turunan gambar BERITA %s: %s', BERITA_id, exc)
+            return None
+
+    # Hanya simpan jika gambar belum diganti lagi selama proses berjalan
+    queryset = BERITA.objects.filter(pk=BERITA_id)
+    if BERITA_obj.gambar:
+        queryset = queryset.filter(gambar=BERITA_obj.gambar.name)
+    else:
+        queryset = queryset.filter(Q(gambar__isnull=True) | Q(gambar=''))
+    if queryset.update(gambar_turunan=turunan, diperbarui=timezone.now()):
+        hapus_turunan_lama(BERITA_id, BERITA_obj.gambar_turunan, turunan)
+    response_cache.invalidasi(
+        scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+        detail_ids=(BERITA_id,)
+    )
+    return turunan
+
+
+def url_turunan(turunan, request=None):
+    """Ubah path di gambar_turunan menjadi URL (absolut jika ada request)"""
+    if not turunan:
+        return None
+    hasil = {}
+    for nama, varian in turunan.items():
+        hasil[nama] = {}
+        for key, nilai in varian.items():
+            if key in FORMAT_OUTPUT:
+                url = default_storage.url(nilai)
+                nilai = request.build_absolute_uri(url) if request is not None else url
+            hasil[nama][key] = nilai
+    return hasil
@@ -0,0 +1,351 @@
+"""
+FITURBERITA/importer.py
+Import massal BERITA dan Komentar dari NDJSON / CSV (format sama dengan export)
+
+- Setiap baris divalidasi dengan aturan serializer yang sama seperti API
+- Baris valid ditulis per batch dengan bulk_create dalam satu transaksi
+- Nilai tanggal asli dipertahankan (ditulis ulang setelah insert, lihat
+  bulk_create_pertahankan_waktu)
+- Batch yang melanggar constraint (mis. id duplikat) dibatalkan dan dicatat
+  sebagai gagal per baris; batch lain tetap di-import
+- File gambar disalin ke storage secara paralel dengan thread pool
+- Counter jumlah_komentar dan cache response disinkronkan per batch
+
+Dipakai oleh: python manage.py import_arsip
+"""
+
+import csv
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import cache as response_cache
+from . import taskqueue
+from .export import parse_waktu
+from .models import BERITA, Komentar
+from .serializers import BERITASerializer, KomentarSerializer
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 8
+
+# Error yang disimpan untuk laporan (sisanya hanya dihitung)
+MAKS_ERROR_DISIMPAN = 100
+
+
+def deteksi_jenis(path):
+    """Tebak jenis file dari ekstensi: .csv -> csv, selain itu ndjson"""
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+
+def baca_baris(stream, jenis):
+    """
+    Baca stream teks baris demi baris (memori konstan)
+    Yield: dict per baris
+    """
+    if jenis == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for nomor, baris in enumerate(stream, start=1):
+        baris = baris.strip()
+        if not baris:
+            continue
+        try:
+            yield json.loads(baris)
+        except json.JSONDecodeError as exc:
+            yield {'__error__': f'Baris {nomor} bukan JSON valid: {exc}'}
+
+
+def bulk_create_pertahankan_waktu(model, objs, batch_size=None):
+    """
+    bulk_create yang menyimpan nilai auto_now / auto_now_add dari objek (tanggal
+    data sumber), bukan waktu insert. pre_save field tersebut menimpa nilai di
+    objek saat bulk_create; nilai asli dikembalikan lalu ditulis ulang dengan
+    satu UPDATE per baris lewat executemany (bulk_update membangun CASE WHEN
+    per baris di Python, ~3x lebih lambat untuk seluruh import). Field model
+    tidak diubah, sehingga save() lain di proses yang sama tetap memakai waktu
+    sekarang. Panggil di dalam transaksi
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    asli = [[getattr(obj, field.attname) for field in fields] for obj in objs]
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    if not fields:
+        return objs
+    for obj, nilai_obj in zip(objs, asli):
+        for field, nilai in zip(fields, nilai_obj):
+            if nilai is not None:
+                setattr(obj, field.attname, nilai)
+    qn = connection.ops.quote_name
+    sql = 'UPDATE %s SET %s WHERE %s = %%s' % (
+        qn(model._meta.db_table),
+        ', '.join(f'{qn(field.column)} = %s' for field in fields),
+        qn(model._meta.pk.column),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            [field.get_db_prep_save(getattr(obj, field.attname), connection) for field in fields] + [obj.pk]
+            for obj in objs
+        ])
+    return objs
+
+
+def _kosong(nilai):
+    return nilai is None or nilai == ''
+
+
+class HasilImport:
+    """Ringkasan hasil import"""
+
+    def __init__(self):
+        self.berhasil = 0
+        self.gagal = 0
+        self.errors = []
+        self.jumlah_peringatan = 0
+        self.peringatan = []
+        self.mulai = time.monotonic()
+
+    @property
+    def durasi(self):
+        return time.monotonic() - self.mulai
+
+    @property
+    def baris_per_detik(self):
+        return self.berhasil / self.durasi if self.durasi else 0.0
+
+    def catat_error(self, nomor, errors):
+        self.gagal += 1
+        if len(self.errors) < MAKS_ERROR_DISIMPAN:
+            self.errors.append({'baris': nomor, 'errors': errors})
+
+    def catat_peringatan(self, nomor, pesan):
+        """Baris tetap di-import, tapi ada bagian yang dilewati (mis. gambar gagal disalin)"""
+        self.jumlah_peringatan += 1
+        if len(self.peringatan) < MAKS_ERROR_DISIMPAN:
+            self.peringatan.append({'baris': nomor, 'pesan': pesan})
+
+
+class Importer:
+    """
+    Dasar importer; subclass mengatur model, serializer dan sinkronisasi per batch
+    """
+    model = None
+    serializer_class = None
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, pertahankan_id=False,
+                 sumber_gambar=None, workers=DEFAULT_WORKERS, progress=None):
+        self.batch_size = batch_size
+        self.pertahankan_id = pertahankan_id
+        self.sumber_gambar = sumber_gambar
+        self.workers = workers
+        self.progress = progress
+
+    def get_context(self, rows):
+        """Context serializer untuk satu batch"""
+        return {}
+
+    def normalisasi(self, row):
+        """Ubah baris sumber menjadi data untuk serializer"""
+        return dict(row)
+
+    def siapkan_objek(self, objs, batch, hasil):
+        """Hook sebelum bulk_create (mis. menyalin file); batch berisi (nomor, row) per obj"""
+
+    def setelah_batch(self, objs):
+        """Hook setelah bulk_create di dalam transaksi batch"""
+
+    def batch_gagal(self, objs):
+        """Hook setelah transaksi batch dibatalkan (mis. hapus file yang sudah disalin)"""
+
+    def buat_objek(self, row, validated):
+        obj = self.model(**validated)
+        obj.tanggal = self.parse_tanggal(row, 'tanggal') or timezone.now()
+        if self.pertahankan_id and not _kosong(row.get('id')):
+            try:
+                obj.pk = int(row['id'])
+            except (TypeError, ValueError):
+                raise ValidationError({'id': ['ID harus berupa angka']})
+        return obj
+
+    def parse_tanggal(self, row, field):
+        """Nilai tanggal dari data sumber; None jika kosong"""
+        nilai = row.get(field)
+        if _kosong(nilai):
+            return None
+        waktu = parse_waktu(str(nilai))
+        if waktu is None:
+            raise ValidationError({field: ['Format tanggal tidak valid']})
+        return waktu
+
+    def proses_batch(self, batch, hasil):
+        rows = [row for _, row in batch]
+        serializer = self.serializer_class(many=True, context=self.get_context(rows))
+        objs, sumber = [], []
+        for nomor, row in batch:
+            if '__error__' in row:
+                hasil.catat_error(nomor, row['__error__'])
+                continue
+            try:
+                validated = serializer.child.run_validation(self.normalisasi(row))
+                objs.append(self.buat_objek(row, validated))
+                sumber.append((nomor, row))
+            except ValidationError as exc:
+                hasil.catat_error(nomor, exc.detail)
+
+        if not objs:
+            return
+        self.siapkan_objek(objs, sumber, hasil)
+        try:
+            with transaction.atomic():
+                bulk_create_pertahankan_waktu(self.model, objs, batch_size=self.batch_size)
+                self.setelah_batch(objs)
+        except IntegrityError as exc:
+            # Mis. id duplikat dengan --pertahankan-id: seluruh batch dibatalkan, batch lain lanjut
+            self.batch_gagal(objs)
+            for nomor, _ in sumber:
+                hasil.catat_error(nomor, f'Batch baris {sumber[0][0]}-{sumber[-1][0]} gagal disimpan: {exc}')
+            return
+        hasil.berhasil += len(objs)
+
+    def jalankan(self, rows):
+        """Import semua baris dari iterable dict; return HasilImport"""
+        hasil = HasilImport()
+        bernomor = enumerate(rows, start=1)
+        while True:
+            batch = list(islice(bernomor, self.batch_size))
+            if not batch:
+                break
+            self.proses_batch(batch, hasil)
+            if self.progress:
+                self.progress(hasil)
+
+        if self.pertahankan_id:
+            self.reset_sequence()
+        response_cache.invalidasi_semua()
+        return hasil
+
+    def reset_sequence(self):
+        """Samakan sequence primary key setelah insert dengan id eksplisit (PostgreSQL)"""
+        sql_list = connection.ops.sequence_reset_sql(no_style(), [self.model])
+        if sql_list:
+            with connection.cursor() as cursor:
+                for sql in sql_list:
+                    cursor.execute(sql)
+
+
+class BERITAImporter(Importer):
+    model = BERITA
+    serializer_class = BERITASerializer
+
+    def normalisasi(self, row):
+        # gambar berupa path (bukan upload), diproses terpisah di siapkan_objek
+        return {key: row.get(key) for key in ('judul', 'isi_BERITA')}
+
+    def buat_objek(self, row, validated):
+        obj = super().buat_objek(row, validated)
+        obj.diperbarui = self.parse_tanggal(row, 'diperbarui') or obj.tanggal
+        return obj
+
+    def _path_sumber(self, path):
+        """
+        Path file di folder sumber gambar; SuspiciousFileOperation jika path
+        (absolut, ../ atau symlink) menunjuk ke luar folder tersebut
+        """
+        folder = os.path.realpath(self.sumber_gambar)
+        lengkap = os.path.realpath(os.path.join(folder, path))
+        if os.path.commonpath([folder, lengkap]) != folder:
+            raise SuspiciousFileOperation(f'{path} berada di luar folder sumber gambar')
+        return lengkap
+
+    def _salin_gambar(self, path):
+        """Salin satu file dari folder sumber ke storage; return nama file tersimpan"""
+        with open(self._path_sumber(path), 'rb') as sumber:
+            nama = BERITA._meta.get_field('gambar').generate_filename(None, os.path.basename(path))
+            return default_storage.save(nama, File(sumber))
+
+    def siapkan_objek(self, objs, batch, hasil):
+        """
+        Tanpa --sumber-gambar path dianggap sudah ada di storage;
+        dengan --sumber-gambar file disalin paralel (I/O bound, aman untuk thread).
+        Gambar yang gagal disalin dicatat sebagai peringatan, BERITA tetap di-import tanpa gambar
+        """
+        tugas = [
+            (obj, nomor, row['gambar'])
+            for obj, (nomor, row) in zip(objs, batch) if not _kosong(row.get('gambar'))
+        ]
+        if not self.sumber_gambar:
+            for obj, _, path in tugas:
+                obj.gambar = path
+            return
+
+        def salin(item):
+            obj, nomor, path = item
+            try:
+                return obj, nomor, self._salin_gambar(path), None
+            except (OSError, SuspiciousFileOperation) as exc:
+                return obj, nomor, None, f'Gambar {path} tidak disalin: {exc}'
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for obj, nomor, nama, pesan in pool.map(salin, tugas):
+                obj.gambar = nama
+                if pesan:
+                    hasil.catat_peringatan(nomor, pesan)
+
+    def batch_gagal(self, objs):
+        """File yang sudah disalin dari --sumber-gambar tidak jadi dipakai"""
+        if not self.sumber_gambar:
+            return
+        for obj in objs:
+            if obj.gambar:
+                default_storage.delete(obj.gambar.name)
+
+    def setelah_batch(self, objs):
+        """bulk_create tidak mengirim post_save: antrikan gambar turunan manual"""
+        for obj in objs:
+            if obj.gambar:
+                taskqueue.antrikan('gambar.proses_turunan', obj.pk)
+
+
+class KomentarImporter(Importer):
+    model = Komentar
+    serializer_class = KomentarSerializer
+
+    def normalisasi(self, row):
+        BERITA_id = row.get('BERITA_id', row.get('BERITA'))
+        return {'nama': row.get('nama'), 'isi_komentar': row.get('isi_komentar'), 'BERITA': BERITA_id}
+
+    def get_context(self, rows):
+        """Muat semua BERITA yang dirujuk batch ini dengan satu query"""
+        ids = set()
+        for row in rows:
+            try:
+                ids.add(int(row.get('BERITA_id', row.get('BERITA'))))
+            except (TypeError, ValueError):
+                continue
+        return {'objek_relasi': {BERITA: BERITA.objects.only('id').in_bulk(ids)}}
+
+    def setelah_batch(self, objs):
+        BERITA.ubah_jumlah_komentar(Counter(obj.BERITA_id for obj in objs))
+
+
+IMPORTER = {
+    'BERITA': BERITAImporter,
+    'komentar': KomentarImporter,
+}
+
+
+def buka_sumber(path):
+    """Buka file sumber sebagai stream teks UTF-8"""
+    return open(path, encoding='utf-8', newline='')
@@ -0,0 +1,176 @@
+"""
+FITURBERITA/kompresi.py
+Kompresi response API (gzip, brotli jika terpasang) dengan negosiasi Accept-Encoding
+
+KompresiMiddleware mengompres response non-streaming dengan content type
+JSON yang ukurannya minimal MIN_BYTES. Encoding dipilih dari Accept-Encoding
+(q-value dihormati, urutan ENCODING sebagai prioritas jika q sama). Brotli
+dipakai jika paket brotli terpasang (pip install brotli), tanpanya hanya gzip.
+
+Waktu kompresi tercatat sebagai bagian 'kompresi' di Server-Timing dan
+/api/metrics/; ukuran response di metrics adalah byte setelah kompresi.
+
+Response cache (FITURBERITA/cache.py) untuk halaman panas (list halaman
+pertama, terbaru) menyimpan varian terkompresi bersama entry lewat varian():
+saat cache hit middleware memakai byte tersimpan tanpa mengompres ulang,
+sehingga bisa memakai level kompresi yang lebih tinggi (LEVEL_SIMPAN).
+
+Tidak dikompres:
+    - response streaming (SSE, export) agar event/baris tetap terkirim langsung
+    - HTML (browsable API berisi CSRF token, rawan BREACH)
+    - response yang sudah punya Content-Encoding
+
+Konfigurasi di settings.BERITA_KOMPRESI:
+    ENABLED       : aktif/nonaktif
+    MIN_BYTES     : ukuran minimal response yang dikompres
+    ENCODING      : encoding yang ditawarkan, urut prioritas
+    LEVEL         : level per encoding untuk kompresi per request
+    LEVEL_SIMPAN  : level per encoding untuk varian yang disimpan di cache
+    CONTENT_TYPES : content type yang dikompres
+"""
+
+import gzip
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # dependency opsional, tanpa brotli hanya gzip
+    brotli = None
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'MIN_BYTES': 1024,
+    'ENCODING': ('br', 'gzip'),
+    'LEVEL': {'br': 4, 'gzip': 6},
+    'LEVEL_SIMPAN': {'br': 9, 'gzip': 9},
+    'CONTENT_TYPES': ('application/json',),
+}
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_KOMPRESI', {})}
+
+
+def encoding_tersedia(config=None):
+    """Encoding dari config yang library-nya terpasang"""
+    config = config or get_config()
+    return tuple(
+        encoding for encoding in config['ENCODING']
+        if encoding == 'gzip' or (encoding == 'br' and brotli is not None)
+    )
+
+
+def kompres(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    # mtime=0: byte sama untuk isi yang sama (ETag/cache downstream tetap stabil)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def encoding_diterima(accept_encoding):
+    """{encoding: q} dari header Accept-Encoding"""
+    hasil = {}
+    for bagian in accept_encoding.split(','):
+        nama, _, params = bagian.partition(';')
+        nama = nama.strip().lower()
+        if not nama:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            kunci, _, nilai = param.partition('=')
+            if kunci.strip().lower() == 'q':
+                try:
+                    q = float(nilai)
+                except ValueError:
+                    q = 0.0
+        hasil[nama] = q
+    return hasil
+
+
+def pilih_encoding(request, tersedia):
+    """Encoding dengan q tertinggi yang diterima client, None jika tidak ada"""
+    diterima = encoding_diterima(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    kandidat = [
+        (diterima.get(encoding, diterima.get('*', 0.0)), -urutan, encoding)
+        for urutan, encoding in enumerate(tersedia)
+    ]
+    kandidat = [item for item in kandidat if item[0] > 0]
+    return max(kandidat)[2] if kandidat else None
+
+
+def bisa_dikompres(response, config):
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type in config['CONTENT_TYPES'] and len(response.content) >= config['MIN_BYTES']
+
+
+def varian(response):
+    """
+    {encoding: byte terkompresi} untuk disimpan bersama entry cache
+    Kosong jika kompresi nonaktif atau response tidak perlu dikompres
+    """
+    config = get_config()
+    if not config['ENABLED'] or not bisa_dikompres(response, config):
+        return {}
+    hasil = {}
+    with metrics.ukur('kompresi'):
+        for encoding in encoding_tersedia(config):
+            data = kompres(response.content, encoding, config['LEVEL_SIMPAN'][encoding])
+            if len(data) < len(response.content):
+                hasil[encoding] = data
+    return hasil
+
+
+class KompresiMiddleware:
+    """
+    Kompres response JSON sesuai Accept-Encoding
+    Response dengan atribut varian_kompresi (dari response cache) memakai byte tersimpan
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _selesai(self, request, response):
+        config = get_config()
+        if not config['ENABLED'] or not bisa_dikompres(response, config):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = pilih_encoding(request, encoding_tersedia(config))
+        if encoding is None:
+            return response
+
+        data = getattr(response, 'varian_kompresi', {}).get(encoding)
+        if data is None:
+            with metrics.ukur('kompresi'):
+                data = kompres(response.content, encoding, config['LEVEL'][encoding])
+            if len(data) >= len(response.content):
+                return response
+
+        response.content = data
+        response['Content-Length'] = str(len(data))
+        response['Content-Encoding'] = encoding
+        # Byte berbeda dari representasi asli: ETag strong menjadi weak (sama dengan GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._selesai(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._selesai(request, await self.get_response(request))
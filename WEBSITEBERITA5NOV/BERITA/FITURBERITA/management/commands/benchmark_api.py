@@ -0,0 +1,176 @@
+"""
+FITURBERITA/management/commands/benchmark_api.py
+Benchmark endpoint API dengan dataset besar dan cek regresi terhadap baseline
+(lihat FITURBERITA/benchmark.py)
+
+Jalankan di database terpisah, seed menambah data dan skenario
+create_komentar menulis komentar baru:
+    DB_NAME=/tmp/bench.sqlite3 python manage.py migrate
+    DB_NAME=/tmp/bench.sqlite3 python manage.py benchmark_api --seed-BERITA 100000 --seed-komentar 5000000
+
+Contoh:
+    python manage.py benchmark_api --simpan baseline.json
+    python manage.py benchmark_api --bandingkan baseline.json --toleransi 0.25
+    python manage.py benchmark_api --mode http --konkurensi 8 --skenario list --skenario detail
+
+Response cache dimatikan (kecuali --dengan-cache) agar yang diukur adalah
+query + serialisasi. Jumlah query dan waktu kompresi dibaca dari header
+Server-Timing. Ukuran byte di wire dan CPU per request dengan kompresi:
+    python manage.py benchmark_api --skenario list --skenario terbaru
+    python manage.py benchmark_api --skenario list --skenario terbaru --accept-encoding gzip
+    python manage.py benchmark_api --skenario list --skenario terbaru --accept-encoding gzip --dengan-cache
+(yang terakhir: cache hit memakai varian terkompresi yang tersimpan, kompresi ms ~0)
+
+Latensi baca saat banjir komentar (8 thread penulis), tanpa dan dengan
+throttle/load-shedding (FITURBERITA/throttling.py, dimatikan kecuali --dengan-throttle):
+    python manage.py benchmark_api --mode http --skenario list --skenario detail --banjir-komentar 8
+    python manage.py benchmark_api --mode http --skenario list --skenario detail --banjir-komentar 8 --dengan-throttle
+
+POST komentar langsung vs write-behind (FITURBERITA/buffer_komentar.py, batch
+bulk_create; sisa antrian di-flush sebelum selesai):
+    python manage.py benchmark_api --mode http --konkurensi 8 --skenario create_komentar
+    python manage.py benchmark_api --mode http --konkurensi 8 --skenario create_komentar --write-behind
+"""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from FITURBERITA import benchmark, buffer_komentar
+
+MODE = ('client', 'http')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark endpoint API (p50/p95/p99, query per request, memori) dengan baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-BERITA', type=int, default=0, help='Isi sampai minimal N BERITA')
+        parser.add_argument('--seed-komentar', type=int, default=0, help='Isi sampai minimal N komentar')
+        parser.add_argument('--hanya-seed', action='store_true', help='Seed lalu berhenti')
+        parser.add_argument('--skenario', choices=sorted(benchmark.SKENARIO), action='append')
+        parser.add_argument('--mode', choices=MODE, default='client')
+        parser.add_argument('--request', type=int, default=200, help='Jumlah request per skenario')
+        parser.add_argument('--konkurensi', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=42, help='Seed random (data dan urutan request)')
+        parser.add_argument('--dengan-cache', action='store_true', help='Biarkan response cache aktif')
+        parser.add_argument('--accept-encoding', default='', help='Header Accept-Encoding (mis. gzip, br)')
+        parser.add_argument('--banjir-komentar', type=int, default=0, help='Thread pengirim komentar di latar')
+        parser.add_argument('--dengan-throttle', action='store_true', help='Biarkan throttle/load-shedding aktif')
+        parser.add_argument('--write-behind', action='store_true', help='POST komentar lewat buffer write-behind')
+        parser.add_argument('--ukur-memori', action='store_true', help='Ukur puncak alokasi dengan tracemalloc')
+        parser.add_argument('--simpan', help='Simpan hasil sebagai baseline JSON')
+        parser.add_argument('--bandingkan', help='Bandingkan dengan baseline JSON, gagal jika regresi')
+        parser.add_argument('--toleransi', type=float, default=0.2, help='Kenaikan p95 yang masih diterima (0.2 = 20%%)')
+        parser.add_argument('--batas-ms', type=float, default=2.0, help='Kenaikan p95 absolut minimum yang dihitung regresi')
+
+    def _progress(self, nama, selesai, total):
+        if self.verbosity >= 2 or selesai == total:
+            self.stdout.write(f'  seed {nama}: {selesai}/{total}')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if options['seed_BERITA'] or options['seed_komentar']:
+            benchmark.seed(
+                options['seed_BERITA'], options['seed_komentar'],
+                seed=options['seed'], progress=self._progress,
+            )
+            if options['hanya_seed']:
+                return
+
+        try:
+            konteks = benchmark.Konteks()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        baseline = None
+        if options['bandingkan']:
+            try:
+                baseline = json.loads(Path(options['bandingkan']).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Baseline tidak bisa dibaca: {exc}')
+
+        jumlah = konteks.jumlah
+        encoding = options['accept_encoding']
+        self.stdout.write(
+            f'Dataset: {jumlah["BERITA"]} BERITA, {jumlah["komentar"]} komentar; '
+            f'mode {options["mode"]}, {options["request"]} request, konkurensi {options["konkurensi"]}, '
+            f'Accept-Encoding {encoding or "-"}'
+        )
+        self.stdout.write(
+            f'{"skenario":<16}{"req/detik":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}'
+            f'{"query":>7}{"cpu ms":>8}{"kompresi":>9}{"byte":>8}{"memori KB":>11}{"gagal":>7}'
+        )
+
+        pengaturan = {
+            'BERITA_METRICS': {'ENABLED': True, 'SERVER_TIMING': True, 'LOG': False},
+            'BERITA_NPLUS1': {'MODE': 'off'},
+        }
+        if not options['dengan_cache']:
+            pengaturan['BERITA_RESPONSE_CACHE'] = {'ENABLED': False}
+        if not options['dengan_throttle']:
+            pengaturan['BERITA_THROTTLE'] = {'ENABLED': False}
+        if options['write_behind']:
+            pengaturan['BERITA_BUFFER_KOMENTAR'] = {**buffer_komentar.get_config(), 'ENABLED': True}
+
+        hasil = {}
+        with override_settings(**pengaturan):
+            if options['mode'] == 'http':
+                with benchmark.server_lokal() as base_url:
+                    hasil = self._jalankan(
+                        lambda: benchmark.PengirimHTTP(base_url, encoding), konteks, options
+                    )
+            else:
+                hasil = self._jalankan(lambda: benchmark.PengirimClient(encoding), konteks, options)
+            if options['write_behind']:
+                self.stdout.write(f'Write-behind: {buffer_komentar.flush()} komentar sisa antrian di-flush')
+
+        meta = benchmark.meta(konteks, options['mode'], options['konkurensi'], encoding)
+        if options['simpan']:
+            Path(options['simpan']).write_text(json.dumps({'meta': meta, 'hasil': hasil}, indent=2))
+            self.stdout.write(f'Baseline disimpan ke {options["simpan"]}')
+
+        if baseline is not None:
+            beda = benchmark.beda_kondisi(baseline.get('meta', {}), meta)
+            if beda:
+                self.stdout.write(self.style.WARNING(
+                    f'Kondisi berbeda dengan baseline ({"; ".join(beda)}), perbandingan kurang akurat'
+                ))
+            regresi = benchmark.bandingkan(hasil, baseline, options['toleransi'], options['batas_ms'])
+            if regresi:
+                raise CommandError('Regresi performa:\n  ' + '\n  '.join(regresi))
+            self.stdout.write(self.style.SUCCESS('Tidak ada regresi dibanding baseline'))
+
+    def _jalankan(self, buat_pengirim, konteks, options):
+        if not options['banjir_komentar']:
+            return self._jalankan_skenario(buat_pengirim(), konteks, options)
+        with benchmark.banjir_komentar(buat_pengirim(), konteks, options['banjir_komentar']) as status:
+            hasil = self._jalankan_skenario(buat_pengirim(), konteks, options)
+        self.stdout.write('Banjir komentar: ' + ', '.join(
+            f'{kode}={jumlah}' for kode, jumlah in sorted(status.items())
+        ))
+        return hasil
+
+    def _jalankan_skenario(self, pengirim, konteks, options):
+        hasil = {}
+        for nama in options['skenario'] or benchmark.SKENARIO:
+            angka = benchmark.jalankan(
+                pengirim, nama, konteks, options['request'],
+                konkurensi=options['konkurensi'], seed=options['seed'],
+                ukur_memori=options['ukur_memori'],
+            )
+            hasil[nama] = angka
+            query = '-' if angka['query'] is None else f'{angka["query"]:g}'
+            kompresi = '-' if angka['kompresi_ms'] is None else f'{angka["kompresi_ms"]:.2f}'
+            byte = '-' if angka['byte'] is None else angka['byte']
+            memori = angka['memori_kb'] if angka['memori_kb'] is not None else f'{angka["rss_puncak_kb"]}*'
+            self.stdout.write(
+                f'{nama:<16}{angka["req_per_detik"]:>10}{angka["p50_ms"]:>9}{angka["p95_ms"]:>9}'
+                f'{angka["p99_ms"]:>9}{query:>7}{angka["cpu_ms"]:>8}{kompresi:>9}{byte:>8}'
+                f'{memori:>11}{angka["gagal"]:>7}'
+            )
+        if not options['ukur_memori']:
+            self.stdout.write('* puncak RSS proses (tanpa --ukur-memori)')
+        return hasil
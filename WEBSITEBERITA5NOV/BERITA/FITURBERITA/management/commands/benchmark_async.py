@@ -0,0 +1,155 @@
+"""
+FITURBERITA/management/commands/benchmark_async.py
+Benchmark jalur baca sync (DRF) vs async native terhadap database yang aktif
+
+Mode yang dibandingkan:
+    wsgi        : view DRF, request paralel dengan thread pool (model WSGI thread)
+    asgi-sync   : view DRF lewat handler ASGI (tiap request pindah ke thread executor)
+    asgi-async  : FITURBERITA/async_views.py lewat handler ASGI
+
+Response cache dimatikan selama benchmark agar yang diukur adalah query + serialisasi.
+Pengukuran memori (tracemalloc) memperlambat semua mode, jadi hanya aktif
+dengan --ukur-memori dan angka req/detik-nya jangan dibandingkan dengan run biasa.
+
+Contoh:
+    python manage.py benchmark_async
+    python manage.py benchmark_async --endpoint detail --request 2000 --konkurensi 100
+    python manage.py benchmark_async --ukur-memori
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from FITURBERITA.models import BERITA
+
+ENDPOINT = {
+    'list': ('BERITA-list', False),
+    'detail': ('BERITA-detail', True),
+    'terbaru': ('BERITA-terbaru', False),
+    'komentar': ('BERITA-komentar', True),
+}
+
+MODE = ('wsgi', 'asgi-sync', 'asgi-async')
+
+
+def _ringkas(latensi, durasi, memori_puncak, thread_puncak):
+    latensi = sorted(latensi)
+    return {
+        'req_per_detik': len(latensi) / durasi,
+        'p50_ms': statistics.median(latensi) * 1000,
+        'p95_ms': latensi[int(len(latensi) * 0.95) - 1] * 1000,
+        'memori_kb': f'{memori_puncak / 1024:.0f}' if memori_puncak is not None else '-',
+        'thread': thread_puncak,
+    }
+
+
+def _cek(response, url):
+    if response.status_code != 200:
+        raise CommandError(f'{url} menjawab {response.status_code}')
+
+
+def jalankan_wsgi(url, jumlah, konkurensi):
+    client = Client()
+    latensi = []
+    thread_puncak = threading.active_count()
+
+    def satu(_):
+        nonlocal thread_puncak
+        mulai = time.perf_counter()
+        response = client.get(url)
+        latensi.append(time.perf_counter() - mulai)
+        thread_puncak = max(thread_puncak, threading.active_count())
+        _cek(response, url)
+
+    mulai = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=konkurensi) as pool:
+        list(pool.map(satu, range(jumlah)))
+    return latensi, time.perf_counter() - mulai, thread_puncak
+
+
+async def _jalankan_asgi(url, jumlah, konkurensi):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(konkurensi)
+    latensi = []
+    thread_puncak = threading.active_count()
+
+    async def satu():
+        nonlocal thread_puncak
+        async with semaphore:
+            mulai = time.perf_counter()
+            response = await client.get(url)
+            latensi.append(time.perf_counter() - mulai)
+            thread_puncak = max(thread_puncak, threading.active_count())
+            _cek(response, url)
+
+    mulai = time.perf_counter()
+    await asyncio.gather(*(satu() for _ in range(jumlah)))
+    return latensi, time.perf_counter() - mulai, thread_puncak
+
+
+def jalankan_asgi(url, jumlah, konkurensi):
+    return asyncio.run(_jalankan_asgi(url, jumlah, konkurensi))
+
+
+class Command(BaseCommand):
+    help = 'Bandingkan throughput, latensi dan memori jalur baca sync vs async'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINT), default='list')
+        parser.add_argument('--request', type=int, default=500, help='Jumlah request per mode')
+        parser.add_argument('--konkurensi', type=int, default=50, help='Request yang berjalan bersamaan')
+        parser.add_argument('--mode', choices=MODE, action='append', help='Mode yang diukur (boleh diulang)')
+        parser.add_argument(
+            '--ukur-memori',
+            action='store_true',
+            help='Ukur puncak alokasi memori Python per mode dengan tracemalloc',
+        )
+
+    def handle(self, *args, **options):
+        nama, pakai_id = ENDPOINT[options['endpoint']]
+        args_url = ()
+        if pakai_id:
+            pk = BERITA.objects.order_by('-jumlah_komentar').values_list('pk', flat=True).first()
+            if pk is None:
+                raise CommandError('Belum ada BERITA untuk di-benchmark')
+            args_url = (pk,)
+        url_sync = reverse(f'FITURBERITA:{nama}', args=args_url)
+        url_async = reverse(f'FITURBERITA:async-{nama}', args=args_url)
+
+        rencana = {
+            'wsgi': (jalankan_wsgi, url_sync),
+            'asgi-sync': (jalankan_asgi, url_sync),
+            'asgi-async': (jalankan_asgi, url_async),
+        }
+        jumlah, konkurensi = options['request'], options['konkurensi']
+        self.stdout.write(
+            f'Endpoint {options["endpoint"]}: {jumlah} request, konkurensi {konkurensi}'
+        )
+        self.stdout.write(
+            f'{"mode":<12}{"req/detik":>12}{"p50 ms":>10}{"p95 ms":>10}{"memori KB":>12}{"thread":>8}'
+        )
+
+        with override_settings(BERITA_RESPONSE_CACHE={'ENABLED': False}):
+            for mode in options['mode'] or MODE:
+                fungsi, url = rencana[mode]
+                fungsi(url, min(jumlah, konkurensi), konkurensi)  # pemanasan
+                memori_puncak = None
+                if options['ukur_memori']:
+                    tracemalloc.start()
+                latensi, durasi, thread_puncak = fungsi(url, jumlah, konkurensi)
+                if options['ukur_memori']:
+                    _, memori_puncak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                hasil = _ringkas(latensi, durasi, memori_puncak, thread_puncak)
+                self.stdout.write(
+                    f'{mode:<12}{hasil["req_per_detik"]:>12.1f}{hasil["p50_ms"]:>10.1f}'
+                    f'{hasil["p95_ms"]:>10.1f}{hasil["memori_kb"]:>12}{hasil["thread"]:>8}'
+                )
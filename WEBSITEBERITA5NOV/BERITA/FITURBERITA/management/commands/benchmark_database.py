@@ -0,0 +1,163 @@
+"""
+FITURBERITA/management/commands/benchmark_database.py
+Benchmark konkurensi SQLite: konfigurasi bawaan vs tuning BERITA/database.py
+
+Setiap profil memakai file SQLite sementara yang baru (tabel BERITA dan
+Komentar saja), lalu selama --durasi detik:
+    penulis : membuat komentar lewat ORM dalam transaksi (insert + update
+              counter jumlah_komentar lewat signal, sama seperti POST komentar)
+    pembaca : membaca komentar terbaru satu BERITA + jumlahnya
+Error "database is locked" dihitung sebagai gagal.
+
+Profil:
+    bawaan : journal_mode DELETE, synchronous FULL, timeout 5 detik, transaksi DEFERRED
+    tuning : opsi_sqlite() (WAL, synchronous NORMAL, mmap, cache, busy timeout, IMMEDIATE)
+
+Contoh:
+    python manage.py benchmark_database
+    python manage.py benchmark_database --penulis 16 --pembaca 16 --durasi 10
+"""
+
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+from BERITA.database import opsi_sqlite
+from FITURBERITA.models import BERITA, Komentar
+
+PROFIL = {
+    'bawaan': {},
+    'tuning': opsi_sqlite(),
+}
+
+JUMLAH_BERITA = 20
+
+
+def _daftarkan_alias(alias, path, opsi):
+    """Tambah koneksi sementara ke connections (tanpa mengubah settings.DATABASES)"""
+    konfigurasi = connections.configure_settings({
+        DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+        alias: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), 'OPTIONS': opsi},
+    })
+    connections.settings[alias] = konfigurasi[alias]
+
+
+def _hapus_alias(alias):
+    connections[alias].close()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+def _siapkan_skema(alias):
+    with connections[alias].schema_editor() as editor:
+        editor.create_model(BERITA)
+        editor.create_model(Komentar)
+    BERITA.objects.using(alias).bulk_create(
+        BERITA(judul=f'Benchmark {nomor}', isi_BERITA='Isi') for nomor in range(JUMLAH_BERITA)
+    )
+    connections[alias].close()
+
+
+def jalankan_profil(alias, jumlah_penulis, jumlah_pembaca, durasi):
+    """Return ringkasan hasil satu profil"""
+    ids = list(BERITA.objects.using(alias).values_list('pk', flat=True))
+    connections[alias].close()
+    hasil = {'tulis': [], 'baca': 0, 'gagal': 0}
+    kunci = threading.Lock()
+    batas = time.monotonic() + durasi
+
+    def penulis():
+        latensi, gagal = [], 0
+        try:
+            while time.monotonic() < batas:
+                mulai = time.perf_counter()
+                try:
+                    with transaction.atomic(using=alias):
+                        Komentar.objects.using(alias).create(
+                            nama='benchmark', isi_komentar='Komentar benchmark',
+                            BERITA_id=random.choice(ids),
+                        )
+                except OperationalError:
+                    gagal += 1
+                    continue
+                latensi.append(time.perf_counter() - mulai)
+        finally:
+            connections[alias].close()
+        with kunci:
+            hasil['tulis'].extend(latensi)
+            hasil['gagal'] += gagal
+
+    def pembaca():
+        jumlah, gagal = 0, 0
+        try:
+            while time.monotonic() < batas:
+                BERITA_id = random.choice(ids)
+                try:
+                    list(Komentar.objects.using(alias).filter(BERITA_id=BERITA_id).order_by('-tanggal')[:20])
+                    BERITA.objects.using(alias).filter(pk=BERITA_id).values_list('jumlah_komentar').get()
+                except OperationalError:
+                    gagal += 1
+                    continue
+                jumlah += 1
+        finally:
+            connections[alias].close()
+        with kunci:
+            hasil['baca'] += jumlah
+            hasil['gagal'] += gagal
+
+    threads = [threading.Thread(target=penulis) for _ in range(jumlah_penulis)]
+    threads += [threading.Thread(target=pembaca) for _ in range(jumlah_pembaca)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tulis = sorted(hasil['tulis'])
+    return {
+        'tulis_per_detik': len(tulis) / durasi,
+        'baca_per_detik': hasil['baca'] / durasi,
+        'gagal': hasil['gagal'],
+        'p50_ms': statistics.median(tulis) * 1000 if tulis else 0.0,
+        'p95_ms': tulis[int(len(tulis) * 0.95) - 1] * 1000 if tulis else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Bandingkan throughput tulis/baca SQLite bawaan vs WAL + pragma tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--penulis', type=int, default=8, help='Thread yang menulis komentar')
+        parser.add_argument('--pembaca', type=int, default=8, help='Thread yang membaca komentar')
+        parser.add_argument('--durasi', type=float, default=5, help='Lama tiap profil (detik)')
+        parser.add_argument('--profil', choices=sorted(PROFIL), action='append', help='Profil yang diukur (boleh diulang)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{options["penulis"]} penulis, {options["pembaca"]} pembaca, {options["durasi"]:g} detik per profil'
+        )
+        self.stdout.write(
+            f'{"profil":<10}{"tulis/detik":>13}{"baca/detik":>12}{"gagal":>8}{"p50 ms":>9}{"p95 ms":>9}'
+        )
+        folder = Path(tempfile.mkdtemp(prefix='benchmark-db-'))
+        try:
+            for nama in options['profil'] or PROFIL:
+                alias = f'benchmark_{nama}'
+                _daftarkan_alias(alias, folder / f'{nama}.sqlite3', PROFIL[nama])
+                try:
+                    _siapkan_skema(alias)
+                    hasil = jalankan_profil(alias, options['penulis'], options['pembaca'], options['durasi'])
+                finally:
+                    _hapus_alias(alias)
+                self.stdout.write(
+                    f'{nama:<10}{hasil["tulis_per_detik"]:>13.1f}{hasil["baca_per_detik"]:>12.1f}'
+                    f'{hasil["gagal"]:>8}{hasil["p50_ms"]:>9.1f}{hasil["p95_ms"]:>9.1f}'
+                )
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,103 @@
+"""
+FITURBERITA/management/commands/benchmark_serializer.py
+Microbenchmark serialisasi list: ModelSerializer DRF vs SerializerCepat
+(FITURBERITA/serializer_cepat.py), dengan JSONRenderer stdlib dan orjson
+
+Setiap putaran menjalankan query + serialisasi + render JSON untuk satu
+halaman berisi --baris baris, lalu dilaporkan median per halaman dan per
+baris. Output kedua jalur dibandingkan byte demi byte sebelum diukur.
+
+Contoh:
+    python manage.py benchmark_serializer
+    DB_NAME=/tmp/bench.sqlite3 python manage.py benchmark_serializer --baris 1000 --ulang 50
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from FITURBERITA import serializer_cepat
+from FITURBERITA.models import BERITA, Komentar
+from FITURBERITA.serializers import BERITAListSerializer, KomentarSerializer
+
+# nama: (queryset, serializer DRF)
+TARGET = {
+    'BERITA': (
+        lambda: BERITA.objects.only(
+            'id', 'judul', 'tanggal', 'isi_BERITA', 'ringkasan', 'gambar', 'gambar_turunan',
+            'jumlah_komentar'
+        ).order_by('-tanggal', '-id'),
+        BERITAListSerializer,
+    ),
+    'komentar': (
+        lambda: Komentar.objects.only(
+            'id', 'nama', 'tanggal', 'isi_komentar', 'BERITA'
+        ).order_by('-tanggal', '-id'),
+        KomentarSerializer,
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark serialisasi list: DRF vs SerializerCepat (stdlib json / orjson)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=sorted(TARGET), action='append')
+        parser.add_argument('--baris', type=int, default=500, help='Baris per halaman')
+        parser.add_argument('--ulang', type=int, default=30, help='Jumlah putaran per jalur')
+
+    def handle(self, *args, **options):
+        context = {'request': RequestFactory().get('/api/')}
+        stdlib = JSONRenderer()
+        cepat_renderer = serializer_cepat.JSONRendererCepat()
+        jalur = {
+            'drf': lambda qs, serializer_class: stdlib.render(
+                serializer_class(list(qs), many=True, context=context).data
+            ),
+            'cepat': lambda qs, serializer_class: stdlib.render(
+                self._cepat(qs, serializer_class, context)
+            ),
+        }
+        if serializer_cepat.orjson is not None:
+            jalur['cepat+orjson'] = lambda qs, serializer_class: cepat_renderer.render(
+                self._cepat(qs, serializer_class, context)
+            )
+        else:
+            self.stdout.write(self.style.WARNING('orjson tidak terpasang, jalur cepat+orjson dilewati'))
+
+        self.stdout.write(f'{"target":<10}{"jalur":<14}{"ms/halaman":>12}{"us/baris":>10}{"speedup":>9}')
+        for nama in options['target'] or TARGET:
+            self._jalankan(nama, jalur, options['baris'], options['ulang'])
+
+    def _cepat(self, queryset, serializer_class, context):
+        cepat = serializer_cepat.SerializerCepat(serializer_class, context)
+        return cepat.serialisasi(cepat.siapkan(queryset))
+
+    def _jalankan(self, nama, jalur, baris, ulang):
+        buat_queryset, serializer_class = TARGET[nama]
+        queryset = buat_queryset()[:baris]
+        jumlah = queryset.count()
+        if not jumlah:
+            raise CommandError(f'Tidak ada data {nama}; isi dulu dengan benchmark_api --seed-BERITA/--seed-komentar')
+
+        acuan = jalur['drf'](queryset, serializer_class)
+        for label, fungsi in jalur.items():
+            if fungsi(queryset, serializer_class) != acuan:
+                raise CommandError(f'Output {label} untuk {nama} berbeda dengan serializer DRF')
+
+        dasar = None
+        for label, fungsi in jalur.items():
+            durasi = []
+            for _ in range(ulang):
+                mulai = time.perf_counter()
+                fungsi(queryset, serializer_class)
+                durasi.append(time.perf_counter() - mulai)
+            median = statistics.median(durasi)
+            dasar = dasar or median
+            self.stdout.write(
+                f'{nama:<10}{label:<14}{median * 1000:>12.2f}{median / jumlah * 1e6:>10.1f}'
+                f'{dasar / median:>8.1f}x'
+            )
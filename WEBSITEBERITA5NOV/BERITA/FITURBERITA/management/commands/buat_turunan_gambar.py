@@ -0,0 +1,58 @@
+"""
+FITURBERITA/management/commands/buat_turunan_gambar.py
+Management command untuk backfill gambar turunan (thumbnail, card, full)
+dari file yang sudah ada di media/BERITA_images/
+
+Contoh:
+    python manage.py buat_turunan_gambar
+    python manage.py buat_turunan_gambar --semua
+    python manage.py buat_turunan_gambar --id 3
+"""
+
+from django.core.management.base import BaseCommand
+
+from FITURBERITA.images import proses_gambar_BERITA
+from FITURBERITA.models import BERITA
+
+
+class Command(BaseCommand):
+    help = 'Buat gambar turunan untuk BERITA yang sudah punya gambar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semua',
+            action='store_true',
+            help='Proses ulang semua BERITA, termasuk yang turunannya sudah ada',
+        )
+        parser.add_argument(
+            '--id',
+            dest='ids',
+            action='append',
+            type=int,
+            help='ID BERITA yang diproses (boleh diulang)',
+        )
+
+    def handle(self, *args, **options):
+        queryset = BERITA.objects.exclude(gambar='').exclude(gambar__isnull=True)
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        elif not options['semua']:
+            queryset = queryset.filter(gambar_turunan={})
+
+        berhasil = gagal = 0
+        for BERITA_id in queryset.values_list('id', flat=True).iterator():
+            try:
+                berhasil_diproses = proses_gambar_BERITA(BERITA_id)
+            except OSError as exc:  # file hilang / storage error: lanjut ke BERITA berikutnya
+                gagal += 1
+                self.stderr.write(f'BERITA {BERITA_id}: {exc}')
+                continue
+            if berhasil_diproses:
+                berhasil += 1
+            else:
+                gagal += 1
+                self.stderr.write(f'BERITA {BERITA_id}: gambar tidak bisa diproses')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Turunan gambar dibuat untuk {berhasil} BERITA ({gagal} gagal)'
+        ))
@@ -0,0 +1,27 @@
+"""
+FITURBERITA/management/commands/flush_buffer_komentar.py
+Management command untuk menulis komentar tertunda dari jurnal write-behind
+(FITURBERITA/buffer_komentar.py) milik proses server yang sudah mati
+
+Jurnal yang masih dikunci proses hidup dilewati. Tanpa fcntl (Windows)
+jurnal tidak dikunci: jalankan hanya saat server berhenti.
+
+Contoh:
+    python manage.py flush_buffer_komentar
+    python manage.py flush_buffer_komentar --dir /var/lib/berita/buffer_komentar
+"""
+
+from django.core.management.base import BaseCommand
+
+from FITURBERITA import buffer_komentar
+
+
+class Command(BaseCommand):
+    help = 'Tulis komentar tertunda dari jurnal buffer komentar proses yang sudah mati'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help='Folder jurnal. Default: BERITA_BUFFER_KOMENTAR JURNAL_DIR')
+
+    def handle(self, *args, **options):
+        jumlah = buffer_komentar.pulihkan_jurnal(options['dir'])
+        self.stdout.write(self.style.SUCCESS(f'{jumlah} komentar dari jurnal ditulis'))
@@ -0,0 +1,44 @@
+"""
+FITURBERITA/management/commands/hitung_ulang_komentar.py
+Management command untuk membangun ulang counter BERITA.jumlah_komentar
+
+Counter ditulis dengan queryset.update() (tanpa signal), sehingga response
+cache list, terbaru dan detail BERITA yang dihitung ulang diinvalidasi manual.
+
+Contoh:
+    python manage.py hitung_ulang_komentar
+    python manage.py hitung_ulang_komentar --id 1 --id 5
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from FITURBERITA import cache as response_cache
+from FITURBERITA.models import BERITA
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang counter jumlah_komentar pada BERITA dari tabel Komentar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--id',
+            dest='ids',
+            action='append',
+            type=int,
+            help='ID BERITA yang dihitung ulang (boleh diulang). Default: semua BERITA',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            jumlah = BERITA.hitung_ulang_jumlah_komentar(options['ids'])
+        if options['ids']:
+            response_cache.invalidasi(
+                scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+                detail_ids=options['ids']
+            )
+        else:
+            response_cache.invalidasi_semua()
+        self.stdout.write(self.style.SUCCESS(
+            f'Counter jumlah_komentar diperbarui untuk {jumlah} BERITA'
+        ))
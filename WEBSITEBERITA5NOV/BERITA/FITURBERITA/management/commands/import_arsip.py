@@ -0,0 +1,101 @@
+"""
+FITURBERITA/management/commands/import_arsip.py
+Management command untuk import massal BERITA / Komentar dari NDJSON atau CSV
+(misalnya hasil /api/<resource>/export/ atau dump CMS lama)
+
+Contoh:
+    python manage.py import_arsip BERITA berita.ndjson --pertahankan-id --sumber-gambar /backup/media
+    python manage.py import_arsip komentar komentar.csv --batch 5000
+    cat komentar.ndjson | python manage.py import_arsip komentar -
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from FITURBERITA.importer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    IMPORTER,
+    baca_baris,
+    buka_sumber,
+    deteksi_jenis,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import massal BERITA atau komentar dari file NDJSON/CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(IMPORTER), help='Jenis data yang di-import')
+        parser.add_argument('path', help="Path file sumber, '-' untuk stdin")
+        parser.add_argument(
+            '--jenis',
+            choices=['ndjson', 'csv'],
+            help='Format file (default: ditebak dari ekstensi, stdin dianggap ndjson)',
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Jumlah baris per bulk_create / transaksi',
+        )
+        parser.add_argument(
+            '--pertahankan-id',
+            action='store_true',
+            help='Pakai kolom id dari file sumber (agar relasi komentar tetap cocok)',
+        )
+        parser.add_argument(
+            '--sumber-gambar',
+            help='Folder asal file gambar; path di kolom gambar relatif terhadap folder ini',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help='Jumlah thread untuk menyalin file gambar',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch'] < 1:
+            raise CommandError('--batch harus lebih dari 0')
+
+        path = options['path']
+        jenis = options['jenis'] or ('ndjson' if path == '-' else deteksi_jenis(path))
+        importer = IMPORTER[options['model']](
+            batch_size=options['batch'],
+            pertahankan_id=options['pertahankan_id'],
+            sumber_gambar=options['sumber_gambar'],
+            workers=options['workers'],
+            progress=self.tulis_progress if options['verbosity'] >= 2 else None,
+        )
+
+        try:
+            stream = sys.stdin if path == '-' else buka_sumber(path)
+        except OSError as exc:
+            raise CommandError(f'Tidak bisa membuka {path}: {exc}')
+        try:
+            hasil = importer.jalankan(baca_baris(stream, jenis))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in hasil.errors:
+            self.stderr.write(f"Baris {error['baris']}: {error['errors']}")
+        if hasil.gagal > len(hasil.errors):
+            self.stderr.write(f'... dan {hasil.gagal - len(hasil.errors)} error lainnya')
+        for peringatan in hasil.peringatan:
+            self.stderr.write(f"Baris {peringatan['baris']}: {peringatan['pesan']}")
+        if hasil.jumlah_peringatan > len(hasil.peringatan):
+            self.stderr.write(f'... dan {hasil.jumlah_peringatan - len(hasil.peringatan)} peringatan lainnya')
+
+        peringatan = f', {hasil.jumlah_peringatan} peringatan' if hasil.jumlah_peringatan else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{hasil.berhasil} {options["model"]} di-import ({hasil.gagal} gagal{peringatan}) '
+            f'dalam {hasil.durasi:.1f} detik, {hasil.baris_per_detik:,.0f} baris/detik'
+        ))
+
+    def tulis_progress(self, hasil):
+        self.stdout.write(
+            f'{hasil.berhasil} baris ({hasil.gagal} gagal), {hasil.baris_per_detik:,.0f} baris/detik'
+        )
@@ -0,0 +1,69 @@
+"""
+FITURBERITA/management/commands/jalankan_worker.py
+Worker untuk task queue berbasis database (FITURBERITA/taskqueue.py)
+
+Contoh:
+    python manage.py jalankan_worker
+    python manage.py jalankan_worker --sekali
+    python manage.py jalankan_worker --interval 0.5 --batch 20
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from FITURBERITA import taskqueue
+
+
+class Command(BaseCommand):
+    help = 'Jalankan worker yang memproses tugas latar belakang dari tabel Tugas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sekali',
+            action='store_true',
+            help='Proses tugas yang sudah jatuh tempo lalu berhenti',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Jeda (detik) saat antrian kosong (default: 1.0)',
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=10,
+            help='Jumlah tugas yang diambil per putaran (default: 10)',
+        )
+        parser.add_argument(
+            '--simpan-hari',
+            type=int,
+            default=7,
+            help='Riwayat tugas selesai yang lebih lama dari ini dihapus (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        taskqueue.bersihkan_tugas_selesai(options['simpan_hari'])
+        total_berhasil = total_gagal = 0
+
+        try:
+            while True:
+                close_old_connections()
+                taskqueue.pulihkan_tugas_macet()
+                berhasil, gagal = taskqueue.jalankan_antrian(options['batch'])
+                total_berhasil += berhasil
+                total_gagal += gagal
+                if berhasil or gagal:
+                    self.stdout.write(f'{berhasil} tugas selesai, {gagal} gagal')
+                    continue
+                if options['sekali']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker berhenti: {total_berhasil} tugas selesai, {total_gagal} gagal'
+        ))
@@ -0,0 +1,56 @@
+"""
+FITURBERITA/management/commands/periksa_query_plan.py
+Jalankan semua endpoint baca, EXPLAIN setiap query yang dihasilkan dan
+laporkan query yang melakukan full table scan (lihat FITURBERITA/queryplan.py)
+
+Dipakai setelah mengubah filter/ordering atau index: dengan --ketat command
+gagal (exit code 1) jika ada full scan, sehingga bisa dipasang di CI.
+
+Contoh:
+    python manage.py periksa_query_plan
+    python manage.py periksa_query_plan --ketat
+    python manage.py periksa_query_plan --verbosity 2   # tampilkan plan lengkap
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from FITURBERITA.queryplan import periksa
+
+
+class Command(BaseCommand):
+    help = 'Periksa query plan endpoint BERITA/komentar dan tandai full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--ketat',
+            action='store_true',
+            help='Gagal jika ada query yang melakukan full table scan',
+        )
+
+    def handle(self, *args, **options):
+        hasil = periksa(options['database'])
+        verbose = options['verbosity'] >= 2
+
+        bermasalah = [item for item in hasil if not item.ok]
+        for item in hasil:
+            if item.ok and not item.peringatan and not verbose:
+                continue
+            if not item.ok:
+                status = self.style.ERROR(f'SCAN PENUH ({", ".join(item.scan_penuh)})')
+            elif item.peringatan:
+                status = self.style.WARNING('sort tanpa index')
+            else:
+                status = self.style.SUCCESS('ok')
+            self.stdout.write(f'[{item.label}] {status}')
+            if verbose or not item.ok:
+                self.stdout.write(f'    {item.sql}')
+                for baris in item.plan:
+                    self.stdout.write(f'      {baris}')
+
+        ringkasan = f'{len(hasil)} query diperiksa, {len(bermasalah)} full table scan'
+        if bermasalah and options['ketat']:
+            raise CommandError(ringkasan)
+        style = self.style.WARNING if bermasalah else self.style.SUCCESS
+        self.stdout.write(style(ringkasan))
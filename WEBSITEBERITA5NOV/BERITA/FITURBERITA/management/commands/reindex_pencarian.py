@@ -0,0 +1,35 @@
+"""
+FITURBERITA/management/commands/reindex_pencarian.py
+Management command untuk membangun ulang indeks full-text search BERITA
+
+Contoh:
+    python manage.py reindex_pencarian
+    python manage.py reindex_pencarian --database default
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from FITURBERITA import search
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang indeks full-text search untuk judul dan isi_BERITA'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Alias database yang di-reindex (default: "default")',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        with transaction.atomic(using=using):
+            vendor = search.rebuild_indeks(using)
+        if vendor is None:
+            self.stdout.write(self.style.WARNING(
+                'Database ini tidak mendukung full-text search, pencarian memakai LIKE'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Indeks full-text search ({vendor}) selesai dibangun ulang'))
@@ -0,0 +1,306 @@
+"""
+FITURBERITA/metrics.py
+Instrumentasi performa per request
+
+Untuk setiap request MetricsMiddleware mencatat:
+    - waktu total (wall time)
+    - jumlah query dan waktu database (execute wrapper pada setiap koneksi)
+    - waktu serializer (to_representation, lihat SerializerTerukurMixin)
+    - ukuran response (byte; response streaming tidak dihitung)
+ditandai dengan aksi view: "<basename>.<action>" untuk viewset DRF
+(BERITA.list, BERITA.retrieve, BERITA.komentar, ...) atau nama URL.
+
+Hasilnya dikirim sebagai:
+    - header Server-Timing (terbaca di tab Network browser; default hanya saat DEBUG
+      karena berisi jumlah dan waktu query)
+    - satu baris log JSON per request di logger FITURBERITA.metrics
+    - agregat format Prometheus di GET /api/metrics/ (counter + histogram latensi),
+      hanya untuk user staff atau header Authorization: Bearer <TOKEN>
+
+Agregat disimpan di memori proses; dengan beberapa worker, setiap worker
+punya angka sendiri (scrape per worker atau jumlahkan di Prometheus).
+
+Konfigurasi di settings.BERITA_METRICS:
+    ENABLED       : aktif/nonaktif
+    SERVER_TIMING : kirim header Server-Timing (None: ikut settings.DEBUG)
+    LOG           : tulis log JSON per request
+    BUCKETS       : batas bucket histogram latensi (detik)
+    TOKEN         : bearer token untuk scraper /api/metrics/ (kosong: hanya user staff)
+    IP_DIIZINKAN  : batasan tambahan IP untuk /api/metrics/ (kosong: semua IP);
+                    di belakang reverse proxy REMOTE_ADDR adalah IP proxy, jadi
+                    bukan pengganti TOKEN
+"""
+
+import hmac
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger('FITURBERITA.metrics')
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'SERVER_TIMING': None,
+    'LOG': True,
+    'BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    'TOKEN': '',
+    'IP_DIIZINKAN': (),
+}
+
+# Bucket histogram jumlah query per request
+BUCKET_QUERY = (1, 2, 5, 10, 20, 50, 100)
+
+PREFIX = 'berita'
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    config = {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_METRICS', {})}
+    if config['SERVER_TIMING'] is None:
+        config['SERVER_TIMING'] = settings.DEBUG
+    return config
+
+
+class Pengukuran:
+    """Angka satu request (dibagi ke thread sync_to_async lewat ContextVar)"""
+
+    def __init__(self):
+        self.mulai = time.perf_counter()
+        self.query = 0
+        self.db = 0.0
+        self.bagian = {}
+        self._aktif = set()
+
+    @property
+    def durasi(self):
+        return time.perf_counter() - self.mulai
+
+
+_pengukuran = ContextVar('berita_pengukuran', default=None)
+
+
+def pengukuran_aktif():
+    """Pengukuran request yang sedang berjalan, None di luar request"""
+    return _pengukuran.get()
+
+
+@contextmanager
+def ukur(bagian):
+    """
+    Catat waktu satu bagian (mis. 'serializer') ke request saat ini
+    Pemanggilan bersarang untuk bagian yang sama hanya dihitung sekali
+    """
+    pengukuran = _pengukuran.get()
+    if pengukuran is None or bagian in pengukuran._aktif:
+        yield
+        return
+    pengukuran._aktif.add(bagian)
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        pengukuran._aktif.discard(bagian)
+        pengukuran.bagian[bagian] = pengukuran.bagian.get(bagian, 0.0) + time.perf_counter() - mulai
+
+
+def catat_query(execute, sql, params, many, context):
+    """Execute wrapper: hitung query dan waktunya untuk request saat ini"""
+    pengukuran = _pengukuran.get()
+    if pengukuran is None:
+        return execute(sql, params, many, context)
+    mulai = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        pengukuran.query += 1
+        pengukuran.db += time.perf_counter() - mulai
+
+
+def pasang_pencatat_query(sender, connection, **kwargs):
+    """Handler connection_created: pasang execute wrapper di setiap koneksi baru"""
+    if catat_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(catat_query)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.jumlah_per_bucket = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observasi(self, nilai):
+        self.jumlah_per_bucket[bisect_left(self.buckets, nilai)] += 1
+        self.total += nilai
+        self.count += 1
+
+
+class Registry:
+    """Agregat metrics di memori proses"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.request = {}    # (aksi, method, status) -> jumlah
+            self.latensi = {}    # aksi -> Histogram detik
+            self.query = {}      # aksi -> Histogram jumlah query
+            self.total = {}      # (nama, aksi) -> jumlah (db detik, serializer detik, byte)
+
+    def catat(self, aksi, method, status, pengukuran, durasi, ukuran, buckets):
+        with self._lock:
+            kunci = (aksi, method, str(status))
+            self.request[kunci] = self.request.get(kunci, 0) + 1
+            self.latensi.setdefault(aksi, Histogram(buckets)).observasi(durasi)
+            self.query.setdefault(aksi, Histogram(BUCKET_QUERY)).observasi(pengukuran.query)
+            nilai = {'db_seconds': pengukuran.db, 'response_bytes': ukuran or 0}
+            for bagian, detik in pengukuran.bagian.items():
+                nilai[f'{bagian}_seconds'] = detik
+            for nama, angka in nilai.items():
+                self.total[(nama, aksi)] = self.total.get((nama, aksi), 0) + angka
+
+    def _histogram(self, nama, keterangan, data):
+        baris = [f'# HELP {nama} {keterangan}', f'# TYPE {nama} histogram']
+        for aksi, histogram in sorted(data.items()):
+            kumulatif = 0
+            for batas, jumlah in zip(histogram.buckets + ('+Inf',), histogram.jumlah_per_bucket):
+                kumulatif += jumlah
+                baris.append(f'{nama}_bucket{{aksi="{aksi}",le="{batas}"}} {kumulatif}')
+            baris.append(f'{nama}_sum{{aksi="{aksi}"}} {histogram.total:.6f}')
+            baris.append(f'{nama}_count{{aksi="{aksi}"}} {histogram.count}')
+        return baris
+
+    def ekspor(self):
+        """Teks exposition format Prometheus 0.0.4"""
+        with self._lock:
+            nama = f'{PREFIX}_http_requests_total'
+            baris = [f'# HELP {nama} Jumlah request per aksi, method dan status', f'# TYPE {nama} counter']
+            for (aksi, method, status), jumlah in sorted(self.request.items()):
+                baris.append(f'{nama}{{aksi="{aksi}",method="{method}",status="{status}"}} {jumlah}')
+            baris += self._histogram(
+                f'{PREFIX}_http_request_duration_seconds', 'Latensi request (wall time)', self.latensi
+            )
+            baris += self._histogram(
+                f'{PREFIX}_db_queries_per_request', 'Jumlah query database per request', self.query
+            )
+            for metrik in sorted({nama for nama, _ in self.total}):
+                nama = f'{PREFIX}_{metrik}_total'
+                baris += [f'# HELP {nama} Akumulasi {metrik} per aksi', f'# TYPE {nama} counter']
+                for (metrik_item, aksi), angka in sorted(self.total.items()):
+                    if metrik_item == metrik:
+                        baris.append(f'{nama}{{aksi="{aksi}"}} {angka:g}')
+        return '\n'.join(baris) + '\n'
+
+
+registry = Registry()
+
+
+def label_aksi(request):
+    """"<basename>.<action>" untuk viewset DRF, nama URL untuk view lain"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'tidak_ditemukan'
+    actions = getattr(match.func, 'actions', None)
+    if actions:
+        basename = match.func.initkwargs.get('basename') or match.url_name
+        return f'{basename}.{actions.get(request.method.lower(), request.method.lower())}'
+    return match.url_name or match.view_name or 'lainnya'
+
+
+def server_timing(pengukuran, durasi):
+    bagian = [f'total;dur={durasi * 1000:.1f}', f'db;dur={pengukuran.db * 1000:.1f};desc="{pengukuran.query} query"']
+    for nama, detik in pengukuran.bagian.items():
+        bagian.append(f'{nama};dur={detik * 1000:.1f}')
+    return ', '.join(bagian)
+
+
+class MetricsMiddleware:
+    """Ukur setiap request lalu kirim ke header, log dan registry"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _selesai(self, request, response, pengukuran, config):
+        durasi = pengukuran.durasi
+        aksi = label_aksi(request)
+        if aksi == 'metrics':
+            return response
+        ukuran = None if response.streaming else len(response.content)
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = server_timing(pengukuran, durasi)
+        registry.catat(aksi, request.method, response.status_code, pengukuran, durasi, ukuran, config['BUCKETS'])
+        if config['LOG']:
+            logger.info(json.dumps({
+                'aksi': aksi,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'durasi_ms': round(durasi * 1000, 2),
+                'query': pengukuran.query,
+                'db_ms': round(pengukuran.db * 1000, 2),
+                **{f'{nama}_ms': round(detik * 1000, 2) for nama, detik in pengukuran.bagian.items()},
+                'ukuran': ukuran,
+            }))
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = get_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+        pengukuran = Pengukuran()
+        token = _pengukuran.set(pengukuran)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pengukuran.reset(token)
+        return self._selesai(request, response, pengukuran, config)
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+        pengukuran = Pengukuran()
+        token = _pengukuran.set(pengukuran)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pengukuran.reset(token)
+        return self._selesai(request, response, pengukuran, config)
+
+
+def boleh_baca_metrics(request, config):
+    """User staff atau bearer TOKEN yang cocok, dari IP_DIIZINKAN jika diatur"""
+    if config['IP_DIIZINKAN'] and request.META.get('REMOTE_ADDR') not in config['IP_DIIZINKAN']:
+        return False
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    jenis, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return bool(
+        config['TOKEN'] and jenis.lower() == 'bearer'
+        and hmac.compare_digest(token.strip().encode(), config['TOKEN'].encode())
+    )
+
+
+def metrics_view(request):
+    """GET /api/metrics/: agregat format Prometheus (user staff atau bearer TOKEN)"""
+    if not boleh_baca_metrics(request, get_config()):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.ekspor(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def isi_jumlah_komentar(apps, schema_editor):
+    """Isi counter untuk data yang sudah ada"""
+    BERITA = apps.get_model('FITURBERITA', 'BERITA')
+    Komentar = apps.get_model('FITURBERITA', 'Komentar')
+    jumlah = (
+        Komentar.objects
+        .filter(BERITA=OuterRef('pk'))
+        .order_by()
+        .values('BERITA')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    BERITA.objects.using(schema_editor.connection.alias).update(
+        jumlah_komentar=Coalesce(Subquery(jumlah), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='berita',
+            name='jumlah_komentar',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Jumlah Komentar'),
+        ),
+        migrations.RunPython(isi_jumlah_komentar, migrations.RunPython.noop),
+    ]
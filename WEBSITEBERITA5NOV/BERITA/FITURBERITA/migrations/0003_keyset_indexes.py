@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0002_berita_jumlah_komentar'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(fields=['-tanggal', '-id'], name='berita_tanggal_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='komentar',
+            index=models.Index(fields=['-tanggal', '-id'], name='komentar_tanggal_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='komentar',
+            index=models.Index(fields=['BERITA', '-tanggal', '-id'], name='komentar_berita_tanggal_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Full-text search untuk BERITA (FTS5 di SQLite, tsvector di Postgres)
+#
+# DDL ditulis langsung dengan nama tabel literal (bukan FITURBERITA.search) agar
+# migration ini tidak ikut berubah saat kode search/model berubah. Trigger yang
+# hilang karena migration berikutnya me-remake tabel BERITA dipasang ulang oleh
+# hook post_migrate (signals.pastikan_indeks_pencarian).
+
+from django.db import DatabaseError, migrations
+
+SQLITE_PASANG = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS "FITURBERITA_berita_fts" USING fts5(
+        judul, isi_BERITA, content="FITURBERITA_berita", content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS berita_fts_ai AFTER INSERT ON "FITURBERITA_berita" BEGIN
+        INSERT INTO "FITURBERITA_berita_fts"(rowid, judul, isi_BERITA)
+        VALUES (new.id, new.judul, new.isi_BERITA); END""",
+    """CREATE TRIGGER IF NOT EXISTS berita_fts_ad AFTER DELETE ON "FITURBERITA_berita" BEGIN
+        INSERT INTO "FITURBERITA_berita_fts"("FITURBERITA_berita_fts", rowid, judul, isi_BERITA)
+        VALUES ('delete', old.id, old.judul, old.isi_BERITA); END""",
+    """CREATE TRIGGER IF NOT EXISTS berita_fts_au
+        AFTER UPDATE OF judul, isi_BERITA ON "FITURBERITA_berita" BEGIN
+        INSERT INTO "FITURBERITA_berita_fts"("FITURBERITA_berita_fts", rowid, judul, isi_BERITA)
+        VALUES ('delete', old.id, old.judul, old.isi_BERITA);
+        INSERT INTO "FITURBERITA_berita_fts"(rowid, judul, isi_BERITA)
+        VALUES (new.id, new.judul, new.isi_BERITA); END""",
+    """INSERT INTO "FITURBERITA_berita_fts"("FITURBERITA_berita_fts") VALUES ('rebuild')""",
+]
+
+SQLITE_HAPUS = [
+    'DROP TRIGGER IF EXISTS "berita_fts_ai"',
+    'DROP TRIGGER IF EXISTS "berita_fts_ad"',
+    'DROP TRIGGER IF EXISTS "berita_fts_au"',
+    'DROP TABLE IF EXISTS "FITURBERITA_berita_fts"',
+]
+
+POSTGRES_PASANG = [
+    """ALTER TABLE "FITURBERITA_berita" ADD COLUMN IF NOT EXISTS "search_vector" tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(judul, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce("isi_BERITA", '')), 'B')
+        ) STORED""",
+    """CREATE INDEX IF NOT EXISTS "berita_search_vector_idx"
+        ON "FITURBERITA_berita" USING GIN ("search_vector")""",
+]
+
+POSTGRES_HAPUS = [
+    'DROP INDEX IF EXISTS "berita_search_vector_idx"',
+    'ALTER TABLE "FITURBERITA_berita" DROP COLUMN IF EXISTS "search_vector"',
+]
+
+
+def _fts5_tersedia(cursor):
+    """SQLite tanpa FTS5: full-text search dilewati (fallback ke LIKE)"""
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    if cursor.fetchone()[0]:
+        return True
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.cek_fts5 USING fts5(x)")
+        cursor.execute("DROP TABLE temp.cek_fts5")
+        return True
+    except DatabaseError:
+        return False
+
+
+def _jalankan(schema_editor, sql_sqlite, sql_postgres):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite' and _fts5_tersedia(cursor):
+            daftar_sql = sql_sqlite
+        elif connection.vendor == 'postgresql':
+            daftar_sql = sql_postgres
+        else:
+            return
+        for sql in daftar_sql:
+            cursor.execute(sql)
+
+
+def pasang_fulltext(apps, schema_editor):
+    _jalankan(schema_editor, SQLITE_PASANG, POSTGRES_PASANG)
+
+
+def hapus_fulltext(apps, schema_editor):
+    _jalankan(schema_editor, SQLITE_HAPUS, POSTGRES_HAPUS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(pasang_fulltext, hapus_fulltext),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:47
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def isi_diperbarui(apps, schema_editor):
+    """Data lama: anggap terakhir diperbarui saat dipublish"""
+    BERITA = apps.get_model('FITURBERITA', 'BERITA')
+    BERITA.objects.using(schema_editor.connection.alias).update(diperbarui=F('tanggal'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0004_berita_fulltext_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='berita',
+            name='diperbarui',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Terakhir Diperbarui'),
+        ),
+        migrations.RunPython(isi_diperbarui, migrations.RunPython.noop),
+    ]
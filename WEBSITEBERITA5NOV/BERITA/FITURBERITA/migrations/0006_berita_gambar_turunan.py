@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0005_berita_diperbarui'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='berita',
+            name='gambar_turunan',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Gambar Turunan'),
+        ),
+    ]
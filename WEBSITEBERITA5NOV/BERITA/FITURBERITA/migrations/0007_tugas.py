@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0006_berita_gambar_turunan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tugas',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nama', models.CharField(max_length=100, verbose_name='Nama Tugas')),
+                ('argumen', models.JSONField(blank=True, default=dict, verbose_name='Argumen')),
+                ('status', models.CharField(choices=[('antri', 'Antri'), ('berjalan', 'Berjalan'), ('selesai', 'Selesai'), ('gagal', 'Gagal')], default='antri', max_length=10, verbose_name='Status')),
+                ('percobaan', models.PositiveIntegerField(default=0, verbose_name='Jumlah Percobaan')),
+                ('maks_percobaan', models.PositiveIntegerField(default=5, verbose_name='Maksimal Percobaan')),
+                ('jadwal', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Dijadwalkan')),
+                ('dibuat', models.DateTimeField(auto_now_add=True, verbose_name='Dibuat')),
+                ('mulai', models.DateTimeField(blank=True, null=True, verbose_name='Mulai Dijalankan')),
+                ('selesai', models.DateTimeField(blank=True, null=True, verbose_name='Selesai')),
+                ('error', models.TextField(blank=True, verbose_name='Error Terakhir')),
+            ],
+            options={
+                'verbose_name': 'Tugas',
+                'verbose_name_plural': 'Tugas',
+                'ordering': ['jadwal', 'id'],
+                'indexes': [models.Index(fields=['status', 'jadwal'], name='tugas_status_jadwal_idx')],
+            },
+        ),
+    ]
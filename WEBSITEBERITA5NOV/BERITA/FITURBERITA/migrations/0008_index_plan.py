@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0007_tugas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='komentar',
+            name='BERITA',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='komentar', to='FITURBERITA.berita', verbose_name='BERITA'),
+        ),
+        migrations.AddIndex(
+            model_name='berita',
+            index=models.Index(fields=['judul', 'id'], name='berita_judul_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='komentar',
+            index=models.Index(fields=['nama', '-tanggal', '-id'], name='komentar_nama_tanggal_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:29
+
+import FITURBERITA.models
+from django.db import migrations
+
+
+def isi_ringkasan(apps, schema_editor):
+    """Isi ringkasan BERITA yang sudah ada (per batch, tanpa menyentuh diperbarui)"""
+    BERITA = apps.get_model('FITURBERITA', 'BERITA')
+    alias = schema_editor.connection.alias
+    batch = []
+    for pk, isi in BERITA.objects.using(alias).values_list('pk', 'isi_BERITA').iterator(chunk_size=2000):
+        batch.append(BERITA(pk=pk, ringkasan=FITURBERITA.models.buat_ringkasan(isi)))
+        if len(batch) >= 2000:
+            BERITA.objects.using(alias).bulk_update(batch, ['ringkasan'])
+            batch = []
+    if batch:
+        BERITA.objects.using(alias).bulk_update(batch, ['ringkasan'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0008_index_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='berita',
+            name='ringkasan',
+            field=FITURBERITA.models.RingkasanField(blank=True, default='', editable=False, max_length=203, panjang=200, sumber='isi_BERITA', verbose_name='Ringkasan'),
+        ),
+        migrations.RunPython(isi_ringkasan, migrations.RunPython.noop),
+    ]
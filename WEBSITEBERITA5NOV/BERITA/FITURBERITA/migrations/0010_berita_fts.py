@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FITURBERITA', '0009_berita_ringkasan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BERITAFts',
+            fields=[
+                ('BERITA', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='FITURBERITA.berita')),
+                ('dokumen', models.TextField(db_column='FITURBERITA_berita_fts')),
+            ],
+            options={
+                'db_table': 'FITURBERITA_berita_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -3,7 +3,52 @@ FITURBERITA/models.py
 Model untuk BERITA dan Komentar
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+PANJANG_RINGKASAN = 200
+
+
+def buat_ringkasan(teks, panjang=PANJANG_RINGKASAN):
+    """Potongan awal teks (spasi dirapikan, dipotong di batas kata) untuk teaser list"""
+    teks = ' '.join((teks or '').split())
+    if len(teks) <= panjang:
+        return teks
+    potong = teks[:panjang]
+    spasi = potong.rfind(' ')
+    if spasi > panjang // 2:
+        potong = potong[:spasi]
+    return potong.rstrip(' ,.;:') + '...'
+
+
+class RingkasanField(models.CharField):
+    """
+    CharField yang diisi otomatis dari field teks `sumber` lewat pre_save,
+    sehingga ikut terisi pada save() dan bulk_create() (import, bulk, seed).
+    bulk_update dan queryset.update() tidak memanggil pre_save: BulkMixin
+    mengisinya manual (lihat get_bulk_update_extra_fields)
+    """
+    def __init__(self, *args, sumber=None, panjang=PANJANG_RINGKASAN, **kwargs):
+        self.sumber = sumber
+        self.panjang = panjang
+        kwargs.setdefault('max_length', panjang + 3)  # + '...'
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('default', '')
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['sumber'] = self.sumber
+        kwargs['panjang'] = self.panjang
+        return name, path, args, kwargs
+    
+    def pre_save(self, model_instance, add):
+        nilai = buat_ringkasan(getattr(model_instance, self.sumber), self.panjang)
+        setattr(model_instance, self.attname, nilai)
+        return nilai
 
 
 class BERITA(models.Model):
@@ -13,24 +58,137 @@ class BERITA(models.Model):
     judul = models.CharField(max_length=200, verbose_name="Judul BERITA")
     tanggal = models.DateTimeField(auto_now_add=True, verbose_name="Tanggal Publish")
     isi_BERITA = models.TextField(verbose_name="Isi BERITA")
+    # Teaser tersimpan untuk list (?fields=...,ringkasan tanpa memuat isi_BERITA)
+    ringkasan = RingkasanField(sumber='isi_BERITA', verbose_name="Ringkasan")
     gambar = models.ImageField(
         upload_to='BERITA_images/', 
         blank=True, 
         null=True,
         verbose_name="Gambar BERITA"
     )
+    # Path gambar turunan (thumbnail/card/full, WebP + JPEG), diisi FITURBERITA/images.py
+    gambar_turunan = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Gambar Turunan"
+    )
+    # Waktu perubahan terakhir BERITA atau komentarnya (untuk ETag / Last-Modified)
+    diperbarui = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name="Terakhir Diperbarui"
+    )
+    # Counter komentar yang disimpan (denormalisasi), dijaga oleh signals
+    jumlah_komentar = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Jumlah Komentar"
+    )
     
     class Meta:
         verbose_name = "BERITA"
         verbose_name_plural = "BERITA"
         ordering = ['-tanggal']  # Urutkan dari yang terbaru
+        indexes = [
+            # Keyset pagination (tanggal, id) dan default ordering
+            models.Index(fields=['-tanggal', '-id'], name='berita_tanggal_id_idx'),
+            # ?ordering=judul / -judul di list
+            models.Index(fields=['judul', 'id'], name='berita_judul_id_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Simpan nama gambar awal agar upload gambar baru bisa dideteksi"""
+        instance = super().from_db(db, field_names, values)
+        if 'gambar' in instance.__dict__:
+            instance._gambar_awal = instance.__dict__['gambar'] or ''
+        return instance
+    
+    def gambar_berubah(self):
+        """Cek apakah gambar diganti sejak objek dimuat dari database"""
+        if not hasattr(self, '_gambar_awal'):
+            return bool(self.gambar)  # Objek baru
+        return (self.gambar.name or '') != self._gambar_awal
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'isi_BERITA' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'ringkasan'}
+        super().save(*args, **kwargs)
+        self._gambar_awal = self.gambar.name or ''
     
     def __str__(self):
         return self.judul
     
     def get_jumlah_komentar(self):
-        """Method untuk menghitung jumlah komentar"""
-        return self.komentar.count()
+        """Method untuk mendapatkan jumlah komentar (dari counter tersimpan)"""
+        return self.jumlah_komentar
+    
+    @classmethod
+    def ubah_jumlah_komentar(cls, selisih_per_BERITA, using=None):
+        """
+        Tambah/kurangi counter jumlah_komentar secara atomic di database
+        sekaligus menandai BERITA sebagai diperbarui (ETag / Last-Modified berubah)
+        selisih_per_BERITA: {BERITA_id: selisih}, selisih 0 hanya menyentuh diperbarui
+        Satu UPDATE per nilai selisih, bukan per BERITA
+        """
+        per_selisih = {}
+        for BERITA_id, selisih in selisih_per_BERITA.items():
+            if BERITA_id is not None:
+                per_selisih.setdefault(selisih, []).append(BERITA_id)
+        sekarang = timezone.now()
+        for selisih, ids in per_selisih.items():
+            perubahan = {'diperbarui': sekarang}
+            if selisih:
+                perubahan['jumlah_komentar'] = F('jumlah_komentar') + selisih
+            cls.objects.using(using).filter(pk__in=ids).update(**perubahan)
+    
+    @classmethod
+    def hitung_ulang_jumlah_komentar(cls, BERITA_ids=None):
+        """
+        Hitung ulang counter jumlah_komentar langsung dari tabel Komentar
+        Jika BERITA_ids kosong, semua BERITA dihitung ulang
+        Return: jumlah baris BERITA yang diupdate
+        """
+
+        jumlah = (
+            Komentar.objects
+            .filter(BERITA=OuterRef('pk'))
+            .order_by()
+            .values('BERITA')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = cls.objects.all()
+        if BERITA_ids is not None:
+            queryset = queryset.filter(pk__in=BERITA_ids)
+        return queryset.update(
+            jumlah_komentar=Coalesce(Subquery(jumlah), Value(0)),
+            diperbarui=timezone.now()
+        )
+
+
+class BERITAFts(models.Model):
+    """
+    Tabel virtual FTS5 untuk BERITA (SQLite), dibuat dan diisi oleh search.py
+    Hanya dipakai untuk join pencarian: rowid = BERITA.id. Field `dokumen`
+    adalah kolom tersembunyi FTS5 bernama sama dengan tabel, target MATCH dan
+    argumen pertama fungsi ranking bm25()
+    """
+    BERITA = models.OneToOneField(
+        BERITA,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='fts',
+    )
+    dokumen = models.TextField(db_column='FITURBERITA_berita_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'FITURBERITA_berita_fts'
 
 
 class Komentar(models.Model):
@@ -40,10 +198,12 @@ class Komentar(models.Model):
     nama = models.CharField(max_length=100, verbose_name="Nama Pemberi Komentar")
     tanggal = models.DateTimeField(auto_now_add=True, verbose_name="Tanggal Komentar")
     isi_komentar = models.TextField(verbose_name="Isi Komentar")
+    # Index FK bawaan tidak dibuat: sudah tercakup prefix index komentar_berita_tanggal_idx
     BERITA = models.ForeignKey(
         BERITA, 
         on_delete=models.CASCADE, 
         related_name='komentar',
+        db_index=False,
         verbose_name="BERITA"
     )
     
@@ -51,6 +211,71 @@ class Komentar(models.Model):
         verbose_name = "Komentar"
         verbose_name_plural = "Komentar"
         ordering = ['-tanggal']  # Urutkan dari yang terbaru
+        indexes = [
+            # Keyset pagination komentar global dan per BERITA
+            models.Index(fields=['-tanggal', '-id'], name='komentar_tanggal_id_idx'),
+            models.Index(fields=['BERITA', '-tanggal', '-id'], name='komentar_berita_tanggal_idx'),
+            # filter ?nama= di list komentar, urut terbaru
+            models.Index(fields=['nama', '-tanggal', '-id'], name='komentar_nama_tanggal_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Simpan BERITA_id awal agar perpindahan komentar bisa dideteksi"""
+        instance = super().from_db(db, field_names, values)
+        instance._BERITA_id_awal = instance.__dict__.get('BERITA_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Simpan komentar dan update counter dalam satu transaksi"""
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._BERITA_id_awal = self.BERITA_id
+    
+    def __str__(self):
+        return f"Komentar oleh {self.nama} pada {self.BERITA.judul}"
+
+class Tugas(models.Model):
+    """
+    Model antrian tugas latar belakang (task queue berbasis database)
+    Diisi lewat FITURBERITA.taskqueue.antrikan() dan dijalankan oleh
+    management command `jalankan_worker`
+    """
+    ANTRI = 'antri'
+    BERJALAN = 'berjalan'
+    SELESAI = 'selesai'
+    GAGAL = 'gagal'
+    STATUS_CHOICES = [
+        (ANTRI, 'Antri'),
+        (BERJALAN, 'Berjalan'),
+        (SELESAI, 'Selesai'),
+        (GAGAL, 'Gagal'),
+    ]
+    
+    nama = models.CharField(max_length=100, verbose_name="Nama Tugas")
+    argumen = models.JSONField(default=dict, blank=True, verbose_name="Argumen")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=ANTRI,
+        verbose_name="Status"
+    )
+    percobaan = models.PositiveIntegerField(default=0, verbose_name="Jumlah Percobaan")
+    maks_percobaan = models.PositiveIntegerField(default=5, verbose_name="Maksimal Percobaan")
+    jadwal = models.DateTimeField(default=timezone.now, verbose_name="Dijadwalkan")
+    dibuat = models.DateTimeField(auto_now_add=True, verbose_name="Dibuat")
+    mulai = models.DateTimeField(null=True, blank=True, verbose_name="Mulai Dijalankan")
+    selesai = models.DateTimeField(null=True, blank=True, verbose_name="Selesai")
+    error = models.TextField(blank=True, verbose_name="Error Terakhir")
+    
+    class Meta:
+        verbose_name = "Tugas"
+        verbose_name_plural = "Tugas"
+        ordering = ['jadwal', 'id']
+        indexes = [
+            # Worker mengambil tugas dengan: status = antri AND jadwal <= now ORDER BY jadwal
+            models.Index(fields=['status', 'jadwal'], name='tugas_status_jadwal_idx'),
+        ]
     
     def __str__(self):
-        return f"Komentar oleh {self.nama} pada {self.BERITA.judul}"
\ No newline at end of file
+        return f"{self.nama} #{self.pk} ({self.status})"
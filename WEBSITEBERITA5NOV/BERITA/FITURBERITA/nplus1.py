@@ -0,0 +1,211 @@
+"""
+FITURBERITA/nplus1.py
+Detektor N+1 query
+
+Setiap query dalam satu request (atau blok lacak()) dikelompokkan menurut
+fingerprint SQL: placeholder sudah terpisah dari nilai, daftar IN (...) dan
+literal dinormalisasi. Jika satu fingerprint dijalankan lebih dari AMBANG
+kali, itu hampir selalu query per baris di dalam loop (N+1), misalnya
+obj.BERITA.judul tanpa select_related.
+
+Saat pelanggaran pertama kali terjadi stack trace dicatat (difilter ke kode
+project), sehingga laporan menunjuk baris yang menjalankan loop.
+
+Mode (settings.BERITA_NPLUS1['MODE']):
+    raise : lempar NPlusSatuError (dipakai test suite lewat NPlusSatuTestRunner)
+    log   : logger FITURBERITA.nplus1 level WARNING dengan stack trace
+    off   : nonaktif
+
+Di test, blok tanpa request bisa diperiksa dengan:
+    with lacak(ambang=3):
+        ...
+"""
+
+import logging
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+logger = logging.getLogger('FITURBERITA.nplus1')
+
+DEFAULT_CONFIG = {
+    'MODE': 'log',
+    'AMBANG': 5,
+}
+
+BASE_DIR = str(Path(__file__).resolve().parent.parent)
+
+# Frame middleware / execute wrapper tidak membantu menemukan loop
+_FRAME_DIABAIKAN = ('__call__', '__acall__', 'catat_query', '<module>')
+
+# Statement transaksi tidak dihitung
+_DIABAIKAN = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT', 'ROLLBACK')
+
+_POLA_IN = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_POLA_STRING = re.compile(r"'(?:[^']|'')*'")
+_POLA_ANGKA = re.compile(r'\b\d+\b')
+_POLA_SPASI = re.compile(r'\s+')
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_NPLUS1', {})}
+
+
+class NPlusSatuError(AssertionError):
+    """Query yang sama dijalankan berulang kali (N+1)"""
+
+
+def fingerprint(sql):
+    """SQL tanpa nilai: query yang hanya berbeda parameter mendapat fingerprint sama"""
+    sql = _POLA_IN.sub('(...)', sql)
+    sql = _POLA_STRING.sub('?', sql)
+    sql = _POLA_ANGKA.sub('?', sql)
+    return _POLA_SPASI.sub(' ', sql).strip()
+
+
+def _stack_project():
+    """Frame stack yang berasal dari kode project (tanpa Django / library)"""
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(BASE_DIR) and frame.name not in _FRAME_DIABAIKAN
+    ]
+    return ''.join(traceback.format_list(frames))
+
+
+class Pelacak:
+    """Hitungan fingerprint untuk satu request / blok lacak()"""
+
+    def __init__(self, ambang, label, induk=None):
+        self.ambang = ambang
+        self.label = label
+        self.induk = induk
+        self.hitungan = Counter()
+        self.contoh = {}
+
+    def catat(self, sql):
+        kunci = fingerprint(sql)
+        self.hitungan[kunci] += 1
+        if self.hitungan[kunci] == self.ambang + 1:
+            self.contoh[kunci] = (sql, _stack_project())
+        if self.induk is not None:
+            self.induk.catat(sql)
+
+    def pelanggaran(self):
+        """[(jumlah, sql contoh, stack)] untuk fingerprint di atas ambang"""
+        return [
+            (jumlah, *self.contoh[kunci])
+            for kunci, jumlah in self.hitungan.most_common()
+            if jumlah > self.ambang
+        ]
+
+    def laporan(self):
+        bagian = [f'N+1 query terdeteksi di {self.label} (ambang {self.ambang}):']
+        for jumlah, sql, stack in self.pelanggaran():
+            bagian.append(f'  {jumlah}x {sql}')
+            if stack:
+                bagian.append(stack.rstrip())
+        return '\n'.join(bagian)
+
+
+_pelacak = ContextVar('berita_nplus1', default=None)
+
+
+def catat_query(execute, sql, params, many, context):
+    """Execute wrapper: masukkan query ke pelacak aktif"""
+    pelacak = _pelacak.get()
+    if pelacak is not None and not sql.lstrip().upper().startswith(_DIABAIKAN):
+        pelacak.catat(sql)
+    return execute(sql, params, many, context)
+
+
+def pasang_pencatat_query(sender, connection, **kwargs):
+    """Handler connection_created: pasang execute wrapper di setiap koneksi baru"""
+    if catat_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(catat_query)
+
+
+def laporkan(pelacak, mode):
+    if mode == 'off' or not pelacak.pelanggaran():
+        return
+    if mode == 'raise':
+        raise NPlusSatuError(pelacak.laporan())
+    logger.warning(pelacak.laporan())
+
+
+@contextmanager
+def lacak(ambang=None, mode='raise', label='blok kode'):
+    """Periksa N+1 di dalam blok (dipakai di test atau skrip)"""
+    pelacak = Pelacak(get_config()['AMBANG'] if ambang is None else ambang, label, _pelacak.get())
+    token = _pelacak.set(pelacak)
+    try:
+        yield pelacak
+    finally:
+        _pelacak.reset(token)
+    laporkan(pelacak, mode)
+
+
+class NPlusSatuMiddleware:
+    """Lacak setiap request; laporkan (raise/log) jika ada fingerprint di atas ambang"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _mulai(self, request):
+        config = get_config()
+        if config['MODE'] == 'off':
+            return None, None, config
+        pelacak = Pelacak(config['AMBANG'], f'{request.method} {request.path}', _pelacak.get())
+        return pelacak, _pelacak.set(pelacak), config
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pelacak, token, config = self._mulai(request)
+        if pelacak is None:
+            return self.get_response(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pelacak.reset(token)
+        laporkan(pelacak, config['MODE'])
+        return response
+
+    async def __acall__(self, request):
+        pelacak, token, config = self._mulai(request)
+        if pelacak is None:
+            return await self.get_response(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pelacak.reset(token)
+        laporkan(pelacak, config['MODE'])
+        return response
+
+
+class NPlusSatuTestRunner(DiscoverRunner):
+    """Test runner: setiap request di test suite gagal jika ada N+1"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._config_asli = getattr(settings, 'BERITA_NPLUS1', None)
+        settings.BERITA_NPLUS1 = {**get_config(), 'MODE': 'raise'}
+
+    def teardown_test_environment(self, **kwargs):
+        if self._config_asli is None:
+            del settings.BERITA_NPLUS1
+        else:
+            settings.BERITA_NPLUS1 = self._config_asli
+        super().teardown_test_environment(**kwargs)
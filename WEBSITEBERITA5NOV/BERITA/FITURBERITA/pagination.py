@@ -0,0 +1,217 @@
+"""
+FITURBERITA/pagination.py
+Pagination untuk API BERITA dan Komentar
+
+Default tetap PageNumberPagination (?page=N). Mode keyset/cursor bersifat opt-in:
+kirim ?paginasi=cursor (halaman pertama) lalu ikuti link `next`/`previous`
+yang berisi parameter ?cursor=... Mode cursor selalu urut (tanggal, id) terbaru
+dulu: ?ordering= lain atau urutan relevansi ?search= dijawab 400.
+
+Komentar satu BERITA (action komentar dan nested komentar di detail) selalu
+dibatasi: settings.BERITA_KOMENTAR = {'EMBED': jumlah komentar di detail,
+'PAGE_SIZE': ukuran halaman action komentar}.
+"""
+
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .export import parse_since
+
+DEFAULT_KOMENTAR_CONFIG = {
+    'EMBED': 10,
+    'PAGE_SIZE': 50,
+}
+
+
+def get_komentar_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_KOMENTAR_CONFIG, **getattr(settings, 'BERITA_KOMENTAR', {})}
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination dengan kunci (tanggal, id), urut dari yang terbaru
+
+    Posisi halaman disimpan di cursor, sehingga:
+    - tidak ada OFFSET scan dan tidak ada query COUNT(*)
+    - urutan stabil walau ada data baru yang masuk di antara request
+    - setiap halaman adalah range scan pada index (tanggal, id)
+    """
+    page_size = None
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor tidak valid'
+
+    def __init__(self, page_size=None):
+        if page_size is not None:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.siapkan(request)
+        # Ambil satu baris lebih untuk tahu apakah masih ada halaman berikutnya
+        hasil = list(self.filter_posisi(queryset)[:self.page_size + 1])
+        return self.set_halaman(hasil)
+
+    def siapkan(self, request):
+        """Baca posisi cursor dari request (dipisah agar bisa dipakai view async)"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.posisi = self.decode_cursor(request)
+        self.mundur = self.posisi is not None and self.posisi[2]
+
+    def filter_posisi(self, queryset):
+        """Batasi queryset ke baris setelah/sebelum posisi cursor (range scan index)"""
+        if self.posisi is None:
+            return queryset.order_by('-tanggal', '-id')
+        tanggal, pk, mundur = self.posisi
+        if mundur:
+            return queryset.filter(
+                Q(tanggal__gt=tanggal) | Q(tanggal=tanggal, id__gt=pk)
+            ).order_by('tanggal', 'id')
+        return queryset.filter(
+            Q(tanggal__lt=tanggal) | Q(tanggal=tanggal, id__lt=pk)
+        ).order_by('-tanggal', '-id')
+
+    def set_halaman(self, hasil):
+        """Terima page_size + 1 baris hasil filter_posisi, return baris halaman ini"""
+        masih_ada = len(hasil) > self.page_size
+        hasil = hasil[:self.page_size]
+
+        if self.mundur:
+            hasil.reverse()
+            self.ada_next = True
+            self.ada_previous = masih_ada
+        else:
+            self.ada_next = masih_ada
+            self.ada_previous = self.posisi is not None
+
+        self.page = hasil
+        return hasil
+
+    def decode_cursor(self, request):
+        """Return (tanggal, id, mundur) dari query param cursor, atau None"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            tanggal, pk, arah = decoded.split('|')
+            tanggal = parse_datetime(tanggal)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if tanggal is None or arah not in ('n', 'p'):
+            raise NotFound(self.invalid_cursor_message)
+        return tanggal, pk, arah == 'p'
+
+    @staticmethod
+    def token_cursor(obj, mundur=False):
+        """Token cursor untuk posisi obj (tanpa URL)"""
+        nilai = f"{obj.tanggal.isoformat()}|{obj.pk}|{'p' if mundur else 'n'}"
+        return base64.urlsafe_b64encode(nilai.encode('ascii')).decode('ascii')
+
+    def encode_cursor(self, obj, mundur):
+        """Buat URL dengan cursor yang menunjuk ke posisi obj"""
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.token_cursor(obj, mundur)
+        )
+
+    def get_next_link(self):
+        if not self.ada_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], mundur=False)
+
+    def get_previous_link(self):
+        if not self.ada_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], mundur=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KomentarPagination(KeysetPagination):
+    """
+    Keyset pagination untuk komentar satu BERITA, selalu aktif (tanpa COUNT)
+    ?since=<ISO datetime> hanya mengambil komentar setelah waktu tersebut,
+    untuk fetch incremental tanpa mengulang komentar yang sudah dimiliki client
+
+    since eksklusif dengan granularitas detik, sama dengan `tanggal` di response
+    (DATETIME_FORMAT tanpa pecahan detik): client cukup mengirim `tanggal`
+    komentar terbaru yang sudah dimiliki, komentar di detik yang sama tidak
+    diulang. Pecahan detik pada since diabaikan.
+    """
+    since_query_param = 'since'
+
+    def __init__(self, page_size=None):
+        super().__init__(page_size or get_komentar_config()['PAGE_SIZE'])
+
+    def filter_posisi(self, queryset):
+        since = self.request.query_params.get(self.since_query_param)
+        if since:
+            batas = parse_since(since).replace(microsecond=0) + timedelta(seconds=1)
+            queryset = queryset.filter(tanggal__gte=batas)
+        return super().filter_posisi(queryset)
+
+
+class BERITAPagination(PageNumberPagination):
+    """
+    PageNumberPagination biasa, dengan mode keyset yang bisa dipilih per request
+    lewat ?paginasi=cursor atau ?cursor=...
+    """
+    mode_query_param = 'paginasi'
+    keyset_class = KeysetPagination
+    # order_by queryset (setelah filter/ordering/search) yang sama dengan urutan keyset
+    urutan_keyset = ((), ('-tanggal',), ('-tanggal', '-id'))
+    urutan_tidak_didukung_message = (
+        'Mode cursor hanya mendukung urutan terbaru (-tanggal); '
+        'hapus ?ordering= lain atau pakai ?ordering=-tanggal saat ?search='
+    )
+
+    def pakai_keyset(self, request):
+        """Cek apakah client meminta mode keyset"""
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.pakai_keyset(request):
+            if tuple(queryset.query.order_by) not in self.urutan_keyset:
+                raise ValidationError({self.mode_query_param: [self.urutan_tidak_didukung_message]})
+            self.keyset = self.keyset_class(page_size=self.get_page_size(request) or self.page_size)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,165 @@
+"""
+FITURBERITA/queryplan.py
+Pemeriksaan query plan: jalankan setiap endpoint baca (dengan kombinasi
+filter/ordering/pagination yang didukung), tangkap semua SELECT yang
+dijalankan lalu EXPLAIN satu per satu dan tandai full table scan
+
+- SQLite    : EXPLAIN QUERY PLAN, baris "SCAN <tabel>" tanpa "USING ... INDEX"
+- PostgreSQL: EXPLAIN dengan enable_seqscan = off, baris "Seq Scan on <tabel>"
+              (tabel kecil di dev selalu seq scan, jadi planner dipaksa memilih index jika ada)
+- "USE TEMP B-TREE" (sort tanpa index) dilaporkan sebagai peringatan
+
+Semua dijalankan dalam transaksi yang di-rollback; jika database kosong
+dibuat data contoh sementara. Dipakai oleh: python manage.py periksa_query_plan
+"""
+
+import re
+
+from django.db import connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import BERITA, Komentar, Tugas
+
+PREFIX_TABEL = 'FITURBERITA_'
+
+# Tabel virtual FTS5 memang di-scan lewat index internalnya sendiri
+TABEL_DIABAIKAN = ('FITURBERITA_berita_fts',)
+
+POLA_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (?P<tabel>\w+)\b(?! USING (?:COVERING )?INDEX)(?! VIRTUAL TABLE)'),
+    'postgresql': re.compile(r'Seq Scan on "?(?P<tabel>\w+)"?'),
+}
+POLA_PERINGATAN = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+
+class HasilPlan:
+    """Plan satu query"""
+
+    def __init__(self, label, sql, plan, scan_penuh, peringatan):
+        self.label = label
+        self.sql = sql
+        self.plan = plan
+        self.scan_penuh = scan_penuh
+        self.peringatan = peringatan
+
+    @property
+    def ok(self):
+        return not self.scan_penuh
+
+
+def rencana_endpoint(sampel):
+    """(label, url, params) untuk setiap kombinasi filter/ordering/pagination yang didukung"""
+    BERITA_id, nama = sampel['BERITA'], sampel['nama']
+    list_BERITA = reverse('FITURBERITA:BERITA-list')
+    list_komentar = reverse('FITURBERITA:komentar-list')
+    komentar_BERITA = reverse('FITURBERITA:BERITA-komentar', args=[BERITA_id])
+    kemarin = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+    return [
+        ('BERITA list', list_BERITA, {}),
+        ('BERITA list halaman 2', list_BERITA, {'page': 2}),
+        ('BERITA list ordering judul', list_BERITA, {'ordering': 'judul'}),
+        ('BERITA list ordering -judul', list_BERITA, {'ordering': '-judul'}),
+        ('BERITA list ordering tanggal', list_BERITA, {'ordering': 'tanggal'}),
+        ('BERITA list keyset', list_BERITA, {'paginasi': 'cursor'}),
+        ('BERITA list search', list_BERITA, {'search': 'berita'}),
+        ('BERITA detail', reverse('FITURBERITA:BERITA-detail', args=[BERITA_id]), {}),
+        ('BERITA terbaru', reverse('FITURBERITA:BERITA-terbaru'), {}),
+        ('BERITA komentar', komentar_BERITA, {}),
+        ('BERITA komentar since', komentar_BERITA, {'since': kemarin}),
+        ('BERITA export since', reverse('FITURBERITA:BERITA-export'), {'since': kemarin}),
+        ('komentar list', list_komentar, {}),
+        ('komentar list filter BERITA', list_komentar, {'BERITA': BERITA_id}),
+        ('komentar list filter nama', list_komentar, {'nama': nama}),
+        ('komentar list filter BERITA + nama', list_komentar, {'BERITA': BERITA_id, 'nama': nama}),
+        ('komentar list keyset', list_komentar, {'paginasi': 'cursor'}),
+        ('komentar list ordering tanggal', list_komentar, {'ordering': 'tanggal'}),
+        ('komentar detail', reverse('FITURBERITA:komentar-detail', args=[sampel['komentar']]), {}),
+        ('komentar export since', reverse('FITURBERITA:komentar-export'), {'since': kemarin}),
+    ]
+
+
+def rencana_queryset():
+    """Query di luar HTTP yang berjalan rutin (worker task queue)"""
+    return [
+        ('worker ambil tugas', Tugas.objects.filter(
+            status=Tugas.ANTRI, jadwal__lte=timezone.now()
+        ).order_by('jadwal', 'id')[:10]),
+        ('worker tugas macet', Tugas.objects.filter(
+            status=Tugas.BERJALAN, mulai__lt=timezone.now()
+        ).values('id')),
+    ]
+
+
+def explain(connection, sql):
+    """Return baris-baris plan untuk satu SELECT"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [baris[-1] for baris in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}')
+        return [baris[0] for baris in cursor.fetchall()]
+
+
+def analisa(vendor, plan):
+    """Return (tabel yang di-scan penuh, peringatan)"""
+    pola = POLA_SCAN.get(vendor)
+    scan_penuh, peringatan = [], []
+    for baris in plan:
+        cocok = pola.search(baris) if pola else None
+        if cocok:
+            tabel = cocok.group('tabel')
+            if tabel.startswith(PREFIX_TABEL) and tabel not in TABEL_DIABAIKAN:
+                scan_penuh.append(tabel)
+        if POLA_PERINGATAN.search(baris):
+            peringatan.append(baris.strip())
+    return scan_penuh, peringatan
+
+
+def _sampel():
+    """Ambil id contoh; buat data sementara jika tabel kosong (ikut di-rollback)"""
+    komentar = Komentar.objects.only('id', 'nama', 'BERITA').order_by('-id').first()
+    if komentar is None:
+        BERITA_obj = BERITA.objects.order_by('-id').first() or BERITA.objects.create(
+            judul='Contoh berita', isi_BERITA='Data sementara pemeriksaan query plan'
+        )
+        komentar = Komentar.objects.create(nama='contoh', isi_komentar='contoh', BERITA=BERITA_obj)
+    return {'BERITA': komentar.BERITA_id, 'komentar': komentar.pk, 'nama': komentar.nama}
+
+
+def _plan_dari(connection, label, captured):
+    """EXPLAIN setiap SELECT ke tabel aplikasi yang tertangkap"""
+    for query in captured.captured_queries:
+        sql = query['sql']
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')) and PREFIX_TABEL in sql:
+            plan = explain(connection, sql)
+            yield HasilPlan(label, sql, plan, *analisa(connection.vendor, plan))
+
+
+def periksa(using='default'):
+    """Jalankan semua rencana dan return list HasilPlan"""
+    connection = connections[using]
+    hasil = []
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        sampel = _sampel()
+        client = Client()
+        with override_settings(BERITA_RESPONSE_CACHE={'ENABLED': False}):
+            for label, url, params in rencana_endpoint(sampel):
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.get(url, params, HTTP_ACCEPT='application/json')
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                hasil.extend(_plan_dari(connection, label, captured))
+
+        for label, queryset in rencana_queryset():
+            with CaptureQueriesContext(connection) as captured:
+                list(queryset)
+            hasil.extend(_plan_dari(connection, label, captured))
+        transaction.set_rollback(True, using=using)
+    return hasil
+
@@ -0,0 +1,167 @@
+"""
+FITURBERITA/replica.py
+Routing baca ke database replika (read replica)
+
+- ReplicaMiddleware menandai setiap request: GET/HEAD/OPTIONS boleh dibaca
+  dari replika, method lain (POST/PUT/PATCH/DELETE) selalu ke primary
+- Setelah request tulis berhasil, client diberi cookie sticky; selama
+  STICKY detik semua baca client tersebut tetap ke primary
+  (read-your-writes: komentar yang baru dikirim langsung terlihat
+  walaupun replika masih tertinggal)
+- ReplicaRouter memilih replika secara round-robin untuk request yang
+  ditandai; di luar request (management command, worker) dan di dalam
+  transaksi primary, baca selalu ke primary
+- Semua tulis ke primary ('default')
+
+Konfigurasi di settings.BERITA_REPLICA:
+    ALIASES : alias di settings.DATABASES yang menjadi replika (kosong = nonaktif)
+    STICKY  : lama (detik) baca dipaksa ke primary setelah client menulis
+    COOKIE  : nama cookie penanda sticky
+
+Uji lokal dengan dua file SQLite: salin db.sqlite3 menjadi db_replica.sqlite3
+lalu jalankan dengan DB_REPLICAS=db_replica.sqlite3 (lihat BERITA/database.py)
+"""
+
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULT_CONFIG = {
+    'ALIASES': [],
+    'STICKY': 5,
+    'COOKIE': 'berita_primary',
+}
+
+METHOD_AMAN = ('GET', 'HEAD', 'OPTIONS')
+
+# True = request saat ini boleh membaca dari replika
+_boleh_replika = ContextVar('berita_boleh_replika', default=False)
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_REPLICA', {})}
+
+
+class ReplicaRouter:
+    """Database router: baca round-robin ke replika, tulis ke primary"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._putaran = {}
+
+    def _berikutnya(self, aliases):
+        aliases = tuple(aliases)
+        with self._lock:
+            putaran = self._putaran.get(aliases)
+            if putaran is None:
+                putaran = self._putaran[aliases] = itertools.cycle(aliases)
+            return next(putaran)
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db  # relasi ikut database objek asalnya
+        aliases = get_config()['ALIASES']
+        if not aliases or not _boleh_replika.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return self._berikutnya(aliases)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replika berisi data yang sama
+        return True
+
+
+def _sticky(request, config):
+    """True jika client baru saja menulis (cookie sticky belum kedaluwarsa)"""
+    try:
+        return float(request.COOKIES.get(config['COOKIE'], 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _dengan_mode(boleh, iterator):
+    """Stream response dibaca setelah middleware selesai: pasang ulang mode per chunk"""
+    iterator = iter(iterator)
+    while True:
+        token = _boleh_replika.set(boleh)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _boleh_replika.reset(token)
+        yield chunk
+
+
+async def _dengan_mode_async(boleh, iterator):
+    iterator = aiter(iterator)
+    while True:
+        token = _boleh_replika.set(boleh)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _boleh_replika.reset(token)
+        yield chunk
+
+
+class ReplicaMiddleware:
+    """Tandai request yang boleh membaca dari replika dan atur cookie sticky"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _mode(self, request, config):
+        return bool(config['ALIASES']) and request.method in METHOD_AMAN and not _sticky(request, config)
+
+    def _selesai(self, request, response, boleh, config):
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _dengan_mode_async(boleh, response.streaming_content)
+            else:
+                response.streaming_content = _dengan_mode(boleh, response.streaming_content)
+        if config['ALIASES'] and request.method not in METHOD_AMAN and response.status_code < 400:
+            response.set_cookie(
+                config['COOKIE'], f'{time.time() + config["STICKY"]:.3f}',
+                max_age=config['STICKY'], httponly=True, samesite='Lax',
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = get_config()
+        boleh = self._mode(request, config)
+        token = _boleh_replika.set(boleh)
+        try:
+            response = self.get_response(request)
+        finally:
+            _boleh_replika.reset(token)
+        return self._selesai(request, response, boleh, config)
+
+    async def __acall__(self, request):
+        config = get_config()
+        boleh = self._mode(request, config)
+        token = _boleh_replika.set(boleh)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _boleh_replika.reset(token)
+        return self._selesai(request, response, boleh, config)
@@ -0,0 +1,263 @@
+"""
+FITURBERITA/search.py
+Full-text search untuk BERITA (judul dan isi_BERITA)
+
+- SQLite  : virtual table FTS5 (external content) yang disinkronkan lewat trigger
+- Postgres: kolom tsvector GENERATED + GIN index
+- Engine lain / FTS5 tidak tersedia: fallback ke SearchFilter biasa (LIKE)
+
+Karena sinkronisasi dilakukan di level database (trigger/generated column),
+semua jenis write ikut terindeks: save(), bulk_create(), queryset.update(), dll.
+Trigger FTS5 yang hilang karena migration me-remake tabel BERITA dipasang
+ulang oleh hook post_migrate (signals.pastikan_indeks_pencarian).
+
+Kedua engine memakai aturan query yang sama (token_pencarian): setiap term
+adalah phrase dengan prefix match di token terakhir, antar term AND.
+"""
+
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import BooleanField, F, FloatField, Func, Lookup, Value
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .models import BERITA, BERITAFts
+
+FTS_TABLE = BERITAFts._meta.db_table
+FTS_TRIGGERS = ('berita_fts_ai', 'berita_fts_ad', 'berita_fts_au')
+PG_COLUMN = 'search_vector'
+PG_INDEX = 'berita_search_vector_idx'
+PG_CONFIG = 'simple'
+
+# Bobot bm25 per kolom FTS5: judul lebih penting dari isi
+BOBOT_JUDUL = 10.0
+BOBOT_ISI = 1.0
+
+# Karakter token tokenizer FTS5 unicode61 (huruf dan angka); selain itu pemisah
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def _sqlite_fts5_tersedia(connection):
+    """Cek apakah SQLite yang dipakai dikompilasi dengan FTS5"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.cek_fts5 USING fts5(x)")
+            cursor.execute("DROP TABLE temp.cek_fts5")
+            return True
+        except DatabaseError:
+            return False
+
+
+# Cache hasil deteksi per alias database (cukup dicek sekali per proses)
+_vendor_cache = {}
+
+
+def vendor_didukung(using='default'):
+    """Return 'sqlite' / 'postgresql' jika full-text search aktif, selain itu None"""
+    if using not in _vendor_cache:
+        connection = connections[using]
+        vendor = None
+        if connection.vendor == 'postgresql':
+            vendor = 'postgresql'
+        elif connection.vendor == 'sqlite' and _sqlite_fts5_tersedia(connection):
+            vendor = 'sqlite'
+        _vendor_cache[using] = vendor
+    return _vendor_cache[using]
+
+
+def _fts_terpasang(connection):
+    """Cek apakah tabel FTS dan semua trigger-nya sudah ada (SQLite)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s)"
+            % ', '.join(['%s'] * (len(FTS_TRIGGERS) + 1)),
+            [FTS_TABLE, *FTS_TRIGGERS]
+        )
+        return len(cursor.fetchall()) == len(FTS_TRIGGERS) + 1
+
+
+def pasang_indeks(using='default'):
+    """
+    Buat struktur full-text search jika belum ada (idempotent)
+    Return True jika ada struktur yang baru dibuat (indeks perlu di-rebuild)
+    """
+    vendor = vendor_didukung(using)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    tabel = qn(BERITA._meta.db_table)
+
+    if vendor == 'sqlite':
+        if _fts_terpasang(connection):
+            return False
+        fts = qn(FTS_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"judul, isi_BERITA, content={tabel}, content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS berita_fts_ai AFTER INSERT ON {tabel} BEGIN "
+                f"INSERT INTO {fts}(rowid, judul, isi_BERITA) "
+                f"VALUES (new.id, new.judul, new.isi_BERITA); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS berita_fts_ad AFTER DELETE ON {tabel} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, judul, isi_BERITA) "
+                f"VALUES ('delete', old.id, old.judul, old.isi_BERITA); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS berita_fts_au "
+                f"AFTER UPDATE OF judul, isi_BERITA ON {tabel} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, judul, isi_BERITA) "
+                f"VALUES ('delete', old.id, old.judul, old.isi_BERITA); "
+                f"INSERT INTO {fts}(rowid, judul, isi_BERITA) "
+                f"VALUES (new.id, new.judul, new.isi_BERITA); END"
+            )
+        return True
+
+    if vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {tabel} ADD COLUMN IF NOT EXISTS {qn(PG_COLUMN)} tsvector "
+                f"GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('{PG_CONFIG}', coalesce(judul, '')), 'A') || "
+                f"setweight(to_tsvector('{PG_CONFIG}', coalesce({qn('isi_BERITA')}, '')), 'B')"
+                f") STORED"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {qn(PG_INDEX)} "
+                f"ON {tabel} USING GIN ({qn(PG_COLUMN)})"
+            )
+        return False
+
+    return False
+
+
+def hapus_indeks(using='default'):
+    """Hapus struktur full-text search (dipakai saat migration di-rollback)"""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for trigger in FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {qn(trigger)}")
+            cursor.execute(f"DROP TABLE IF EXISTS {qn(FTS_TABLE)}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {qn(PG_INDEX)}")
+            cursor.execute(
+                f"ALTER TABLE {qn(BERITA._meta.db_table)} DROP COLUMN IF EXISTS {qn(PG_COLUMN)}"
+            )
+
+
+def rebuild_indeks(using='default'):
+    """
+    Bangun ulang isi indeks dari tabel BERITA
+    Return: nama vendor yang di-rebuild, atau None jika tidak didukung
+    """
+    vendor = vendor_didukung(using)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    pasang_indeks(using)
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            fts = qn(FTS_TABLE)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+        elif vendor == 'postgresql':
+            cursor.execute(f"REINDEX INDEX {qn(PG_INDEX)}")
+    return vendor
+
+
+class Match(Lookup):
+    """`kolom MATCH query` (FTS5), dipakai lewat BERITAFts.dokumen: fts__dokumen__match"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+BERITAFts._meta.get_field('dokumen').register_lookup(Match)
+
+
+def token_pencarian(terms):
+    """
+    Token setiap search term dengan aturan tokenizer unicode61
+    Term tanpa token (hanya tanda baca/sintaks query) dibuang
+    """
+    return [token for token in (TOKEN_RE.findall(term.lower()) for term in terms) if token]
+
+
+def query_fts5(terms):
+    """
+    Ubah search terms menjadi query FTS5 yang aman:
+    setiap term jadi phrase dengan prefix match, digabung dengan AND implisit
+    """
+    return ' '.join('"%s"*' % ' '.join(token) for token in token_pencarian(terms))
+
+
+def query_tsquery(terms):
+    """
+    Query to_tsquery yang setara dengan query_fts5: token satu term berurutan
+    (<->) dengan prefix match (:*) di token terakhir, antar term AND (&)
+    """
+    return ' & '.join('(%s:*)' % ' <-> '.join(token) for token in token_pencarian(terms))
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Filter backend ?search= berbasis full-text index dengan ranking relevansi
+
+    Tanpa parameter ?ordering=, hasil diurutkan dari yang paling relevan.
+    Jika database tidak mendukung, otomatis fallback ke SearchFilter (LIKE).
+    """
+    rank_alias = 'rank_pencarian'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = [term for term in self.get_search_terms(request) if term.strip()]
+        if not terms:
+            return queryset
+
+        vendor = vendor_didukung(queryset.db)
+        if vendor is not None and not token_pencarian(terms):
+            return queryset.none()
+        if vendor == 'sqlite':
+            queryset = self.cari_sqlite(queryset, terms)
+            urutan_rank = self.rank_alias  # bm25: makin kecil makin relevan
+        elif vendor == 'postgresql':
+            queryset = self.cari_postgresql(queryset, terms)
+            urutan_rank = '-' + self.rank_alias  # ts_rank: makin besar makin relevan
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        return queryset.order_by(urutan_rank, '-tanggal', '-id')
+
+    def cari_sqlite(self, queryset, terms):
+        # INNER JOIN ke tabel FTS5 lewat rowid; MATCH dan bm25 memakai kolom
+        # tersembunyi tabel tersebut sehingga SQLite memulai scan dari indeks FTS5
+        return queryset.filter(fts__dokumen__match=query_fts5(terms)).annotate(**{
+            self.rank_alias: Func(
+                F('fts__dokumen'), Value(BOBOT_JUDUL), Value(BOBOT_ISI),
+                function='bm25', output_field=FloatField(),
+            )
+        })
+
+    def cari_postgresql(self, queryset, terms):
+        tabel = queryset.model._meta.db_table
+        kolom = f'"{tabel}"."{PG_COLUMN}"'
+        query = f"to_tsquery('{PG_CONFIG}', %s)"
+        tsquery = query_tsquery(terms)
+        return queryset.filter(
+            RawSQL(f'{kolom} @@ {query}', (tsquery,), output_field=BooleanField())
+        ).annotate(**{
+            self.rank_alias: RawSQL(f'ts_rank({kolom}, {query})', (tsquery,), output_field=FloatField())
+        })
@@ -3,15 +3,136 @@ FITURBERITA/serializers.py
 Serializers untuk API BERITA dan Komentar
 """
 
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from django.urls import reverse
+from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
+from rest_framework.utils.urls import replace_query_param
+from . import metrics
+from .images import url_turunan
 from .models import BERITA, Komentar
+from .pagination import KeysetPagination, get_komentar_config
+
+
+class GambarTurunanField(serializers.ReadOnlyField):
+    """
+    Menampilkan URL gambar turunan (thumbnail, card, full) dalam WebP dan JPEG
+    null jika BERITA tidak punya gambar atau turunannya belum dibuat
+    """
+    def to_representation(self, value):
+        return url_turunan(value, self.context.get('request'))
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField yang memakai objek relasi yang sudah dimuat sekaligus
+    di context['objek_relasi'] = {Model: {pk: obj}} (dipakai endpoint bulk),
+    sehingga validasi ratusan item tidak menjalankan satu query per item
+    """
+    def to_internal_value(self, data):
+        terpilih = self.context.get('objek_relasi', {}).get(self.get_queryset().model)
+        if terpilih is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in terpilih:
+            self.fail('does_not_exist', pk_value=data)
+        return terpilih[pk]
+
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def fields_diminta(context):
+    """Set nama field dari GET ?fields=a,b, None jika response tidak dibatasi"""
+    request = context.get('request')
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    nilai = getattr(request, 'query_params', request.GET).get(FIELDS_QUERY_PARAM)
+    if not nilai:
+        return None
+    return {nama.strip() for nama in nilai.split(',') if nama.strip()}
+
+
+def kolom_diminta(serializer_class, context, wajib=()):
+    """
+    Kolom model yang dibutuhkan ?fields= untuk .only(), None jika tidak ada
+    ?fields= atau ada field yang tidak bisa dipetakan ke kolom
+    Field non-kolom bisa dipetakan lewat Meta.kolom_field = {nama: (kolom, ...)}
+    """
+    if fields_diminta(context) is None:
+        return None
+    serializer = serializer_class(context=context)
+    model = serializer.Meta.model
+    kolom_field = getattr(serializer.Meta, 'kolom_field', {})
+    kolom = {model._meta.pk.name, *wajib}
+    for nama, field in serializer.fields.items():
+        if nama in kolom_field:
+            kolom.update(kolom_field[nama])
+            continue
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        kolom.add(model_field.name)
+    return sorted(kolom)
+
+
+def perlu_komentar_terbaru(context):
+    """Nested komentar hanya dimuat jika ikut diminta lewat ?fields="""
+    diminta = fields_diminta(context)
+    return diminta is None or bool(diminta & {'komentar', 'komentar_berikutnya'})
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldset: GET ?fields=id,judul hanya mengembalikan field yang diminta
+    (berlaku di serializer teratas, bukan nested). Nama yang tidak dikenal
+    dijawab 400. View membatasi kolom yang di-query dengan kolom_diminta()
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        diminta = fields_diminta(self.context)
+        if diminta is None:
+            return
+        tidak_dikenal = diminta - set(self.fields)
+        if tidak_dikenal:
+            raise serializers.ValidationError({
+                FIELDS_QUERY_PARAM: [f'Field tidak dikenal: {", ".join(sorted(tidak_dikenal))}']
+            })
+        for nama in list(self.fields):
+            if nama not in diminta:
+                self.fields.pop(nama)
+
+
+class SerializerTerukurMixin:
+    """
+    Catat waktu serialisasi ke instrumentasi request (FITURBERITA/metrics.py);
+    serializer bersarang tidak dihitung dua kali
+    """
+    def to_representation(self, instance):
+        with metrics.ukur('serializer'):
+            return super().to_representation(instance)
 
 
-class KomentarSerializer(serializers.ModelSerializer):
+class KomentarSerializer(SparseFieldsMixin, SerializerTerukurMixin, serializers.ModelSerializer):
     """
     Serializer untuk model Komentar
     Digunakan untuk membuat, update, dan menampilkan komentar
     """
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+    
     class Meta:
         model = Komentar
         fields = ['id', 'nama', 'tanggal', 'isi_komentar', 'BERITA']
@@ -24,14 +145,58 @@ class KomentarSerializer(serializers.ModelSerializer):
         return value
 
 
-class BERITASerializer(serializers.ModelSerializer):
+def komentar_terbaru_queryset(objs, queryset=None):
+    """
+    Satu query berisi N komentar terbaru untuk setiap BERITA di objs
+    Setiap BERITA punya subquery LIMIT sendiri (pk IN (... LIMIT N) OR ...)
+    yang membaca N baris pertama index komentar_berita_tanggal_idx, sehingga
+    biayanya tidak bergantung pada jumlah komentar BERITA tersebut
+    (Prefetch terpotong memakai window function yang menomori semua komentar)
+    """
+    if queryset is None:
+        queryset = Komentar.objects.order_by('-tanggal', '-id')
+    if not objs:
+        return queryset.none()
+    embed = get_komentar_config()['EMBED']
+    kondisi = Q()
+    for obj in objs:
+        kondisi |= Q(pk__in=queryset.filter(BERITA_id=obj.pk).values('pk')[:embed])
+    return queryset.filter(kondisi)
+
+
+def pasang_komentar_terbaru(objs, komentar):
+    """Bagi hasil komentar_terbaru_queryset ke atribut komentar_terbaru setiap BERITA"""
+    per_BERITA = defaultdict(list)
+    for item in komentar:
+        per_BERITA[item.BERITA_id].append(item)
+    for obj in objs:
+        obj.komentar_terbaru = per_BERITA.get(obj.pk, [])
+    return objs
+
+
+def muat_komentar_terbaru(objs, queryset=None):
+    """Muat nested komentar untuk BERITASerializer(many=True) dengan satu query"""
+    objs = list(objs)
+    return pasang_komentar_terbaru(objs, komentar_terbaru_queryset(objs, queryset))
+
+
+async def amuat_komentar_terbaru(objs, queryset=None):
+    """Versi async muat_komentar_terbaru"""
+    objs = list(objs)
+    komentar = [item async for item in komentar_terbaru_queryset(objs, queryset)]
+    return pasang_komentar_terbaru(objs, komentar)
+
+
+class BERITASerializer(SparseFieldsMixin, SerializerTerukurMixin, serializers.ModelSerializer):
     """
     Serializer lengkap untuk model BERITA
-    Include nested komentar dan jumlah komentar
+    Include N komentar terbaru dan jumlah komentar; komentar selanjutnya
+    diambil lewat link komentar_berikutnya (action komentar dengan cursor)
     Digunakan untuk detail view
     """
-    komentar = KomentarSerializer(many=True, read_only=True)
-    jumlah_komentar = serializers.SerializerMethodField()
+    komentar = serializers.SerializerMethodField()
+    komentar_berikutnya = serializers.SerializerMethodField()
+    gambar_turunan = GambarTurunanField()
     
     class Meta:
         model = BERITA
@@ -40,15 +205,42 @@ class BERITASerializer(serializers.ModelSerializer):
             'judul', 
             'tanggal', 
             'isi_BERITA', 
+            'ringkasan', 
             'gambar', 
+            'gambar_turunan', 
             'komentar', 
+            'komentar_berikutnya', 
             'jumlah_komentar'
         ]
-        read_only_fields = ['tanggal']
+        read_only_fields = ['tanggal', 'ringkasan', 'jumlah_komentar']
+        # Kolom BERITA yang dibaca field non-kolom (untuk ?fields=, lihat kolom_diminta)
+        kolom_field = {'komentar': (), 'komentar_berikutnya': ('jumlah_komentar',)}
+    
+    def _komentar_terbaru(self, obj):
+        """Pakai hasil muat_komentar_terbaru jika ada, jika tidak query terbatas (sekali)"""
+        if not hasattr(obj, 'komentar_terbaru'):
+            obj.komentar_terbaru = list(
+                obj.komentar.order_by('-tanggal', '-id')[:get_komentar_config()['EMBED']]
+            )
+        return obj.komentar_terbaru
+    
+    @swagger_serializer_method(serializer_or_field=KomentarSerializer(many=True))
+    def get_komentar(self, obj):
+        return KomentarSerializer(self._komentar_terbaru(obj), many=True).data
     
-    def get_jumlah_komentar(self, obj):
-        """Method untuk menghitung jumlah komentar"""
-        return obj.komentar.count()
+    @swagger_serializer_method(serializer_or_field=serializers.URLField())
+    def get_komentar_berikutnya(self, obj):
+        """URL halaman komentar setelah komentar terakhir yang ditampilkan, atau null"""
+        komentar = self._komentar_terbaru(obj)
+        if not komentar or obj.jumlah_komentar <= len(komentar):
+            return None
+        url = reverse('FITURBERITA:BERITA-komentar', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return replace_query_param(
+            url, KeysetPagination.cursor_query_param, KeysetPagination.token_cursor(komentar[-1])
+        )
     
     def validate_judul(self, value):
         """Validasi agar judul tidak kosong"""
@@ -63,13 +255,13 @@ class BERITASerializer(serializers.ModelSerializer):
         return value
 
 
-class BERITAListSerializer(serializers.ModelSerializer):
+class BERITAListSerializer(SparseFieldsMixin, SerializerTerukurMixin, serializers.ModelSerializer):
     """
     Serializer ringkas untuk model BERITA
     Tanpa nested komentar untuk performa lebih baik di list view
+    jumlah_komentar dibaca dari counter tersimpan (tanpa query COUNT per baris)
     """
-    jumlah_komentar = serializers.SerializerMethodField()
-    
+    gambar_turunan = GambarTurunanField()
     class Meta:
         model = BERITA
         fields = [
@@ -77,22 +269,21 @@ class BERITAListSerializer(serializers.ModelSerializer):
             'judul', 
             'tanggal', 
             'isi_BERITA', 
+            'ringkasan', 
             'gambar', 
+            'gambar_turunan', 
             'jumlah_komentar'
         ]
-        read_only_fields = ['tanggal']
-    
-    def get_jumlah_komentar(self, obj):
-        """Method untuk menghitung jumlah komentar"""
-        return obj.komentar.count()
+        read_only_fields = ['tanggal', 'ringkasan', 'jumlah_komentar']
 
 
-class KomentarCreateSerializer(serializers.ModelSerializer):
+class KomentarCreateSerializer(SerializerTerukurMixin, serializers.ModelSerializer):
     """
     Serializer khusus untuk membuat komentar baru
     dengan informasi BERITA yang lebih lengkap
     """
     BERITA_judul = serializers.CharField(source='BERITA.judul', read_only=True)
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
     
     class Meta:
         model = Komentar
@@ -0,0 +1,157 @@
+"""
+FITURBERITA/signals.py
+Signal handlers untuk menjaga data turunan (denormalisasi) tetap sinkron
+"""
+
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import broadcast
+from . import cache as response_cache
+from . import search
+from . import taskqueue
+from .models import BERITA, Komentar
+
+
+def _ubah_jumlah_komentar(BERITA_id, selisih, using):
+    """Ubah counter satu BERITA (lihat BERITA.ubah_jumlah_komentar)"""
+    BERITA.ubah_jumlah_komentar({BERITA_id: selisih}, using=using)
+
+
+def _sinkronkan_instance(komentar, selisih):
+    """Ikut update objek BERITA yang sudah ter-cache di komentar (tanpa query)"""
+    if Komentar.BERITA.is_cached(komentar):
+        BERITA_obj = komentar.BERITA
+        if BERITA_obj is not None and BERITA_obj.pk == komentar.BERITA_id:
+            BERITA_obj.jumlah_komentar = max(BERITA_obj.jumlah_komentar + selisih, 0)
+
+
+def _cascade_hapus_BERITA(origin, komentar):
+    """
+    Cek apakah komentar terhapus karena BERITA-nya ikut dihapus: origin adalah
+    instance BERITA (obj.delete()) atau queryset BERITA (queryset.delete(), bulk
+    delete di admin)
+    """
+    if isinstance(origin, BERITA):
+        return origin.pk == komentar.BERITA_id
+    return isinstance(origin, QuerySet) and issubclass(origin.model, BERITA)
+
+
+@receiver(post_save, sender=Komentar)
+def komentar_disimpan(sender, instance, created, using, update_fields=None, raw=False, **kwargs):
+    """
+    Update counter saat komentar dibuat atau dipindah ke BERITA lain,
+    dan waktu diperbarui BERITA saat komentarnya diedit
+    """
+    if raw:  # loaddata: counter dibangun ulang lewat management command
+        return
+    if created:
+        _ubah_jumlah_komentar(instance.BERITA_id, 1, using)
+        _sinkronkan_instance(instance, 1)
+        return
+    BERITA_id_awal = getattr(instance, '_BERITA_id_awal', None)
+    dipindah = (
+        (update_fields is None or not update_fields.isdisjoint({'BERITA', 'BERITA_id'}))
+        and BERITA_id_awal is not None
+        and BERITA_id_awal != instance.BERITA_id
+    )
+    if dipindah:
+        _ubah_jumlah_komentar(BERITA_id_awal, -1, using)
+        _ubah_jumlah_komentar(instance.BERITA_id, 1, using)
+        _sinkronkan_instance(instance, 1)
+    else:
+        # Isi komentar berubah: counter tetap, tapi detail BERITA ikut berubah
+        _ubah_jumlah_komentar(instance.BERITA_id, 0, using)
+
+
+@receiver(post_delete, sender=Komentar)
+def komentar_dihapus(sender, instance, using, origin=None, **kwargs):
+    """
+    Kurangi counter saat komentar dihapus
+    Jika yang dihapus adalah BERITA-nya sendiri (cascade), counter tidak perlu diubah
+    """
+    if _cascade_hapus_BERITA(origin, instance):
+        return
+    _ubah_jumlah_komentar(instance.BERITA_id, -1, using)
+    _sinkronkan_instance(instance, -1)
+
+
+def sinkronkan_komentar_massal(objs):
+    """
+    bulk_create komentar tidak mengirim signal: update counter, invalidasi cache
+    dan siarkan ke stream SSE sekali per batch (bulk endpoint, buffer komentar)
+    """
+    selisih = {}
+    for obj in objs:
+        selisih[obj.BERITA_id] = selisih.get(obj.BERITA_id, 0) + 1
+    BERITA.ubah_jumlah_komentar(selisih)
+    response_cache.invalidasi(
+        scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+        detail_ids=list(selisih)
+    )
+    transaction.on_commit(lambda: broadcast.siarkan_komentar(objs))
+
+
+@receiver(post_save, sender=Komentar)
+def siarkan_komentar_baru(sender, instance, created, using, raw=False, **kwargs):
+    """Kirim komentar baru ke stream SSE setelah transaksi commit"""
+    if created and not raw:
+        transaction.on_commit(lambda: broadcast.siarkan_komentar([instance]), using=using)
+
+
+@receiver(post_save, sender=BERITA)
+def proses_gambar_baru(sender, instance, raw=False, **kwargs):
+    """
+    Antrikan pembuatan gambar turunan saat gambar BERITA baru di-upload atau diganti
+    (diproses worker di luar request, lihat FITURBERITA/tasks.py)
+    """
+    if raw or not instance.gambar_berubah():
+        return
+    taskqueue.antrikan('gambar.proses_turunan', instance.pk)
+
+
+@receiver(post_save, sender=BERITA)
+@receiver(post_delete, sender=BERITA)
+def invalidasi_cache_BERITA(sender, instance, **kwargs):
+    """Perubahan BERITA memengaruhi list, terbaru dan detail BERITA tersebut"""
+    response_cache.invalidasi(
+        scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+        detail_ids=(instance.pk,)
+    )
+
+
+@receiver(post_save, sender=Komentar)
+@receiver(post_delete, sender=Komentar)
+def invalidasi_cache_komentar(sender, instance, created=False, origin=None, **kwargs):
+    """
+    Perubahan komentar memengaruhi detail BERITA-nya dan terbaru (nested komentar);
+    list ikut terdampak hanya jika jumlah_komentar berubah (create/delete/pindah)
+    """
+    if _cascade_hapus_BERITA(origin, instance):
+        return  # Cascade dari hapus BERITA, sudah ditangani invalidasi_cache_BERITA
+    BERITA_id_awal = getattr(instance, '_BERITA_id_awal', None)
+    jumlah_berubah = (
+        created
+        or kwargs.get('signal') is post_delete
+        or (BERITA_id_awal is not None and BERITA_id_awal != instance.BERITA_id)
+    )
+    scopes = [response_cache.SCOPE_TERBARU]
+    if jumlah_berubah:
+        scopes.append(response_cache.SCOPE_LIST)
+    response_cache.invalidasi(scopes=scopes, detail_ids=(instance.BERITA_id, BERITA_id_awal))
+
+
+def pastikan_indeks_pencarian(sender, using, plan=None, **kwargs):
+    """
+    Pastikan struktur full-text search masih lengkap setelah migrate
+    (di SQLite, migration yang me-remake tabel BERITA ikut menghapus trigger FTS).
+    Satu-satunya tempat pemasangan ulang: migration baru tidak perlu RunPython sendiri
+    """
+    if not plan or search.vendor_didukung(using) != 'sqlite':
+        return
+    if search.FTS_TABLE not in connections[using].introspection.table_names():
+        return  # Migration full-text search belum diterapkan / di-rollback
+    if search.pasang_indeks(using):
+        search.rebuild_indeks(using)
@@ -0,0 +1,201 @@
+"""
+FITURBERITA/taskqueue.py
+Task queue ringan berbasis database (cukup dengan SQLite)
+
+- antrikan()        : simpan tugas ke tabel Tugas (ikut transaksi yang sedang berjalan)
+- jalankan_antrian(): ambil dan jalankan tugas yang sudah jatuh tempo
+- Worker            : python manage.py jalankan_worker
+
+Pengambilan tugas memakai UPDATE bersyarat (status = antri) sehingga aman
+dijalankan oleh beberapa worker sekaligus tanpa SELECT ... FOR UPDATE.
+Tugas yang gagal dicoba ulang dengan exponential backoff.
+
+Konfigurasi di settings.BERITA_TASKS:
+    EAGER          : jalankan tugas langsung di proses yang meng-antrikan (dev/test)
+    MAX_RETRIES    : maksimal percobaan per tugas
+    BACKOFF_BASE   : delay retry = BACKOFF_BASE ** percobaan (detik)
+    BACKOFF_MAX    : batas atas delay retry (detik)
+    TIMEOUT        : tugas 'berjalan' lebih lama dari ini dianggap worker-nya mati
+"""
+
+import logging
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tugas
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'EAGER': False,
+    'MAX_RETRIES': 5,
+    'BACKOFF_BASE': 2,
+    'BACKOFF_MAX': 600,
+    'TIMEOUT': 900,
+}
+
+# Registry nama tugas -> fungsi
+_registry = {}
+
+
+class TugasTidakDikenal(Exception):
+    """Nama tugas tidak terdaftar di registry"""
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_TASKS', {})}
+
+
+def tugas(nama):
+    """
+    Decorator untuk mendaftarkan fungsi sebagai tugas latar belakang
+
+    Contoh:
+        @tugas('gambar.proses_turunan')
+        def proses_turunan(BERITA_id): ...
+    """
+    def decorator(func):
+        _registry[nama] = func
+        return func
+    return decorator
+
+
+def antrikan(nama, *args, jadwal=None, maks_percobaan=None, **kwargs):
+    """
+    Masukkan tugas ke antrian dan return objek Tugas
+    Argumen harus bisa di-serialize ke JSON
+    """
+    if nama not in _registry:
+        raise TugasTidakDikenal(nama)
+    config = get_config()
+    obj = Tugas.objects.create(
+        nama=nama,
+        argumen={'args': list(args), 'kwargs': kwargs},
+        jadwal=jadwal or timezone.now(),
+        maks_percobaan=maks_percobaan or config['MAX_RETRIES'],
+    )
+    if config['EAGER']:
+        jalankan_tugas(obj)
+    return obj
+
+
+def _delay_retry(percobaan):
+    config = get_config()
+    return timedelta(seconds=min(config['BACKOFF_BASE'] ** percobaan, config['BACKOFF_MAX']))
+
+
+def klaim_tugas(obj):
+    """Tandai tugas sebagai berjalan; return False jika sudah diambil worker lain"""
+    sekarang = timezone.now()
+    diklaim = Tugas.objects.filter(pk=obj.pk, status=Tugas.ANTRI).update(
+        status=Tugas.BERJALAN,
+        mulai=sekarang,
+        percobaan=F('percobaan') + 1,
+    )
+    if diklaim:
+        obj.status = Tugas.BERJALAN
+        obj.mulai = sekarang
+        obj.percobaan += 1
+    return bool(diklaim)
+
+
+def jalankan_tugas(obj):
+    """
+    Jalankan satu tugas yang sudah di-antrikan
+    Return True jika berhasil, False jika gagal, None jika sudah diambil worker lain
+    """
+    if not klaim_tugas(obj):
+        return None
+
+    try:
+        func = _registry.get(obj.nama)
+        if func is None:
+            raise TugasTidakDikenal(obj.nama)
+        # Tugas tidak dibungkus transaksi: dengan SQLite transaction_mode IMMEDIATE
+        # atomic() langsung memegang write lock selama tugas berjalan (mis. resize
+        # gambar). Di dalam transaksi pemanggil (mode EAGER) dipakai savepoint agar
+        # error database di tugas tidak merusak pencatatan status
+        if transaction.get_connection().in_atomic_block:
+            pembungkus = transaction.atomic()
+        else:
+            pembungkus = nullcontext()
+        with pembungkus:
+            func(*obj.argumen.get('args', []), **obj.argumen.get('kwargs', {}))
+    except Exception as exc:  # noqa: BLE001 - semua error tugas dicatat dan di-retry
+        error = ''.join(traceback.format_exception(exc))
+        if obj.percobaan < obj.maks_percobaan and not isinstance(exc, TugasTidakDikenal):
+            obj.status = Tugas.ANTRI
+            obj.jadwal = timezone.now() + _delay_retry(obj.percobaan)
+            logger.warning('Tugas %s gagal (percobaan %s), dicoba lagi %s: %s',
+                           obj, obj.percobaan, obj.jadwal, exc)
+        else:
+            obj.status = Tugas.GAGAL
+            obj.selesai = timezone.now()
+            logger.error('Tugas %s gagal permanen setelah %s percobaan: %s',
+                         obj, obj.percobaan, exc)
+        obj.error = error
+        with transaction.atomic():
+            obj.save(update_fields=['status', 'jadwal', 'selesai', 'error'])
+        return False
+
+    obj.status = Tugas.SELESAI
+    obj.selesai = timezone.now()
+    obj.error = ''
+    with transaction.atomic():
+        obj.save(update_fields=['status', 'selesai', 'error'])
+    return True
+
+
+def pulihkan_tugas_macet():
+    """
+    Kembalikan tugas 'berjalan' yang melewati TIMEOUT (worker mati) ke antrian
+    Tugas yang percobaannya sudah habis ditandai gagal: tugas yang mematikan
+    worker (OOM, gambar bom dekompresi) tidak diklaim ulang selamanya
+    Return: jumlah tugas yang dikembalikan ke antrian
+    """
+    sekarang = timezone.now()
+    macet = Tugas.objects.filter(
+        status=Tugas.BERJALAN, mulai__lt=sekarang - timedelta(seconds=get_config()['TIMEOUT'])
+    )
+    gagal = macet.filter(percobaan__gte=F('maks_percobaan')).update(
+        status=Tugas.GAGAL,
+        selesai=sekarang,
+        error='Worker berhenti saat menjalankan tugas (timeout) dan percobaan sudah habis',
+    )
+    if gagal:
+        logger.error('%s tugas macet gagal permanen: percobaan sudah habis', gagal)
+    return macet.update(status=Tugas.ANTRI, jadwal=sekarang)
+
+
+def jalankan_antrian(batas=10):
+    """
+    Ambil hingga `batas` tugas yang jatuh tempo lalu jalankan berurutan
+    Return: (jumlah berhasil, jumlah gagal)
+    """
+    daftar = list(
+        Tugas.objects
+        .filter(status=Tugas.ANTRI, jadwal__lte=timezone.now())
+        .order_by('jadwal', 'id')[:batas]
+    )
+    berhasil = gagal = 0
+    for obj in daftar:
+        hasil = jalankan_tugas(obj)
+        if hasil is True:
+            berhasil += 1
+        elif hasil is False:
+            gagal += 1
+    return berhasil, gagal
+
+
+def bersihkan_tugas_selesai(hari=7):
+    """Hapus riwayat tugas yang sudah selesai lebih dari `hari` hari"""
+    batas = timezone.now() - timedelta(days=hari)
+    jumlah, _ = Tugas.objects.filter(status=Tugas.SELESAI, selesai__lt=batas).delete()
+    return jumlah
@@ -0,0 +1,13 @@
+"""
+FITURBERITA/tasks.py
+Daftar tugas latar belakang yang dijalankan oleh worker (lihat taskqueue.py)
+"""
+
+from .images import proses_gambar_BERITA
+from .taskqueue import tugas
+
+
+@tugas('gambar.proses_turunan')
+def proses_turunan_gambar(BERITA_id):
+    """Buat gambar turunan untuk BERITA setelah upload"""
+    proses_gambar_BERITA(BERITA_id)
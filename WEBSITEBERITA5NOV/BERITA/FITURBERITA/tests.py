@@ -3,7 +3,7 @@ FITURBERITA/tests.py
 Unit tests untuk aplikasi FITURBERITA
 """
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -195,4 +195,2367 @@ class KomentarAPITest(APITestCase):
             reverse('BERITA-komentar', kwargs={'pk': self.BERITA.pk})
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['jumlah_komentar'], 1)
\ No newline at end of file
+        self.assertEqual(response.data['jumlah_komentar'], 1)
+
+class JumlahKomentarCounterTest(TestCase):
+    """Test case untuk counter jumlah_komentar yang disimpan di BERITA"""
+    
+    def setUp(self):
+        """Setup test data"""
+        self.BERITA = BERITA.objects.create(judul="BERITA A", isi_BERITA="Isi A")
+        self.BERITA_lain = BERITA.objects.create(judul="BERITA B", isi_BERITA="Isi B")
+    
+    def buat_komentar(self, BERITA_obj, nama="User"):
+        return Komentar.objects.create(
+            nama=nama,
+            isi_komentar="Komentar",
+            BERITA=BERITA_obj
+        )
+    
+    def test_counter_bertambah_dan_berkurang(self):
+        """Counter naik saat create dan turun saat delete"""
+        komentar = self.buat_komentar(self.BERITA)
+        self.buat_komentar(self.BERITA)
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 2)
+        
+        komentar.delete()
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.get_jumlah_komentar(), 1)
+        
+        Komentar.objects.filter(BERITA=self.BERITA).delete()
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 0)
+    
+    def test_counter_saat_komentar_dipindah(self):
+        """Counter kedua BERITA ikut berubah saat komentar dipindah"""
+        self.buat_komentar(self.BERITA)
+        komentar = Komentar.objects.get()
+        komentar.BERITA = self.BERITA_lain
+        komentar.save()
+        komentar.save()  # Simpan ulang tidak boleh mengubah counter lagi
+        
+        self.BERITA.refresh_from_db()
+        self.BERITA_lain.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 0)
+        self.assertEqual(self.BERITA_lain.jumlah_komentar, 1)
+    
+    def test_hapus_BERITA_cascade(self):
+        """Hapus BERITA ikut menghapus komentar tanpa error"""
+        self.buat_komentar(self.BERITA)
+        self.BERITA.delete()
+        self.assertEqual(Komentar.objects.count(), 0)
+    
+    def test_hapus_queryset_BERITA_tanpa_update_counter(self):
+        """Cascade dari queryset.delete() BERITA tidak mengubah counter per komentar"""
+        from unittest import mock
+        from FITURBERITA import cache as response_cache
+        
+        self.buat_komentar(self.BERITA)
+        self.buat_komentar(self.BERITA)
+        with mock.patch.object(BERITA, 'ubah_jumlah_komentar') as ubah, \
+                mock.patch.object(response_cache, 'invalidasi') as invalidasi:
+            BERITA.objects.filter(pk=self.BERITA.pk).delete()
+        ubah.assert_not_called()
+        # Hanya invalidasi_cache_BERITA, tidak sekali per komentar
+        self.assertEqual(invalidasi.call_count, 1)
+        self.assertEqual(Komentar.objects.count(), 0)
+    
+    def test_counter_saat_dipindah_dengan_update_fields_BERITA_id(self):
+        """save(update_fields=['BERITA_id']) juga memindah counter"""
+        komentar = self.buat_komentar(self.BERITA)
+        komentar = Komentar.objects.get(pk=komentar.pk)
+        komentar.BERITA_id = self.BERITA_lain.pk
+        komentar.save(update_fields=['BERITA_id'])
+        
+        self.BERITA.refresh_from_db()
+        self.BERITA_lain.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 0)
+        self.assertEqual(self.BERITA_lain.jumlah_komentar, 1)
+    
+    def test_command_hitung_ulang(self):
+        """Management command membangun ulang counter yang tidak sinkron"""
+        from django.core.management import call_command
+        from io import StringIO
+        
+        self.buat_komentar(self.BERITA)
+        self.buat_komentar(self.BERITA)
+        BERITA.objects.update(jumlah_komentar=99)
+        
+        call_command('hitung_ulang_komentar', stdout=StringIO())
+        self.BERITA.refresh_from_db()
+        self.BERITA_lain.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 2)
+        self.assertEqual(self.BERITA_lain.jumlah_komentar, 0)
+    
+    def test_command_hitung_ulang_invalidasi_cache(self):
+        """Response list dan detail yang sudah di-cache ikut memakai counter hasil hitung ulang"""
+        from django.core.cache import cache
+        from django.core.management import call_command
+        from io import StringIO
+        
+        cache.clear()
+        self.buat_komentar(self.BERITA)
+        BERITA.objects.update(jumlah_komentar=99)
+        urls = (
+            reverse('FITURBERITA:BERITA-list'),
+            reverse('FITURBERITA:BERITA-detail', kwargs={'pk': self.BERITA.pk}),
+        )
+        for url in urls:
+            self.client.get(url, HTTP_ACCEPT='application/json')
+        
+        for argumen in ((), ('--id', str(self.BERITA.pk))):
+            BERITA.objects.update(jumlah_komentar=99)
+            call_command('hitung_ulang_komentar', *argumen, stdout=StringIO())
+            for url in urls:
+                with self.subTest(url=url, argumen=argumen):
+                    response = self.client.get(url, HTTP_ACCEPT='application/json')
+                    self.assertEqual(response['X-Cache'], 'MISS')
+                    data = response.json()
+                    if 'results' in data:
+                        data = next(item for item in data['results'] if item['id'] == self.BERITA.pk)
+                    self.assertEqual(data['jumlah_komentar'], 1)
+    
+    def test_list_tanpa_query_count_per_baris(self):
+        """List BERITA tidak menjalankan COUNT komentar per baris"""
+        for i in range(5):
+            self.buat_komentar(self.BERITA, nama=f"User {i}")
+        url = reverse('FITURBERITA:BERITA-list')
+        
+        with self.assertNumQueries(3):  # Validator ETag + COUNT pagination + SELECT halaman
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        jumlah = {item['id']: item['jumlah_komentar'] for item in response.data['results']}
+        self.assertEqual(jumlah[self.BERITA.pk], 5)
+        self.assertEqual(jumlah[self.BERITA_lain.pk], 0)
+
+
+class QueryCountTest(APITestCase):
+    """
+    Test case untuk memastikan jumlah query tiap endpoint konstan
+    berapapun banyaknya data (bebas N+1)
+    """
+    
+    def seed(self, jumlah_BERITA, komentar_per_BERITA):
+        """Buat data BERITA beserta komentarnya"""
+        daftar = [
+            BERITA.objects.create(judul=f"BERITA {i}", isi_BERITA=f"Isi {i}")
+            for i in range(jumlah_BERITA)
+        ]
+        for BERITA_obj in daftar:
+            for j in range(komentar_per_BERITA):
+                Komentar.objects.create(
+                    nama=f"User {j}",
+                    isi_komentar=f"Komentar {j}",
+                    BERITA=BERITA_obj
+                )
+        return daftar
+    
+    def assertQueriesKonstan(self, jumlah_query, buat_url):
+        """Jalankan GET pada beberapa ukuran fixture dengan jumlah query yang sama"""
+        for jumlah_BERITA, komentar_per_BERITA in [(1, 1), (3, 4), (6, 8)]:
+            Komentar.objects.all().delete()
+            BERITA.objects.all().delete()
+            daftar = self.seed(jumlah_BERITA, komentar_per_BERITA)
+            url = buat_url(daftar[0])
+            with self.subTest(jumlah_BERITA=jumlah_BERITA, url=url):
+                with self.assertNumQueries(jumlah_query):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_BERITA(self):
+        """List: validator ETag + COUNT pagination + SELECT halaman"""
+        self.assertQueriesKonstan(3, lambda b: reverse('FITURBERITA:BERITA-list'))
+    
+    def test_detail_BERITA(self):
+        """Detail: validator ETag + SELECT BERITA + satu query komentar (LIMIT per BERITA)"""
+        self.assertQueriesKonstan(
+            3, lambda b: reverse('FITURBERITA:BERITA-detail', kwargs={'pk': b.pk})
+        )
+    
+    def test_terbaru_BERITA(self):
+        """Terbaru: validator ETag + SELECT 5 BERITA + satu query komentar (LIMIT per BERITA)"""
+        self.assertQueriesKonstan(3, lambda b: reverse('FITURBERITA:BERITA-terbaru'))
+    
+    def test_komentar_action(self):
+        """Action komentar: validator ETag + SELECT BERITA + SELECT komentar"""
+        self.assertQueriesKonstan(
+            3, lambda b: reverse('FITURBERITA:BERITA-komentar', kwargs={'pk': b.pk})
+        )
+    
+    def test_list_komentar(self):
+        """List komentar: COUNT pagination + SELECT halaman"""
+        self.assertQueriesKonstan(2, lambda b: reverse('FITURBERITA:komentar-list'))
+    
+    def test_detail_komentar(self):
+        """Detail komentar: satu SELECT dengan JOIN ke BERITA"""
+        self.assertQueriesKonstan(
+            1,
+            lambda b: reverse(
+                'FITURBERITA:komentar-detail',
+                kwargs={'pk': b.komentar.first().pk}
+            )
+        )
+    
+    def test_detail_komentar_terurut(self):
+        """Nested komentar di detail tetap urut dari yang terbaru"""
+        BERITA_obj = self.seed(1, 3)[0]
+        response = self.client.get(
+            reverse('FITURBERITA:BERITA-detail', kwargs={'pk': BERITA_obj.pk})
+        )
+        ids = [item['id'] for item in response.data['komentar']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+    
+    def test_create_komentar(self):
+        """Create komentar: response BERITA_judul tanpa lazy query tambahan"""
+        BERITA_obj = self.seed(1, 0)[0]
+        # SELECT BERITA (validasi FK) + INSERT + UPDATE counter (+ savepoint)
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                reverse('FITURBERITA:komentar-list'),
+                {'nama': 'A', 'isi_komentar': 'B', 'BERITA': BERITA_obj.pk},
+                format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['BERITA_judul'], BERITA_obj.judul)
+
+
+class KeysetPaginationTest(APITestCase):
+    """Test case untuk keyset (cursor) pagination opt-in"""
+    
+    def setUp(self):
+        """Buat 25 BERITA dengan tanggal sama sebagian (uji tie-breaker id)"""
+        from django.utils import timezone
+        self.sekarang = timezone.now()
+        for i in range(25):
+            BERITA.objects.create(judul=f"BERITA {i}", isi_BERITA=f"Isi {i}")
+        # Paksa beberapa baris punya tanggal identik
+        BERITA.objects.filter(judul__in=['BERITA 10', 'BERITA 11', 'BERITA 12']).update(
+            tanggal=self.sekarang
+        )
+        self.url = reverse('FITURBERITA:BERITA-list')
+    
+    def ambil_semua(self, url, params=None):
+        """Ikuti link next sampai habis, kumpulkan semua id"""
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids, response
+            response = self.client.get(response.data['next'])
+    
+    def test_default_tetap_page_number(self):
+        """Tanpa opt-in, response masih format PageNumberPagination"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 25)
+    
+    def test_semua_halaman_urut_tanpa_duplikat(self):
+        """Semua baris terambil sekali dengan urutan (-tanggal, -id)"""
+        ids, _ = self.ambil_semua(self.url, {'paginasi': 'cursor'})
+        expected = list(
+            BERITA.objects.order_by('-tanggal', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+    
+    def test_stabil_saat_ada_insert(self):
+        """BERITA baru yang masuk di tengah traversal tidak menggeser halaman"""
+        response = self.client.get(self.url, {'paginasi': 'cursor'})
+        halaman_pertama = [item['id'] for item in response.data['results']]
+        BERITA.objects.create(judul="BERITA baru", isi_BERITA="Isi baru")
+        ids, _ = self.ambil_semua(response.data['next'])
+        self.assertEqual(len(halaman_pertama) + len(ids), 25)
+        self.assertFalse(set(halaman_pertama) & set(ids))
+    
+    def test_previous_link(self):
+        """Link previous kembali ke halaman sebelumnya"""
+        pertama = self.client.get(self.url, {'paginasi': 'cursor'})
+        kedua = self.client.get(pertama.data['next'])
+        kembali = self.client.get(kedua.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in kembali.data['results']],
+            [item['id'] for item in pertama.data['results']]
+        )
+    
+    def test_tanpa_query_count(self):
+        """Mode keyset hanya menjalankan satu query SELECT"""
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'paginasi': 'cursor'})
+    
+    def test_cursor_tidak_valid(self):
+        """Cursor rusak menghasilkan 404"""
+        response = self.client.get(self.url, {'cursor': 'bukan-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_ordering_lain_ditolak(self):
+        """Mode cursor tidak diam-diam mengganti ?ordering= atau urutan relevansi dengan urutan tanggal"""
+        for params in (
+            {'paginasi': 'cursor', 'ordering': 'judul'},
+            {'paginasi': 'cursor', 'ordering': 'tanggal'},
+            {'paginasi': 'cursor', 'search': 'BERITA'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('paginasi', response.json())
+        for params in (
+            {'paginasi': 'cursor', 'ordering': '-tanggal'},
+            {'paginasi': 'cursor', 'search': 'BERITA', 'ordering': '-tanggal'},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_200_OK)
+    
+    def test_komentar_keyset(self):
+        """Keyset pagination juga tersedia di list komentar"""
+        BERITA_obj = BERITA.objects.first()
+        for i in range(12):
+            Komentar.objects.create(nama=f"U{i}", isi_komentar="K", BERITA=BERITA_obj)
+        ids, _ = self.ambil_semua(
+            reverse('FITURBERITA:komentar-list'),
+            {'paginasi': 'cursor', 'BERITA': BERITA_obj.pk}
+        )
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(len(set(ids)), 12)
+
+
+class FullTextSearchTest(APITestCase):
+    """Test case untuk full-text search BERITA"""
+    
+    def setUp(self):
+        """Setup data BERITA dengan relevansi berbeda"""
+        self.url = reverse('FITURBERITA:BERITA-list')
+        self.di_isi = BERITA.objects.create(
+            judul="Kabar kota", isi_BERITA="Banjir melanda beberapa wilayah kota"
+        )
+        self.di_judul = BERITA.objects.create(
+            judul="Banjir besar di Jakarta", isi_BERITA="Hujan deras sejak pagi"
+        )
+        BERITA.objects.create(judul="Olahraga", isi_BERITA="Tim lokal menang")
+    
+    def cari(self, term, **params):
+        response = self.client.get(self.url, {'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+    
+    def test_hasil_diurutkan_berdasarkan_relevansi(self):
+        """Match di judul lebih relevan dari match di isi"""
+        self.assertEqual(self.cari('banjir'), [self.di_judul.pk, self.di_isi.pk])
+    
+    def test_prefix_dan_beberapa_term(self):
+        """Prefix match dan beberapa term digabung dengan AND"""
+        self.assertEqual(self.cari('banj jakarta'), [self.di_judul.pk])
+        self.assertEqual(self.cari('tidakada'), [])
+    
+    def test_karakter_khusus_aman(self):
+        """Karakter sintaks FTS pada term tidak menyebabkan error"""
+        self.cari('"banjir" OR (kota')
+        self.cari('a-b*')
+        self.assertEqual(self.cari('"*'), [])
+    
+    def test_query_sqlite_dan_postgresql_setara(self):
+        """Term dipecah per token yang sama untuk FTS5 dan to_tsquery (prefix di token terakhir)"""
+        from FITURBERITA.search import query_fts5, query_tsquery
+        
+        terms = ['Banj', 'a-b*', '"!']
+        self.assertEqual(query_fts5(terms), '"banj"* "a b"*')
+        self.assertEqual(query_tsquery(terms), '(banj:*) & (a <-> b:*)')
+    
+    def test_ordering_eksplisit_dihormati(self):
+        """Parameter ?ordering= tetap dipakai saat search"""
+        ids = self.cari('banjir', ordering='tanggal')
+        self.assertEqual(ids, [self.di_isi.pk, self.di_judul.pk])
+    
+    def test_indeks_ikut_update_dan_delete(self):
+        """Indeks tetap sinkron setelah BERITA diubah atau dihapus"""
+        self.di_isi.isi_BERITA = "Kemarau panjang"
+        self.di_isi.save()
+        self.assertEqual(self.cari('banjir'), [self.di_judul.pk])
+        BERITA.objects.filter(pk=self.di_judul.pk).update(judul="Cuaca")
+        self.assertEqual(self.cari('jakarta'), [])
+        self.di_judul.delete()
+        self.assertEqual(self.cari('hujan'), [])
+    
+    def test_command_reindex(self):
+        """Management command reindex berjalan dan hasil pencarian tetap benar"""
+        from django.core.management import call_command
+        from io import StringIO
+        
+        out = StringIO()
+        call_command('reindex_pencarian', stdout=out)
+        self.assertIn('sqlite', out.getvalue())
+        self.assertEqual(self.cari('olahraga'), [BERITA.objects.get(judul="Olahraga").pk])
+
+
+class ResponseCacheTest(APITestCase):
+    """Test case untuk response cache list, detail dan terbaru"""
+    
+    def setUp(self):
+        """Setup data dan kosongkan cache"""
+        from django.core.cache import cache
+        cache.clear()
+        self.BERITA = BERITA.objects.create(judul="BERITA cache", isi_BERITA="Isi")
+        self.list_url = reverse('FITURBERITA:BERITA-list')
+        self.detail_url = reverse('FITURBERITA:BERITA-detail', kwargs={'pk': self.BERITA.pk})
+        self.terbaru_url = reverse('FITURBERITA:BERITA-terbaru')
+    
+    def get_json(self, url, params=None):
+        return self.client.get(url, params, HTTP_ACCEPT='application/json')
+    
+    def test_hit_tanpa_query(self):
+        """Request kedua dilayani dari cache tanpa query database"""
+        for url in (self.list_url, self.detail_url, self.terbaru_url):
+            with self.subTest(url=url):
+                pertama = self.get_json(url)
+                self.assertEqual(pertama['X-Cache'], 'MISS')
+                with self.assertNumQueries(0):
+                    kedua = self.get_json(url)
+                self.assertEqual(kedua['X-Cache'], 'HIT')
+                self.assertEqual(kedua.content, pertama.content)
+    
+    def test_key_berbeda_per_query_param(self):
+        """Query params berbeda menghasilkan entry cache berbeda"""
+        self.get_json(self.list_url)
+        response = self.get_json(self.list_url, {'ordering': 'judul'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+    
+    def test_key_berbeda_per_host(self):
+        """URL absolut di response (next) mengikuti host request, bukan host yang mengisi cache"""
+        BERITA.objects.bulk_create([BERITA(judul=f'BERITA {i}', isi_BERITA='Isi') for i in range(10)])
+        pertama = self.client.get(self.list_url, HTTP_ACCEPT='application/json', HTTP_HOST='a.example')
+        kedua = self.client.get(self.list_url, HTTP_ACCEPT='application/json', HTTP_HOST='b.example')
+        self.assertEqual(kedua['X-Cache'], 'MISS')
+        self.assertTrue(pertama.json()['next'].startswith('http://a.example/'))
+        self.assertTrue(kedua.json()['next'].startswith('http://b.example/'))
+        https = self.client.get(self.list_url, HTTP_ACCEPT='application/json', HTTP_HOST='b.example', secure=True)
+        self.assertTrue(https.json()['next'].startswith('https://b.example/'))
+    
+    def test_browsable_api_tidak_dicache(self):
+        """Renderer HTML (berisi CSRF token) tidak di-cache"""
+        self.client.get(self.list_url, HTTP_ACCEPT='text/html')
+        response = self.client.get(self.list_url, HTTP_ACCEPT='text/html')
+        self.assertNotIn('X-Cache', response)
+    
+    def test_invalidasi_saat_komentar_dibuat(self):
+        """Komentar baru menginvalidasi list, detail dan terbaru"""
+        for url in (self.list_url, self.detail_url, self.terbaru_url):
+            self.get_json(url)
+        Komentar.objects.create(nama="A", isi_komentar="B", BERITA=self.BERITA)
+        for url in (self.list_url, self.detail_url, self.terbaru_url):
+            with self.subTest(url=url):
+                self.assertEqual(self.get_json(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.get_json(self.detail_url).json()['jumlah_komentar'], 1)
+    
+    def test_edit_komentar_tidak_invalidasi_list(self):
+        """Edit isi komentar tidak mengubah list (jumlah komentar tetap)"""
+        komentar = Komentar.objects.create(nama="A", isi_komentar="B", BERITA=self.BERITA)
+        self.get_json(self.list_url)
+        self.get_json(self.detail_url)
+        komentar.isi_komentar = "Diubah"
+        komentar.save()
+        self.assertEqual(self.get_json(self.list_url)['X-Cache'], 'HIT')
+        self.assertEqual(self.get_json(self.detail_url)['X-Cache'], 'MISS')
+    
+    def test_invalidasi_hanya_detail_yang_berubah(self):
+        """Update BERITA lain tidak menginvalidasi detail BERITA ini"""
+        lain = BERITA.objects.create(judul="Lain", isi_BERITA="Isi")
+        self.get_json(self.detail_url)
+        lain.judul = "Lain diubah"
+        lain.save()
+        self.assertEqual(self.get_json(self.detail_url)['X-Cache'], 'HIT')
+        self.BERITA.judul = "Judul baru"
+        self.BERITA.save()
+        response = self.get_json(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['judul'], "Judul baru")
+    
+    def test_statistik_hit_miss(self):
+        """Endpoint statistik menampilkan counter hit/miss (khusus admin)"""
+        from django.contrib.auth.models import User
+        from .cache import reset_statistik
+        reset_statistik()
+        self.get_json(self.list_url)
+        self.get_json(self.list_url)
+        url = reverse('FITURBERITA:cache-statistik')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        admin = User.objects.create_superuser('admin', 'admin@BERITA.local', 'rahasia')
+        self.client.force_authenticate(admin)
+        data = self.client.get(url).data
+        self.assertEqual((data['hit'], data['miss']), (1, 1))
+
+
+class ConditionalGetTest(APITestCase):
+    """Test case untuk ETag / Last-Modified dan jawaban 304"""
+    
+    def setUp(self):
+        """Setup data dan kosongkan cache"""
+        from django.core.cache import cache
+        cache.clear()
+        self.BERITA = BERITA.objects.create(judul="BERITA etag", isi_BERITA="Isi")
+        Komentar.objects.create(nama="A", isi_komentar="B", BERITA=self.BERITA)
+        self.urls = [
+            reverse('FITURBERITA:BERITA-list'),
+            reverse('FITURBERITA:BERITA-detail', kwargs={'pk': self.BERITA.pk}),
+            reverse('FITURBERITA:BERITA-terbaru'),
+            reverse('FITURBERITA:BERITA-komentar', kwargs={'pk': self.BERITA.pk}),
+        ]
+    
+    def get_json(self, url, **headers):
+        return self.client.get(url, HTTP_ACCEPT='application/json', **headers)
+    
+    def test_header_validator_ada(self):
+        """Response 200 membawa ETag strong dan Last-Modified"""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_json(url)
+                self.assertTrue(response['ETag'].startswith('"'))
+                self.assertIn('Last-Modified', response)
+    
+    def test_if_none_match_304_tanpa_serializer(self):
+        """ETag yang cocok dijawab 304 hanya dengan satu query validator"""
+        from django.core.cache import cache
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.get_json(url)['ETag']
+                cache.clear()  # Pastikan jalur 304 tidak bergantung pada response cache
+                with self.assertNumQueries(1):
+                    response = self.get_json(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+    
+    def test_304_dari_response_cache(self):
+        """Saat response ada di cache, 304 dijawab tanpa query sama sekali"""
+        url = self.urls[0]
+        etag = self.get_json(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.get_json(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_if_modified_since(self):
+        """If-Modified-Since yang masih berlaku dijawab 304"""
+        url = self.urls[1]
+        last_modified = self.get_json(url)['Last-Modified']
+        response = self.get_json(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_etag_berubah_saat_data_berubah(self):
+        """Komentar baru, edit komentar dan hapus BERITA mengubah ETag"""
+        etags = {url: self.get_json(url)['ETag'] for url in self.urls}
+        Komentar.objects.create(nama="C", isi_komentar="D", BERITA=self.BERITA)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_json(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        etag_detail = self.get_json(self.urls[1])['ETag']
+        komentar = Komentar.objects.first()
+        komentar.isi_komentar = "Diedit"
+        komentar.save()
+        self.assertNotEqual(self.get_json(self.urls[1])['ETag'], etag_detail)
+        
+        lain = BERITA.objects.create(judul="Lain", isi_BERITA="Isi")
+        etag_list = self.get_json(self.urls[0])['ETag']
+        BERITA.objects.filter(pk=lain.pk).delete()
+        self.assertNotEqual(self.get_json(self.urls[0])['ETag'], etag_list)
+    
+    def test_etag_per_representasi(self):
+        """Query params berbeda menghasilkan ETag berbeda"""
+        url = self.urls[0]
+        self.assertNotEqual(
+            self.get_json(url)['ETag'],
+            self.client.get(url, {'ordering': 'judul'}, HTTP_ACCEPT='application/json')['ETag']
+        )
+    
+    def test_detail_tidak_ada_tetap_404(self):
+        """BERITA yang tidak ada tetap dijawab 404"""
+        response = self.get_json(reverse('FITURBERITA:BERITA-detail', kwargs={'pk': 9999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class GambarTurunanTest(APITestCase):
+    """Test case untuk pipeline gambar turunan"""
+    
+    def setUp(self):
+        """Gunakan MEDIA_ROOT sementara"""
+        import shutil
+        import tempfile
+        from django.test import override_settings
+        from django.core.cache import cache
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        # Jalankan tugas latar belakang langsung agar hasil bisa dicek
+        pengaturan = override_settings(MEDIA_ROOT=media_root, BERITA_TASKS={'EAGER': True})
+        pengaturan.enable()
+        self.addCleanup(pengaturan.disable)
+    
+    def buat_file_gambar(self, nama='foto.png', ukuran=(1200, 800), mode='RGBA', warna=(200, 30, 30, 255)):
+        """Buat file PNG sederhana di memori"""
+        import io
+        from PIL import Image
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        buffer = io.BytesIO()
+        Image.new(mode, ukuran, warna).save(buffer, format='PNG')
+        return SimpleUploadedFile(nama, buffer.getvalue(), content_type='image/png')
+    
+    def test_turunan_dibuat_saat_upload(self):
+        """Upload lewat API menghasilkan thumbnail, card dan full dalam WebP + JPEG"""
+        from django.core.files.storage import default_storage
+        response = self.client.post(
+            reverse('FITURBERITA:BERITA-list'),
+            {'judul': 'Foto', 'isi_BERITA': 'Isi', 'gambar': self.buat_file_gambar()},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        BERITA_obj = BERITA.objects.get()
+        turunan = BERITA_obj.gambar_turunan
+        self.assertEqual(set(turunan), {'thumbnail', 'card', 'full'})
+        self.assertEqual((turunan['thumbnail']['width'], turunan['thumbnail']['height']), (150, 150))
+        self.assertEqual((turunan['card']['width'], turunan['card']['height']), (640, 360))
+        self.assertEqual(turunan['full']['width'], 1200)  # Tidak diperbesar
+        for varian in turunan.values():
+            self.assertTrue(varian['webp'].endswith('.webp'))
+            self.assertTrue(varian['jpeg'].endswith('.jpg'))
+            self.assertTrue(default_storage.exists(varian['webp']))
+            self.assertTrue(default_storage.exists(varian['jpeg']))
+    
+    def test_url_di_serializer(self):
+        """List dan detail menampilkan URL turunan absolut"""
+        BERITA_obj = BERITA.objects.create(
+            judul='Foto', isi_BERITA='Isi', gambar=self.buat_file_gambar()
+        )
+        Kosong = BERITA.objects.create(judul='Tanpa foto', isi_BERITA='Isi')
+        detail = self.client.get(
+            reverse('FITURBERITA:BERITA-detail', kwargs={'pk': BERITA_obj.pk}),
+            HTTP_ACCEPT='application/json'
+        ).json()
+        self.assertTrue(detail['gambar_turunan']['thumbnail']['webp'].startswith('http://testserver/media/'))
+        hasil = {
+            item['id']: item['gambar_turunan']
+            for item in self.client.get(
+                reverse('FITURBERITA:BERITA-list'), HTTP_ACCEPT='application/json'
+            ).json()['results']
+        }
+        self.assertIn('card', hasil[BERITA_obj.pk])
+        self.assertIsNone(hasil[Kosong.pk])
+    
+    def test_nama_file_berbasis_hash(self):
+        """Gambar yang sama menghasilkan nama file turunan yang sama"""
+        pertama = BERITA.objects.create(judul='A', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        kedua = BERITA.objects.create(judul='B', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        pertama.refresh_from_db()
+        kedua.refresh_from_db()
+        self.assertEqual(pertama.gambar_turunan, kedua.gambar_turunan)
+    
+    def test_update_tanpa_ganti_gambar_tidak_diproses_ulang(self):
+        """Edit judul tidak memproses ulang gambar"""
+        from unittest import mock
+        BERITA_obj = BERITA.objects.create(judul='A', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        BERITA_obj = BERITA.objects.get(pk=BERITA_obj.pk)
+        with mock.patch('FITURBERITA.images.buat_turunan') as buat:
+            BERITA_obj.judul = 'A diubah'
+            BERITA_obj.save()
+        buat.assert_not_called()
+    
+    def test_command_backfill(self):
+        """Backfill membuat turunan untuk BERITA lama yang belum punya"""
+        from django.core.management import call_command
+        from io import StringIO
+        BERITA_obj = BERITA.objects.create(judul='A', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        BERITA.objects.update(gambar_turunan={})
+        
+        out = StringIO()
+        call_command('buat_turunan_gambar', stdout=out, stderr=StringIO())
+        self.assertIn('1 BERITA', out.getvalue())
+        BERITA_obj.refresh_from_db()
+        self.assertIn('thumbnail', BERITA_obj.gambar_turunan)
+    
+    def test_file_rusak_tidak_error(self):
+        """File yang bukan gambar valid hanya di-log, BERITA tetap tersimpan"""
+        from django.core.files.base import ContentFile
+        BERITA_obj = BERITA(judul='Rusak', isi_BERITA='Isi')
+        BERITA_obj.gambar.save('rusak.jpg', ContentFile(b'bukan gambar'), save=False)
+        with self.assertLogs('FITURBERITA.images', level='WARNING'):
+            BERITA_obj.save()
+        BERITA_obj.refresh_from_db()
+        self.assertEqual(BERITA_obj.gambar_turunan, {})
+
+    def test_error_storage_dicoba_ulang(self):
+        """Error disk/storage saat membuat turunan membuat tugas dicoba ulang, bukan selesai"""
+        from unittest import mock
+        from .models import Tugas
+        with mock.patch('FITURBERITA.images.buat_turunan', side_effect=OSError('disk penuh')), \
+                self.assertLogs('FITURBERITA.taskqueue', level='WARNING'):
+            BERITA.objects.create(judul='A', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        tugas = Tugas.objects.get()
+        self.assertEqual(tugas.status, Tugas.ANTRI)
+        self.assertIn('disk penuh', tugas.error)
+    
+    def test_turunan_lama_dihapus_saat_gambar_diganti(self):
+        """Ganti gambar menghapus turunan lama, kecuali file yang masih dipakai BERITA lain"""
+        from django.core.files.storage import default_storage
+        from .images import path_turunan
+        pertama = BERITA.objects.create(judul='A', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        kedua = BERITA.objects.create(judul='B', isi_BERITA='Isi', gambar=self.buat_file_gambar())
+        lama = path_turunan(BERITA.objects.get(pk=pertama.pk).gambar_turunan)
+        
+        kedua = BERITA.objects.get(pk=kedua.pk)
+        kedua.gambar = self.buat_file_gambar(warna=(30, 30, 200, 255))
+        kedua.save()
+        # Masih dipakai BERITA pertama
+        self.assertTrue(all(default_storage.exists(path) for path in lama))
+        
+        pertama = BERITA.objects.get(pk=pertama.pk)
+        pertama.gambar = None
+        pertama.save()
+        self.assertFalse(any(default_storage.exists(path) for path in lama))
+        baru = path_turunan(BERITA.objects.get(pk=kedua.pk).gambar_turunan)
+        self.assertTrue(all(default_storage.exists(path) for path in baru))
+
+
+class TaskQueueTest(TestCase):
+    """Test case untuk task queue berbasis database"""
+    
+    def setUp(self):
+        """Daftarkan tugas uji"""
+        from . import taskqueue
+        self.taskqueue = taskqueue
+        self.dipanggil = []
+        self.gagal_sebanyak = 0
+        
+        def tugas_uji(nilai):
+            if self.gagal_sebanyak:
+                self.gagal_sebanyak -= 1
+                raise RuntimeError('gagal sementara')
+            self.dipanggil.append(nilai)
+        
+        taskqueue.tugas('uji.catat')(tugas_uji)
+        self.addCleanup(taskqueue._registry.pop, 'uji.catat', None)
+    
+    def test_tugas_ditunda_sampai_worker_jalan(self):
+        """antrikan() hanya mencatat tugas; worker yang menjalankannya"""
+        from .models import Tugas
+        obj = self.taskqueue.antrikan('uji.catat', 5)
+        self.assertEqual(self.dipanggil, [])
+        self.assertEqual(obj.status, Tugas.ANTRI)
+        
+        self.assertEqual(self.taskqueue.jalankan_antrian(), (1, 0))
+        obj.refresh_from_db()
+        self.assertEqual(self.dipanggil, [5])
+        self.assertEqual((obj.status, obj.percobaan), (Tugas.SELESAI, 1))
+        self.assertIsNotNone(obj.selesai)
+    
+    def test_retry_dengan_backoff(self):
+        """Tugas gagal dijadwalkan ulang dengan delay yang makin panjang"""
+        from django.utils import timezone
+        from .models import Tugas
+        self.gagal_sebanyak = 2
+        obj = self.taskqueue.antrikan('uji.catat', 1)
+        
+        with self.assertLogs('FITURBERITA.taskqueue', level='WARNING'):
+            self.assertEqual(self.taskqueue.jalankan_antrian(), (0, 1))
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, Tugas.ANTRI)
+        self.assertIn('gagal sementara', obj.error)
+        delay_pertama = obj.jadwal - timezone.now()
+        self.assertGreater(delay_pertama.total_seconds(), 1)
+        
+        # Belum jatuh tempo: tidak diambil worker
+        self.assertEqual(self.taskqueue.jalankan_antrian(), (0, 0))
+        
+        Tugas.objects.filter(pk=obj.pk).update(jadwal=timezone.now())
+        with self.assertLogs('FITURBERITA.taskqueue', level='WARNING'):
+            self.taskqueue.jalankan_antrian()
+        obj.refresh_from_db()
+        self.assertGreater(obj.jadwal - timezone.now(), delay_pertama)
+        
+        Tugas.objects.filter(pk=obj.pk).update(jadwal=timezone.now())
+        self.assertEqual(self.taskqueue.jalankan_antrian(), (1, 0))
+        self.assertEqual(self.dipanggil, [1])
+    
+    def test_gagal_permanen(self):
+        """Setelah maks_percobaan, status menjadi gagal"""
+        from .models import Tugas
+        self.gagal_sebanyak = 10
+        obj = self.taskqueue.antrikan('uji.catat', 1, maks_percobaan=1)
+        with self.assertLogs('FITURBERITA.taskqueue', level='ERROR'):
+            self.taskqueue.jalankan_antrian()
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, Tugas.GAGAL)
+    
+    def test_klaim_hanya_sekali(self):
+        """Tugas yang sudah diklaim worker lain tidak dijalankan dua kali"""
+        obj = self.taskqueue.antrikan('uji.catat', 1)
+        salinan = type(obj).objects.get(pk=obj.pk)
+        self.assertTrue(self.taskqueue.jalankan_tugas(obj))
+        self.assertIsNone(self.taskqueue.jalankan_tugas(salinan))
+        self.assertEqual(self.dipanggil, [1])
+    
+    def test_tugas_macet_dipulihkan(self):
+        """Tugas 'berjalan' yang melewati timeout kembali ke antrian"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import Tugas
+        obj = self.taskqueue.antrikan('uji.catat', 1)
+        Tugas.objects.filter(pk=obj.pk).update(
+            status=Tugas.BERJALAN, mulai=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(self.taskqueue.pulihkan_tugas_macet(), 1)
+        self.assertEqual(self.taskqueue.jalankan_antrian(), (1, 0))
+    
+    def test_tugas_macet_percobaan_habis_gagal(self):
+        """Tugas yang mematikan worker di percobaan terakhir ditandai gagal, tidak diantrikan lagi"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import Tugas
+        obj = self.taskqueue.antrikan('uji.catat', 1, maks_percobaan=2)
+        Tugas.objects.filter(pk=obj.pk).update(
+            status=Tugas.BERJALAN, percobaan=2, mulai=timezone.now() - timedelta(hours=1)
+        )
+        with self.assertLogs('FITURBERITA.taskqueue', level='ERROR'):
+            self.assertEqual(self.taskqueue.pulihkan_tugas_macet(), 0)
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, Tugas.GAGAL)
+        self.assertIn('percobaan sudah habis', obj.error)
+        self.assertIsNotNone(obj.selesai)
+        self.assertEqual(self.taskqueue.jalankan_antrian(), (0, 0))
+        self.assertEqual(self.dipanggil, [])
+    
+    def test_upload_gambar_diantrikan(self):
+        """Upload gambar hanya meng-antrikan tugas, tidak memproses di request"""
+        from unittest import mock
+        from django.core.files.base import ContentFile
+        from .models import Tugas
+        with mock.patch('FITURBERITA.images.buat_turunan') as buat, \
+                mock.patch('django.core.files.storage.FileSystemStorage.save', return_value='BERITA_images/a.png'):
+            BERITA_obj = BERITA(judul='A', isi_BERITA='Isi')
+            BERITA_obj.gambar.save('a.png', ContentFile(b'x'), save=False)
+            BERITA_obj.save()
+        buat.assert_not_called()
+        tugas = Tugas.objects.get()
+        self.assertEqual((tugas.nama, tugas.argumen['args']), ('gambar.proses_turunan', [BERITA_obj.pk]))
+    
+    def test_command_worker_sekali(self):
+        """Management command worker memproses antrian lalu berhenti"""
+        from django.core.management import call_command
+        from io import StringIO
+        self.taskqueue.antrikan('uji.catat', 1)
+        self.taskqueue.antrikan('uji.catat', 2)
+        out = StringIO()
+        call_command('jalankan_worker', '--sekali', stdout=out)
+        self.assertEqual(self.dipanggil, [1, 2])
+        self.assertIn('2 tugas selesai', out.getvalue())
+
+
+class TaskQueueTransaksiTest(TransactionTestCase):
+    """Tugas dijalankan worker di luar transaksi (tidak memegang write lock SQLite)"""
+    
+    def test_tugas_tanpa_transaksi(self):
+        from django.db import transaction
+        from . import taskqueue
+        from .models import Tugas
+        dalam_transaksi = []
+        taskqueue.tugas('uji.transaksi')(
+            lambda: dalam_transaksi.append(transaction.get_connection().in_atomic_block)
+        )
+        self.addCleanup(taskqueue._registry.pop, 'uji.transaksi', None)
+        obj = taskqueue.antrikan('uji.transaksi')
+        
+        self.assertEqual(taskqueue.jalankan_antrian(), (1, 0))
+        self.assertEqual(dalam_transaksi, [False])
+        obj.refresh_from_db()
+        self.assertEqual(obj.status, Tugas.SELESAI)
+
+
+class BulkEndpointTest(APITestCase):
+    """Test case untuk endpoint bulk create / bulk update"""
+    
+    def setUp(self):
+        """Setup test data"""
+        from django.core.cache import cache
+        cache.clear()  # bucket throttle bulk komentar dari test lain
+        self.BERITA_a = BERITA.objects.create(judul="BERITA A", isi_BERITA="Isi A")
+        self.BERITA_b = BERITA.objects.create(judul="BERITA B", isi_BERITA="Isi B")
+        self.url_BERITA = reverse('FITURBERITA:BERITA-bulk')
+        self.url_komentar = reverse('FITURBERITA:komentar-bulk')
+    
+    def test_bulk_create_BERITA(self):
+        """Semua item valid dibuat sekaligus"""
+        data = [{'judul': f'Bulk {i}', 'isi_BERITA': 'Isi'} for i in range(3)]
+        response = self.client.post(self.url_BERITA, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['berhasil'], 3)
+        self.assertEqual(BERITA.objects.filter(judul__startswith='Bulk').count(), 3)
+    
+    def test_bulk_create_sebagian_gagal(self):
+        """Item tidak valid dilaporkan per index, item lain tetap dibuat"""
+        data = [
+            {'nama': 'A', 'isi_komentar': 'ok', 'BERITA': self.BERITA_a.id},
+            {'nama': 'B', 'isi_komentar': 'ok', 'BERITA': 99999},
+            {'nama': 'C', 'isi_komentar': 'ok', 'BERITA': self.BERITA_b.id},
+        ]
+        response = self.client.post(self.url_komentar, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual((response.data['berhasil'], response.data['gagal']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertIn('BERITA', response.data['errors'][0]['errors'])
+    
+    def test_bulk_semua_gagal(self):
+        """Jika tidak ada item valid, response 400"""
+        response = self.client.post(self.url_komentar, [{'nama': 'A'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Komentar.objects.count(), 0)
+    
+    def test_bulk_body_bukan_list(self):
+        """Body selain list ditolak"""
+        response = self.client.post(self.url_komentar, {'nama': 'A'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_bulk_create_komentar_update_counter(self):
+        """Counter jumlah_komentar ikut bertambah walau tanpa signal post_save"""
+        data = [
+            {'nama': f'User {i}', 'isi_komentar': 'Komentar', 'BERITA': self.BERITA_a.id}
+            for i in range(4)
+        ] + [{'nama': 'User', 'isi_komentar': 'Komentar', 'BERITA': self.BERITA_b.id}]
+        response = self.client.post(self.url_komentar, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.BERITA_a.refresh_from_db()
+        self.BERITA_b.refresh_from_db()
+        self.assertEqual((self.BERITA_a.jumlah_komentar, self.BERITA_b.jumlah_komentar), (4, 1))
+    
+    def test_bulk_update_pindah_BERITA(self):
+        """Memindahkan komentar lewat bulk update menyesuaikan counter kedua BERITA"""
+        komentar = [
+            Komentar.objects.create(nama=f'User {i}', isi_komentar='Lama', BERITA=self.BERITA_a)
+            for i in range(3)
+        ]
+        data = [
+            {'id': komentar[0].id, 'BERITA': self.BERITA_b.id},
+            {'id': komentar[1].id, 'isi_komentar': 'Baru'},
+            {'id': 99999, 'isi_komentar': 'Tidak ada'},
+        ]
+        response = self.client.patch(self.url_komentar, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['berhasil'], 2)
+        
+        komentar[1].refresh_from_db()
+        self.assertEqual(komentar[1].isi_komentar, 'Baru')
+        self.BERITA_a.refresh_from_db()
+        self.BERITA_b.refresh_from_db()
+        self.assertEqual((self.BERITA_a.jumlah_komentar, self.BERITA_b.jumlah_komentar), (2, 1))
+    
+    def test_bulk_update_BERITA_invalidasi_cache(self):
+        """Bulk update BERITA menaikkan diperbarui dan menginvalidasi cache detail"""
+        url_detail = reverse('FITURBERITA:BERITA-detail', args=[self.BERITA_a.id])
+        self.client.get(url_detail)
+        diperbarui_lama = BERITA.objects.get(pk=self.BERITA_a.id).diperbarui
+        
+        data = [{'id': self.BERITA_a.id, 'judul': 'Judul Baru'}]
+        response = self.client.patch(self.url_BERITA, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.assertGreater(BERITA.objects.get(pk=self.BERITA_a.id).diperbarui, diperbarui_lama)
+        response = self.client.get(url_detail)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['judul'], 'Judul Baru')
+    
+    def test_jumlah_query_bulk_create_konstan(self):
+        """Jumlah query tidak bertambah seiring jumlah item"""
+        def data(n):
+            return [
+                {'nama': f'User {i}', 'isi_komentar': 'Komentar', 'BERITA': self.BERITA_a.id}
+                for i in range(n)
+            ]
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        # 50 item melebihi bucket throttle per IP (ThrottleKomentarTest)
+        with self.settings(BERITA_THROTTLE={'ENABLED': False}):
+            with CaptureQueriesContext(connection) as sedikit:
+                self.client.post(self.url_komentar, data(2), format='json')
+            with CaptureQueriesContext(connection) as banyak:
+                self.client.post(self.url_komentar, data(50), format='json')
+        self.assertEqual(len(sedikit), len(banyak))
+
+
+class ExportStreamingTest(APITestCase):
+    """Test case untuk export streaming NDJSON / CSV"""
+    
+    def setUp(self):
+        """Setup test data dengan tanggal berbeda"""
+        from datetime import timedelta
+        from django.utils import timezone
+        self.awal = timezone.now() - timedelta(days=10)
+        self.BERITA_list = []
+        for i in range(5):
+            obj = BERITA.objects.create(judul=f'BERITA {i}', isi_BERITA=f'Isi, "kutip" {i}')
+            BERITA.objects.filter(pk=obj.pk).update(tanggal=self.awal + timedelta(days=i))
+            self.BERITA_list.append(obj)
+        Komentar.objects.create(nama='User', isi_komentar='Komentar', BERITA=self.BERITA_list[0])
+        self.url = reverse('FITURBERITA:BERITA-export')
+    
+    def baca(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+    
+    def test_export_ndjson(self):
+        """Default NDJSON: satu objek JSON per baris, urut tanggal"""
+        import json
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(baris) for baris in self.baca(response).splitlines()]
+        self.assertEqual([row['judul'] for row in rows], [f'BERITA {i}' for i in range(5)])
+        self.assertEqual(rows[0]['jumlah_komentar'], 1)
+    
+    def test_export_csv(self):
+        """CSV dengan header dan quoting yang benar"""
+        import csv
+        import io
+        response = self.client.get(self.url, {'jenis': 'csv'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self.baca(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[1]['isi_BERITA'], 'Isi, "kutip" 1')
+    
+    def test_export_since(self):
+        """since= hanya mengembalikan data dengan tanggal setelahnya"""
+        import json
+        from datetime import timedelta
+        since = (self.awal + timedelta(days=2, hours=1)).isoformat()
+        response = self.client.get(self.url, {'since': since})
+        rows = [json.loads(baris) for baris in self.baca(response).splitlines()]
+        self.assertEqual([row['judul'] for row in rows], ['BERITA 3', 'BERITA 4'])
+    
+    def test_export_dilanjutkan_dari_tanggal_terakhir(self):
+        """since=<tanggal baris terakhir yang diterima> tidak mengulang baris itu (NDJSON dan CSV)"""
+        import csv
+        import io
+        import json
+        from datetime import timedelta
+        BERITA.objects.filter(pk=self.BERITA_list[1].pk).update(
+            tanggal=(self.awal + timedelta(days=1)).replace(microsecond=123456)
+        )
+        for jenis in ('ndjson', 'csv'):
+            with self.subTest(jenis=jenis):
+                isi = self.baca(self.client.get(self.url, {'jenis': jenis}))
+                if jenis == 'csv':
+                    rows = list(csv.DictReader(io.StringIO(isi)))
+                else:
+                    rows = [json.loads(baris) for baris in isi.splitlines()]
+                response = self.client.get(self.url, {'jenis': jenis, 'since': rows[1]['tanggal']})
+                lanjutan = self.baca(response).splitlines()
+                if jenis == 'csv':
+                    lanjutan = lanjutan[1:]
+                self.assertEqual(len(lanjutan), 3)
+                self.assertIn('BERITA 2', lanjutan[0])
+    
+    def test_export_komentar(self):
+        """Export komentar memakai id BERITA, bukan objek nested"""
+        import json
+        response = self.client.get(reverse('FITURBERITA:komentar-export'))
+        rows = [json.loads(baris) for baris in self.baca(response).splitlines()]
+        self.assertEqual(rows[0]['BERITA_id'], self.BERITA_list[0].id)
+    
+    def test_export_parameter_tidak_valid(self):
+        """jenis atau since yang tidak dikenal menghasilkan 400"""
+        self.assertEqual(self.client.get(self.url, {'jenis': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'since': 'kemarin'}).status_code, 400)
+
+
+class ImportArsipTest(TestCase):
+    """Test case untuk command import_arsip"""
+    
+    def setUp(self):
+        """Folder sementara untuk file sumber"""
+        import tempfile
+        from shutil import rmtree
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(rmtree, self.tmpdir, ignore_errors=True)
+    
+    def tulis(self, nama, isi):
+        import os
+        path = os.path.join(self.tmpdir, nama)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(isi)
+        return path
+    
+    def jalankan(self, *args):
+        import io
+        from django.core.management import call_command
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_arsip', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+    
+    def test_import_BERITA_ndjson_pertahankan_tanggal(self):
+        """Tanggal dari sumber disimpan apa adanya, bukan waktu import"""
+        import json
+        rows = [
+            {'id': 10, 'judul': 'Lama', 'isi_BERITA': 'Isi', 'tanggal': '2020-01-02T03:04:05+00:00'},
+            {'id': 11, 'judul': '', 'isi_BERITA': 'Judul kosong'},
+        ]
+        path = self.tulis('berita.ndjson', '\n'.join(json.dumps(row) for row in rows))
+        out, err = self.jalankan('BERITA', path, '--pertahankan-id')
+        
+        self.assertIn('1 BERITA di-import (1 gagal)', out)
+        self.assertIn('baris/detik', out)
+        self.assertIn('Baris 2', err)
+        obj = BERITA.objects.get(pk=10)
+        self.assertEqual(obj.tanggal.year, 2020)
+        self.assertEqual(obj.diperbarui, obj.tanggal)
+        # auto_now_add aktif kembali setelah import
+        self.assertEqual(BERITA.objects.create(judul='Baru', isi_BERITA='Isi').tanggal.year,
+                         datetime.now().year)
+    
+    def test_save_lain_selama_import_tetap_auto_now(self):
+        """Import tidak mematikan auto_now_add milik field model untuk save lain di proses yang sama"""
+        import json
+        from unittest import mock
+        from .importer import BERITAImporter
+        dibuat = []
+        
+        def setelah_batch(importer, objs):
+            dibuat.append(BERITA.objects.create(judul='Dari request lain', isi_BERITA='Isi'))
+        
+        path = self.tulis('berita.ndjson', json.dumps(
+            {'judul': 'Lama', 'isi_BERITA': 'Isi', 'tanggal': '2020-01-02T03:04:05+00:00'}
+        ))
+        with mock.patch.object(BERITAImporter, 'setelah_batch', setelah_batch):
+            self.jalankan('BERITA', path)
+        self.assertEqual(BERITA.objects.get(judul='Lama').tanggal.year, 2020)
+        self.assertEqual(dibuat[0].tanggal.year, datetime.now().year)
+    
+    def test_id_duplikat_batch_dibatalkan(self):
+        """Id yang sudah ada dengan --pertahankan-id membatalkan batch itu saja, tanpa traceback"""
+        import json
+        BERITA.objects.create(id=10, judul='Sudah ada', isi_BERITA='Isi')
+        rows = [
+            {'id': 10, 'judul': 'Duplikat', 'isi_BERITA': 'Isi'},
+            {'id': 11, 'judul': 'Satu batch dengan duplikat', 'isi_BERITA': 'Isi'},
+            {'id': 12, 'judul': 'Batch berikutnya', 'isi_BERITA': 'Isi'},
+        ]
+        path = self.tulis('berita.ndjson', '\n'.join(json.dumps(row) for row in rows))
+        out, err = self.jalankan('BERITA', path, '--pertahankan-id', '--batch', '2')
+        
+        self.assertIn('1 BERITA di-import (2 gagal)', out)
+        self.assertIn('Baris 1: Batch baris 1-2 gagal disimpan', err)
+        self.assertIn('Baris 2: Batch baris 1-2 gagal disimpan', err)
+        self.assertEqual(
+            sorted(BERITA.objects.values_list('judul', flat=True)), ['Batch berikutnya', 'Sudah ada']
+        )
+    
+    def test_import_komentar_csv_update_counter(self):
+        """Komentar CSV di-import per batch dan counter BERITA ikut bertambah"""
+        BERITA_obj = BERITA.objects.create(judul='BERITA', isi_BERITA='Isi')
+        baris = ['nama,isi_komentar,tanggal,BERITA_id']
+        baris += [f'User {i},"Komentar, ke-{i}",2021-05-0{i % 9 + 1},{BERITA_obj.id}' for i in range(7)]
+        baris.append('Yatim,Tanpa BERITA,,99999')
+        path = self.tulis('komentar.csv', '\n'.join(baris))
+        out, err = self.jalankan('komentar', path, '--batch', '3')
+        
+        self.assertIn('7 komentar di-import (1 gagal)', out)
+        BERITA_obj.refresh_from_db()
+        self.assertEqual(BERITA_obj.jumlah_komentar, 7)
+        self.assertEqual(
+            Komentar.objects.filter(tanggal__year=2021, isi_komentar='Komentar, ke-0').count(), 1
+        )
+    
+    def test_import_gambar_disalin(self):
+        """File gambar dari --sumber-gambar disalin ke storage"""
+        import io
+        import json
+        import os
+        import tempfile
+        from shutil import rmtree
+        from django.core.files.storage import default_storage
+        from django.test import override_settings
+        from PIL import Image
+        
+        media = tempfile.mkdtemp()
+        self.addCleanup(rmtree, media, ignore_errors=True)
+        buffer = io.BytesIO()
+        Image.new('RGB', (20, 20), 'red').save(buffer, format='JPEG')
+        with open(os.path.join(self.tmpdir, 'foto.jpg'), 'wb') as f:
+            f.write(buffer.getvalue())
+        path = self.tulis('berita.ndjson', json.dumps(
+            {'judul': 'Bergambar', 'isi_BERITA': 'Isi', 'gambar': 'foto.jpg'}
+        ))
+        
+        with override_settings(MEDIA_ROOT=media):
+            self.jalankan('BERITA', path, '--sumber-gambar', self.tmpdir)
+            obj = BERITA.objects.get(judul='Bergambar')
+            self.assertTrue(obj.gambar.name.startswith('BERITA_images/'))
+            self.assertTrue(default_storage.exists(obj.gambar.name))
+    
+    def test_import_gambar_di_luar_sumber_ditolak(self):
+        """Path ../, absolut atau file hilang tidak disalin dan dicatat sebagai peringatan"""
+        import json
+        import os
+        import tempfile
+        from shutil import rmtree
+        from django.test import override_settings
+        
+        sumber = os.path.join(self.tmpdir, 'sumber')
+        os.mkdir(sumber)
+        rahasia = self.tulis('rahasia.jpg', 'bukan untuk disalin')
+        media = tempfile.mkdtemp()
+        self.addCleanup(rmtree, media, ignore_errors=True)
+        rows = [
+            {'judul': 'Naik folder', 'isi_BERITA': 'Isi', 'gambar': '../rahasia.jpg'},
+            {'judul': 'Absolut', 'isi_BERITA': 'Isi', 'gambar': rahasia},
+            {'judul': 'Hilang', 'isi_BERITA': 'Isi', 'gambar': 'tidak-ada.jpg'},
+        ]
+        path = self.tulis('berita.ndjson', '\n'.join(json.dumps(row) for row in rows))
+        
+        with override_settings(MEDIA_ROOT=media):
+            out, err = self.jalankan('BERITA', path, '--sumber-gambar', sumber)
+        
+        self.assertIn('3 BERITA di-import (0 gagal, 3 peringatan)', out)
+        for nomor in (1, 2, 3):
+            self.assertIn(f'Baris {nomor}: Gambar', err)
+        self.assertIn('di luar folder sumber gambar', err)
+        self.assertFalse(BERITA.objects.exclude(gambar='').exists())
+        self.assertEqual(os.listdir(media), [])
+
+
+class AsyncReadPathTest(APITestCase):
+    """Test case untuk jalur baca async: response harus identik dengan endpoint DRF"""
+    
+    def setUp(self):
+        """Setup test data"""
+        from django.test import AsyncClient
+        self.async_client = AsyncClient()
+        self.BERITA_list = [
+            BERITA.objects.create(judul=f'BERITA {i}', isi_BERITA=f'Isi {i}') for i in range(12)
+        ]
+        for i in range(3):
+            Komentar.objects.create(nama=f'User {i}', isi_komentar='Komentar', BERITA=self.BERITA_list[0])
+    
+    def get_async(self, nama, *args, **params):
+        from asgiref.sync import async_to_sync
+        return async_to_sync(self.async_client.get)(
+            reverse(f'FITURBERITA:async-{nama}', args=args), params
+        )
+    
+    def test_response_sama_dengan_DRF(self):
+        """list, halaman 2, detail, terbaru dan komentar sama persis dengan versi sync"""
+        pk = self.BERITA_list[0].id
+        kasus = [
+            ('BERITA-list', (), {}),
+            ('BERITA-list', (), {'page': 2}),
+            ('BERITA-detail', (pk,), {}),
+            ('BERITA-terbaru', (), {}),
+            ('BERITA-komentar', (pk,), {}),
+        ]
+        for nama, args, params in kasus:
+            with self.subTest(nama=nama, params=params):
+                response = self.get_async(nama, *args, **params)
+                self.assertEqual(response.status_code, 200)
+                sync = self.client.get(reverse(f'FITURBERITA:{nama}', args=args), params).json()
+                data = response.json()
+                if nama == 'BERITA-list':
+                    # Link pagination menunjuk ke jalur masing-masing
+                    for link in ('next', 'previous'):
+                        self.assertEqual(
+                            (data.pop(link) or '').replace('/async/', '/'), sync.pop(link) or ''
+                        )
+                self.assertEqual(data, sync)
+    
+    def test_keyset_async(self):
+        """Mode cursor di jalur async mengikuti link next sampai habis"""
+        from urllib.parse import urlparse, parse_qs
+        response = self.get_async('BERITA-list', paginasi='cursor')
+        data = response.json()
+        self.assertNotIn('count', data)
+        self.assertEqual(len(data['results']), 10)
+        cursor = parse_qs(urlparse(data['next']).query)['cursor'][0]
+        data = self.get_async('BERITA-list', cursor=cursor).json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNone(data['next'])
+    
+    def test_error_async(self):
+        """404 dan halaman tidak valid dijawab JSON seperti DRF"""
+        response = self.get_async('BERITA-detail', 99999)
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('detail', response.json())
+        self.assertEqual(self.get_async('BERITA-list', page=9).status_code, 404)
+        self.assertEqual(self.get_async('BERITA-list', cursor='rusak').status_code, 404)
+
+
+class KomentarStreamTest(APITestCase):
+    """Test case untuk stream komentar live (Server-Sent Events)"""
+    
+    def setUp(self):
+        """Setup test data"""
+        from django.test import AsyncClient
+        self.async_client = AsyncClient()
+        self.BERITA = BERITA.objects.create(judul='BERITA', isi_BERITA='Isi')
+        self.komentar_lama = [
+            Komentar.objects.create(nama=f'User {i}', isi_komentar=f'Lama {i}', BERITA=self.BERITA)
+            for i in range(3)
+        ]
+        self.url = reverse('FITURBERITA:async-BERITA-komentar-stream', args=[self.BERITA.id])
+    
+    def buat_komentar(self, isi):
+        """Buat komentar dan jalankan callback on_commit (broadcast)"""
+        with self.captureOnCommitCallbacks(execute=True):
+            return Komentar.objects.create(nama='Live', isi_komentar=isi, BERITA=self.BERITA)
+    
+    def jalankan(self, skenario):
+        from asgiref.sync import async_to_sync
+        return async_to_sync(skenario)()
+    
+    def test_resume_lalu_live(self):
+        """Last-Event-ID mengirim ulang komentar setelahnya, lalu komentar baru dikirim live"""
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from .broadcast import komentar_broadcaster
+        
+        async def skenario():
+            response = await self.async_client.get(
+                self.url, headers={'Last-Event-ID': str(self.komentar_lama[0].id)}
+            )
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            stream = response.streaming_content.__aiter__()
+            chunks = [await anext(stream) for _ in range(3)]
+            baru = await sync_to_async(self.buat_komentar)('Komentar live')
+            chunks.append(await asyncio.wait_for(anext(stream), timeout=5))
+            self.assertEqual(komentar_broadcaster.jumlah_pendengar(), 1)
+            await stream.aclose()
+            return [chunk.decode() for chunk in chunks], baru
+        
+        chunks, baru = self.jalankan(skenario)
+        self.assertTrue(chunks[0].startswith('retry:'))
+        self.assertIn(f'id: {self.komentar_lama[1].id}\n', chunks[1])
+        self.assertIn(f'id: {self.komentar_lama[2].id}\n', chunks[2])
+        self.assertIn(f'id: {baru.id}\nevent: komentar\n', chunks[3])
+        self.assertIn('"isi_komentar":"Komentar live"', chunks[3])
+        # Koneksi ditutup: pendengar dilepas dari broadcaster
+        self.assertEqual(komentar_broadcaster.jumlah_pendengar(), 0)
+    
+    def test_id_commit_tidak_berurutan_tetap_dikirim(self):
+        """Komentar dengan id lebih kecil yang commit belakangan tetap dikirim, duplikat dibuang"""
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from .broadcast import siarkan_komentar
+        
+        # Dibuat tanpa on_commit: urutan siaran diatur manual (id kecil commit belakangan)
+        lama = Komentar.objects.create(nama='A', isi_komentar='Commit belakangan', BERITA=self.BERITA)
+        baru = Komentar.objects.create(nama='B', isi_komentar='Commit duluan', BERITA=self.BERITA)
+        penutup = Komentar.objects.create(nama='C', isi_komentar='Penutup', BERITA=self.BERITA)
+        
+        async def skenario():
+            response = await self.async_client.get(self.url)
+            stream = response.streaming_content.__aiter__()
+            await anext(stream)
+            for komentar in (baru, lama, baru, penutup):
+                await sync_to_async(siarkan_komentar)([komentar])
+            chunks = [await asyncio.wait_for(anext(stream), timeout=5) for _ in range(3)]
+            await stream.aclose()
+            return [chunk.decode() for chunk in chunks]
+        
+        chunks = self.jalankan(skenario)
+        self.assertIn(f'id: {baru.id}\n', chunks[0])
+        self.assertIn(f'id: {lama.id}\n', chunks[1])
+        self.assertIn(f'id: {penutup.id}\n', chunks[2])
+    
+    def test_menyusul_mengambil_id_yang_commit_terlambat(self):
+        """Saat queue penuh, susulan dari database ikut memuat id di bawah id terakhir yang terkirim"""
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from django.test import override_settings
+        from .broadcast import siarkan_komentar
+        
+        k1, k2, k3, k4 = [
+            Komentar.objects.create(nama='Live', isi_komentar=f'K{i}', BERITA=self.BERITA)
+            for i in range(1, 5)
+        ]
+        
+        async def skenario():
+            response = await self.async_client.get(self.url)
+            stream = response.streaming_content.__aiter__()
+            await anext(stream)
+            chunks = []
+            for komentar in (k1, k3):
+                await sync_to_async(siarkan_komentar)([komentar])
+                chunks.append(await asyncio.wait_for(anext(stream), timeout=5))
+            # k2 belum tersiar (commit terlambat); k4 dua kali membuat queue penuh
+            await sync_to_async(siarkan_komentar)([k4, k4])
+            chunks += [await asyncio.wait_for(anext(stream), timeout=5) for _ in range(2)]
+            await stream.aclose()
+            return [chunk.decode() for chunk in chunks]
+        
+        with override_settings(BERITA_SSE={'QUEUE_SIZE': 1}):
+            chunks = self.jalankan(skenario)
+        ids = [int(chunk.split('\n', 1)[0].removeprefix('id: ')) for chunk in chunks]
+        self.assertEqual(ids, [k1.id, k3.id, k2.id, k4.id])
+    
+    def test_heartbeat_saat_idle(self):
+        """Koneksi idle hanya menerima komentar ping"""
+        from django.test import override_settings
+        
+        async def skenario():
+            response = await self.async_client.get(self.url)
+            stream = response.streaming_content.__aiter__()
+            chunks = [await anext(stream), await anext(stream)]
+            await stream.aclose()
+            return chunks
+        
+        with override_settings(BERITA_SSE={'HEARTBEAT': 0.01}):
+            chunks = self.jalankan(skenario)
+        self.assertEqual(chunks[1], b': ping\n\n')
+    
+    def test_stream_BERITA_tidak_ada(self):
+        """BERITA yang tidak ada dijawab 404 sebelum stream dibuka"""
+        from asgiref.sync import async_to_sync
+        url = reverse('FITURBERITA:async-BERITA-komentar-stream', args=[99999])
+        response = async_to_sync(self.async_client.get)(url)
+        self.assertEqual(response.status_code, 404)
+
+
+class KomentarTerbatasTest(APITestCase):
+    """Test case untuk nested komentar terbatas dan paginasi action komentar"""
+    
+    def setUp(self):
+        """BERITA dengan 10 komentar bertanggal berbeda"""
+        from datetime import timedelta
+        from django.core.cache import cache
+        from django.test import override_settings
+        from django.utils import timezone
+        cache.clear()
+        pengaturan = override_settings(BERITA_KOMENTAR={'EMBED': 3, 'PAGE_SIZE': 4})
+        pengaturan.enable()
+        self.addCleanup(pengaturan.disable)
+        
+        self.BERITA = BERITA.objects.create(judul='Viral', isi_BERITA='Isi')
+        self.awal = timezone.now() - timedelta(hours=10)
+        self.komentar = []
+        for i in range(10):
+            obj = Komentar.objects.create(nama=f'User {i}', isi_komentar=f'K{i}', BERITA=self.BERITA)
+            Komentar.objects.filter(pk=obj.pk).update(tanggal=self.awal + timedelta(hours=i))
+            self.komentar.append(obj)
+        self.ids_terbaru = [obj.id for obj in reversed(self.komentar)]
+    
+    def ikuti(self, url):
+        """Kumpulkan id komentar dengan mengikuti link next sampai habis"""
+        ids = []
+        while url:
+            data = self.client.get(url, HTTP_ACCEPT='application/json').data
+            ids += [item['id'] for item in data['komentar']]
+            url = data['next']
+        return ids
+    
+    def test_detail_embed_terbatas(self):
+        """Detail hanya memuat N komentar terbaru plus link ke sisanya"""
+        response = self.client.get(reverse('FITURBERITA:BERITA-detail', args=[self.BERITA.id]))
+        ids = [item['id'] for item in response.data['komentar']]
+        self.assertEqual(ids, self.ids_terbaru[:3])
+        self.assertEqual(response.data['jumlah_komentar'], 10)
+        self.assertEqual(self.ikuti(response.data['komentar_berikutnya']), self.ids_terbaru[3:])
+    
+    def test_detail_tanpa_link_jika_semua_termuat(self):
+        """komentar_berikutnya null jika semua komentar sudah di-embed"""
+        BERITA_kecil = BERITA.objects.create(judul='Sepi', isi_BERITA='Isi')
+        Komentar.objects.create(nama='A', isi_komentar='B', BERITA=BERITA_kecil)
+        response = self.client.get(reverse('FITURBERITA:BERITA-detail', args=[BERITA_kecil.id]))
+        self.assertEqual(len(response.data['komentar']), 1)
+        self.assertIsNone(response.data['komentar_berikutnya'])
+    
+    def test_action_komentar_keyset(self):
+        """Action komentar dipaginasi PAGE_SIZE per halaman tanpa duplikat"""
+        url = reverse('FITURBERITA:BERITA-komentar', args=[self.BERITA.id])
+        data = self.client.get(url).data
+        self.assertEqual(len(data['komentar']), 4)
+        self.assertIsNone(data['previous'])
+        self.assertEqual(self.ikuti(url), self.ids_terbaru)
+    
+    def test_action_komentar_since(self):
+        """since= hanya mengembalikan komentar setelah waktu tersebut"""
+        from datetime import timedelta
+        url = reverse('FITURBERITA:BERITA-komentar', args=[self.BERITA.id])
+        since = (self.awal + timedelta(hours=7, minutes=30)).isoformat()
+        response = self.client.get(url, {'since': since})
+        self.assertEqual([item['id'] for item in response.data['komentar']], self.ids_terbaru[:2])
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(self.client.get(url, {'since': 'bukan-tanggal'}).status_code, 400)
+    
+    def test_action_komentar_since_dari_tanggal_response(self):
+        """tanggal yang dirender API (tanpa pecahan detik) bisa langsung dipakai sebagai since"""
+        from datetime import timedelta
+        url = reverse('FITURBERITA:BERITA-komentar', args=[self.BERITA.id])
+        Komentar.objects.filter(pk=self.komentar[7].pk).update(
+            tanggal=(self.awal + timedelta(hours=7)).replace(microsecond=500000)
+        )
+        data = self.client.get(url).data
+        tanggal = next(item['tanggal'] for item in data['komentar'] if item['id'] == self.komentar[7].id)
+        response = self.client.get(url, {'since': tanggal})
+        self.assertEqual([item['id'] for item in response.data['komentar']], self.ids_terbaru[:2])
+
+
+class QueryPlanTest(TestCase):
+    """Test pemeriksaan query plan (EXPLAIN) untuk semua endpoint baca"""
+    
+    def setUp(self):
+        self.BERITA = BERITA.objects.create(judul='Berita index', isi_BERITA='Isi')
+        Komentar.objects.create(nama='Budi', isi_komentar='Komentar', BERITA=self.BERITA)
+    
+    def test_analisa_sqlite(self):
+        """SCAN tanpa index ditandai, scan lewat index dan tabel FTS tidak"""
+        from .queryplan import analisa
+        scan, _ = analisa('sqlite', ['SCAN FITURBERITA_komentar'])
+        self.assertEqual(scan, ['FITURBERITA_komentar'])
+        scan, peringatan = analisa('sqlite', [
+            'SCAN FITURBERITA_komentar USING INDEX komentar_tanggal_id_idx',
+            'SCAN FITURBERITA_berita USING COVERING INDEX berita_judul_id_idx',
+            'SCAN FITURBERITA_berita_fts VIRTUAL TABLE INDEX 0:M2',
+            'USE TEMP B-TREE FOR ORDER BY',
+        ])
+        self.assertEqual(scan, [])
+        self.assertEqual(peringatan, ['USE TEMP B-TREE FOR ORDER BY'])
+        scan, _ = analisa('postgresql', ['Seq Scan on "FITURBERITA_berita"  (cost=0.00..1.01 rows=1)'])
+        self.assertEqual(scan, ['FITURBERITA_berita'])
+    
+    def test_tidak_ada_full_scan(self):
+        """Semua kombinasi filter/ordering/pagination memakai index"""
+        from io import StringIO
+        from django.core.management import call_command
+        from .queryplan import periksa
+        hasil = periksa()
+        self.assertTrue(hasil)
+        self.assertEqual([(item.label, item.scan_penuh) for item in hasil if not item.ok], [])
+        # --ketat tidak gagal, dan data contoh ikut di-rollback
+        out = StringIO()
+        call_command('periksa_query_plan', '--ketat', stdout=out)
+        self.assertIn('0 full table scan', out.getvalue())
+        self.assertEqual(Komentar.objects.count(), 1)
+
+
+class DatabaseConfigTest(TestCase):
+    """Test penyusunan DATABASES dari environment dan pragma SQLite"""
+    
+    def konfigurasi(self, **env):
+        from BERITA.database import database_dari_env
+        from pathlib import Path
+        
+        def config(nama, default=None, cast=None):
+            nilai = env.get(nama, default)
+            if cast is bool and isinstance(nilai, str):
+                return nilai.lower() in ('1', 'true', 'yes', 'on')
+            return cast(nilai) if cast and nilai is not None else nilai
+        return database_dari_env(config, Path('/tmp'))
+    
+    def test_sqlite_default(self):
+        """Default: SQLite dengan WAL, busy timeout, IMMEDIATE dan koneksi persisten"""
+        database = self.konfigurasi()
+        self.assertEqual(database['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(database['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(database['OPTIONS']['timeout'], 20)
+        self.assertIn('PRAGMA journal_mode=WAL', database['OPTIONS']['init_command'])
+        self.assertIn('PRAGMA synchronous=NORMAL', database['OPTIONS']['init_command'])
+        self.assertGreater(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+    
+    def test_postgresql_dengan_pool(self):
+        """DB_POOL memakai pool bawaan Django dan CONN_MAX_AGE 0"""
+        database = self.konfigurasi(DB_ENGINE='postgresql', DB_HOST='db', DB_POOL='true', DB_POOL_MAX='20')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['HOST'], 'db')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20})
+        with self.assertRaises(ValueError):
+            self.konfigurasi(DB_ENGINE='oracle')
+    
+    def test_pragma_diterapkan_pada_koneksi(self):
+        """init_command dijalankan saat koneksi dibuat"""
+        from django.db import connection
+        from BERITA.database import DEFAULT_SQLITE_PRAGMA
+        if connection.vendor != 'sqlite':
+            self.skipTest('Hanya untuk SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], DEFAULT_SQLITE_PRAGMA['cache_size'])
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+
+class ReplicaRoutingTest(SimpleTestCase):
+    """
+    Test routing baca ke replika dan sticky primary setelah tulis
+    SimpleTestCase: TestCase membungkus test dalam transaksi (baca selalu ke primary)
+    """
+    
+    REPLICA = {'ALIASES': ['replica_a', 'replica_b'], 'STICKY': 5, 'COOKIE': 'berita_primary'}
+    
+    def jalankan(self, method, cookies=None):
+        """Jalankan request lewat ReplicaMiddleware; return (alias baca di view, response)"""
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from .replica import ReplicaMiddleware
+        dipakai = []
+        
+        def view(request):
+            dipakai.append(BERITA.objects.all().db)
+            dipakai.append(BERITA.objects.all().db)
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+        request = getattr(RequestFactory(), method.lower())('/api/BERITA/')
+        request.COOKIES.update(cookies or {})
+        response = ReplicaMiddleware(view)(request)
+        return dipakai, response
+    
+    def test_get_round_robin_ke_replika(self):
+        """GET dibaca bergantian dari semua replika"""
+        with self.settings(BERITA_REPLICA=self.REPLICA):
+            dipakai, response = self.jalankan('GET')
+        self.assertEqual(sorted(dipakai), ['replica_a', 'replica_b'])
+        self.assertNotIn('berita_primary', response.cookies)
+    
+    def test_tulis_ke_primary_dan_sticky(self):
+        """POST memakai primary dan memberi cookie; GET berikutnya tetap ke primary"""
+        with self.settings(BERITA_REPLICA=self.REPLICA):
+            dipakai, response = self.jalankan('POST')
+            self.assertEqual(dipakai, ['default', 'default'])
+            cookie = response.cookies['berita_primary']
+            self.assertEqual(cookie['max-age'], 5)
+            dipakai, _ = self.jalankan('GET', {'berita_primary': cookie.value})
+            self.assertEqual(dipakai, ['default', 'default'])
+            # Cookie kedaluwarsa: kembali ke replika
+            dipakai, _ = self.jalankan('GET', {'berita_primary': '1'})
+            self.assertNotIn('default', dipakai)
+    
+    def test_di_luar_request_dan_tanpa_replika(self):
+        """Di luar request dan tanpa replika terkonfigurasi semua baca ke primary"""
+        with self.settings(BERITA_REPLICA=self.REPLICA):
+            self.assertEqual(BERITA.objects.all().db, 'default')
+        dipakai, response = self.jalankan('GET')
+        self.assertEqual(dipakai, ['default', 'default'])
+        dipakai, response = self.jalankan('POST')
+        self.assertNotIn('berita_primary', response.cookies)
+    
+    def test_replika_dari_env(self):
+        """DB_REPLICAS menjadi alias replica_N yang mencerminkan default saat test"""
+        from BERITA.database import replika_dari_env
+        default = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'db.sqlite3', 'CONN_MAX_AGE': 600}
+        env = {'DB_REPLICAS': 'replika1.sqlite3, replika2.sqlite3'}
+        replika = replika_dari_env(lambda nama, default=None, cast=None: env.get(nama, default), default)
+        self.assertEqual(sorted(replika), ['replica_1', 'replica_2'])
+        self.assertEqual(replika['replica_2']['NAME'], 'replika2.sqlite3')
+        self.assertEqual(replika['replica_1']['CONN_MAX_AGE'], 600)
+        self.assertEqual(replika['replica_1']['TEST'], {'MIRROR': 'default'})
+
+
+class MetricsTest(APITestCase):
+    """Test instrumentasi per request (Server-Timing, log JSON, endpoint Prometheus)"""
+    
+    def setUp(self):
+        from .metrics import registry
+        registry.reset()
+        self.BERITA = BERITA.objects.create(judul='Berita metrics', isi_BERITA='Isi')
+        Komentar.objects.create(nama='A', isi_komentar='B', BERITA=self.BERITA)
+    
+    def test_server_timing_dan_log(self):
+        """Header Server-Timing berisi total, db (dengan jumlah query) dan serializer"""
+        import json
+        with self.assertLogs('FITURBERITA.metrics', level='INFO') as log:
+            response = self.client.get(reverse('FITURBERITA:BERITA-detail', args=[self.BERITA.id]))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'total;dur=[\d.]+')
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* query"')
+        self.assertIn('serializer;dur=', timing)
+        data = json.loads(log.records[-1].getMessage())
+        self.assertEqual(data['aksi'], 'BERITA.retrieve')
+        self.assertEqual(data['status'], 200)
+        self.assertGreater(data['query'], 0)
+        self.assertEqual(data['ukuran'], len(response.content))
+    
+    def get_metrics(self, token='rahasia', **extra):
+        if token:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        with self.settings(BERITA_METRICS={'TOKEN': 'rahasia'}):
+            return self.client.get(reverse('FITURBERITA:metrics'), **extra)
+    
+    def test_endpoint_prometheus(self):
+        """Agregat per aksi viewset termasuk histogram latensi"""
+        self.client.get(reverse('FITURBERITA:BERITA-list'))
+        self.client.get(reverse('FITURBERITA:BERITA-komentar', args=[self.BERITA.id]))
+        response = self.get_metrics()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        teks = response.content.decode()
+        self.assertIn('berita_http_requests_total{aksi="BERITA.list",method="GET",status="200"} 1', teks)
+        self.assertIn('berita_http_request_duration_seconds_bucket{aksi="BERITA.komentar",le="+Inf"} 1', teks)
+        self.assertIn('berita_db_queries_per_request_count{aksi="BERITA.list"} 1', teks)
+        self.assertIn('berita_serializer_seconds_total{aksi="BERITA.list"}', teks)
+        # Endpoint metrics sendiri tidak ikut tercatat
+        self.assertNotIn('aksi="metrics"', teks)
+    
+    def test_endpoint_butuh_token_atau_staff(self):
+        """Request dari 127.0.0.1 (mis. lewat reverse proxy lokal) tanpa kredensial ditolak"""
+        from django.contrib.auth.models import User
+        self.assertEqual(self.get_metrics(token=None, REMOTE_ADDR='127.0.0.1').status_code, 403)
+        self.assertEqual(self.get_metrics(token='salah').status_code, 403)
+        self.assertEqual(self.get_metrics().status_code, 200)
+        with self.settings(BERITA_METRICS={'TOKEN': 'rahasia', 'IP_DIIZINKAN': ['10.0.0.1']}):
+            response = self.client.get(
+                reverse('FITURBERITA:metrics'), HTTP_AUTHORIZATION='Bearer rahasia', REMOTE_ADDR='10.0.0.5'
+            )
+        self.assertEqual(response.status_code, 403)
+        
+        user = User.objects.create_user('biasa', password='x')
+        self.client.force_login(user)
+        self.assertEqual(self.get_metrics(token=None).status_code, 403)
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.get_metrics(token=None).status_code, 200)
+    
+    def test_server_timing_default_ikut_debug(self):
+        """Tanpa SERVER_TIMING eksplisit, header hanya dikirim saat DEBUG"""
+        url = reverse('FITURBERITA:BERITA-detail', args=[self.BERITA.id])
+        with self.settings(BERITA_METRICS={'LOG': False}, DEBUG=False):
+            self.assertNotIn('Server-Timing', self.client.get(url))
+        with self.settings(BERITA_METRICS={'LOG': False}, DEBUG=True):
+            self.assertIn('Server-Timing', self.client.get(url))
+    
+    def test_nonaktif(self):
+        """ENABLED=False: tanpa header dan tanpa agregat"""
+        with self.settings(BERITA_METRICS={'ENABLED': False}):
+            response = self.client.get(reverse('FITURBERITA:BERITA-list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('BERITA.list', self.get_metrics().content.decode())
+
+
+class NPlusSatuTest(APITestCase):
+    """Test detektor N+1 query"""
+    
+    def setUp(self):
+        self.BERITA = BERITA.objects.create(judul='Berita N+1', isi_BERITA='Isi')
+        for nomor in range(8):
+            berita = BERITA.objects.create(judul=f'Lain {nomor}', isi_BERITA='Isi')
+            Komentar.objects.create(nama=f'Nama {nomor}', isi_komentar='Isi', BERITA=berita)
+    
+    def test_fingerprint(self):
+        """Query yang hanya berbeda nilai mendapat fingerprint sama"""
+        from .nplus1 import fingerprint
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s) LIMIT 5'),
+        )
+        self.assertEqual(fingerprint("SELECT 'a' FROM t WHERE x = 1"), fingerprint("SELECT 'b' FROM t WHERE x = 22"))
+        self.assertNotEqual(fingerprint('SELECT a FROM t'), fingerprint('SELECT b FROM t'))
+    
+    def test_loop_tanpa_select_related_gagal(self):
+        """Komentar.__str__ di dalam loop memicu NPlusSatuError dengan stack trace ke test ini"""
+        from .nplus1 import NPlusSatuError, lacak
+        with self.assertRaises(NPlusSatuError) as konteks:
+            with lacak(ambang=3):
+                [str(komentar) for komentar in Komentar.objects.all()]
+        self.assertIn('8x SELECT', str(konteks.exception))
+        self.assertIn('tests.py', str(konteks.exception))
+        # Dengan select_related tidak ada pelanggaran
+        with lacak(ambang=3):
+            [str(komentar) for komentar in Komentar.objects.select_related('BERITA')]
+    
+    def test_mode_log(self):
+        """Mode log menulis WARNING, request tetap berhasil"""
+        from .nplus1 import lacak
+        with self.assertLogs('FITURBERITA.nplus1', level='WARNING') as log:
+            with lacak(ambang=3, mode='log', label='tes log'):
+                [komentar.BERITA.judul for komentar in Komentar.objects.all()]
+        self.assertIn('tes log', log.output[0])
+    
+    def test_request_dengan_n_plus_satu_gagal(self):
+        """Middleware melempar error untuk request yang melebihi ambang (mode raise di test suite)"""
+        from django.urls import path
+        from django.http import HttpResponse
+        from .nplus1 import NPlusSatuError
+        
+        def view_buruk(request):
+            return HttpResponse(', '.join(str(komentar) for komentar in Komentar.objects.all()))
+        with self.settings(ROOT_URLCONF=type('urls', (), {'urlpatterns': [path('buruk/', view_buruk)]})):
+            with self.assertRaises(NPlusSatuError):
+                self.client.get('/buruk/')
+    
+    def test_admin_dan_api_tanpa_n_plus_satu(self):
+        """List admin dan API dengan banyak baris lolos pada ambang test suite"""
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@contoh.id', 'rahasia'))
+        for url in (
+            '/admin/FITURBERITA/komentar/',
+            '/admin/FITURBERITA/berita/',
+            f'/admin/FITURBERITA/berita/{self.BERITA.pk}/delete/',
+            reverse('FITURBERITA:BERITA-list'),
+            reverse('FITURBERITA:BERITA-terbaru'),
+            reverse('FITURBERITA:komentar-list'),
+        ):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+
+
+class BenchmarkApiTest(TestCase):
+    """Test harness benchmark (seed, skenario, baseline)"""
+    
+    def test_seed_reproducible_dan_counter_sinkron(self):
+        from .benchmark import seed
+        self.assertEqual(seed(20, 300, batch=7), (20, 300))
+        self.assertEqual(BERITA.objects.count(), 20)
+        self.assertEqual(Komentar.objects.count(), 300)
+        self.assertEqual(sum(BERITA.objects.values_list('jumlah_komentar', flat=True)), 300)
+        # Seed hanya menambah kekurangan
+        self.assertEqual(seed(20, 300), (0, 0))
+        judul = list(BERITA.objects.order_by('pk').values_list('judul', flat=True))
+        BERITA.objects.all().delete()
+        seed(20, 0, batch=7)
+        self.assertEqual(list(BERITA.objects.order_by('pk').values_list('judul', flat=True)), judul)
+    
+    def test_command_dan_baseline(self):
+        """Semua skenario berjalan lewat test client dan hasil tersimpan sebagai baseline"""
+        import json
+        import tempfile
+        from io import StringIO
+        from pathlib import Path
+        from django.core.management import call_command
+        from .benchmark import SKENARIO
+        with tempfile.TemporaryDirectory() as folder:
+            baseline = Path(folder) / 'baseline.json'
+            out = StringIO()
+            call_command(
+                'benchmark_api', '--seed-BERITA', '15', '--seed-komentar', '60',
+                '--request', '6', '--simpan', str(baseline), stdout=out
+            )
+            data = json.loads(baseline.read_text())
+        self.assertEqual(set(data['hasil']), set(SKENARIO))
+        self.assertEqual(data['meta']['dataset']['BERITA'], 15)
+        for nama, angka in data['hasil'].items():
+            self.assertEqual(angka['gagal'], 0, nama)
+            self.assertGreater(angka['query'], 0, nama)
+            self.assertLessEqual(angka['p50_ms'], angka['p99_ms'])
+    
+    def test_bandingkan(self):
+        from .benchmark import bandingkan, persentil
+        self.assertEqual(persentil([1, 2, 3, 4], 0.5), 2)
+        self.assertEqual(persentil([1, 2, 3, 4], 0.99), 4)
+        baseline = {'hasil': {'list': {'p95_ms': 10.0, 'query': 3}}}
+        self.assertEqual(bandingkan({'list': {'p95_ms': 11.5, 'query': 3}}, baseline), [])
+        regresi = bandingkan({'list': {'p95_ms': 20.0, 'query': 4}}, baseline)
+        self.assertEqual(len(regresi), 2)
+        self.assertIn('query per request 3 -> 4', regresi[1])
+
+
+class SerializerCepatTest(APITestCase):
+    """Test jalur serialisasi cepat (values_list + konverter per field, orjson opsional)"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.BERITA = BERITA.objects.create(
+            judul='Berita \u2028 "unik" \u00e9\U0001f600',
+            isi_BERITA='Baris 1\nBaris 2\t\u2029',
+            gambar='BERITA/foto.jpg',
+            gambar_turunan={'thumbnail': {'webp': 'turunan/1/thumbnail.webp', 'lebar': 320}},
+        )
+        BERITA.objects.create(judul='Tanpa gambar', isi_BERITA='Isi')
+        for i in range(3):
+            Komentar.objects.create(nama=f'User {i}', isi_komentar=f'Komentar \x01\u2028 {i}', BERITA=self.BERITA)
+    
+    def ambil(self, url, **pengaturan):
+        """Body response dengan pengaturan BERITA_SERIALIZER_CEPAT tertentu"""
+        from django.core.cache import cache
+        cache.clear()
+        with self.settings(BERITA_SERIALIZER_CEPAT=pengaturan):
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.content
+    
+    def test_output_identik(self):
+        """Jalur cepat (stdlib json dan orjson) sama byte demi byte dengan serializer DRF"""
+        urls = [
+            reverse('FITURBERITA:BERITA-list'),
+            reverse('FITURBERITA:BERITA-list') + '?paginasi=cursor',
+            reverse('FITURBERITA:BERITA-list') + '?ordering=judul',
+            reverse('FITURBERITA:BERITA-komentar', args=[self.BERITA.id]),
+            reverse('FITURBERITA:komentar-list') + '?paginasi=cursor',
+            reverse('FITURBERITA:komentar-list') + f'?BERITA={self.BERITA.id}',
+            reverse('FITURBERITA:async-BERITA-list'),
+            reverse('FITURBERITA:async-BERITA-komentar', args=[self.BERITA.id]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                acuan = self.ambil(url, ENABLED=False, ORJSON=False)
+                self.assertIn(b'\\u2028', acuan)
+                self.assertEqual(self.ambil(url, ENABLED=True, ORJSON=False), acuan)
+                self.assertEqual(self.ambil(url, ENABLED=True, ORJSON=True), acuan)
+    
+    def test_renderer_sama_dengan_jsonrenderer(self):
+        """JSONRendererCepat: tipe yang ditangani encoder DRF dan fallback ber-indent"""
+        from decimal import Decimal
+        from django.utils import timezone
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from .serializer_cepat import JSONRendererCepat
+        data = {
+            'waktu': timezone.now(),
+            'tanggal': timezone.now().date(),
+            'angka': Decimal('1.50'),
+            'lazy': gettext_lazy('Teks'),
+            'besar': 2 ** 70,
+            'daftar': ({'\u2029': [1, None, True]},),
+        }
+        for media_type in (None, 'application/json; indent=2'):
+            with self.subTest(media_type=media_type):
+                self.assertEqual(
+                    JSONRendererCepat().render(data, media_type),
+                    JSONRenderer().render(data, media_type),
+                )
+    
+    def test_field_tidak_didukung(self):
+        """Serializer dengan SerializerMethodField tidak bisa dikompilasi"""
+        from django.core.exceptions import ImproperlyConfigured
+        from .serializer_cepat import SerializerCepat
+        from .serializers import BERITASerializer
+        with self.assertRaises(ImproperlyConfigured):
+            SerializerCepat(BERITASerializer)
+    
+    def test_query_tanpa_instance_model(self):
+        """List lewat jalur cepat tetap 3 query (validator ETag + COUNT + SELECT)"""
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('FITURBERITA:BERITA-list'))
+        self.assertEqual(response.data['count'], 2)
+
+
+class SparseFieldsTest(APITestCase):
+    """Test ringkasan tersimpan dan ?fields= (sparse fieldset)"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.isi = ' '.join(f'kata{i}' for i in range(100))
+        self.BERITA = BERITA.objects.create(judul='Panjang', isi_BERITA=self.isi)
+        Komentar.objects.create(nama='User', isi_komentar='Komentar', BERITA=self.BERITA)
+    
+    def test_buat_ringkasan(self):
+        """Teks pendek utuh, teks panjang dipotong di batas kata dengan '...'"""
+        from .models import buat_ringkasan
+        self.assertEqual(buat_ringkasan('  Isi\n\tpendek  '), 'Isi pendek')
+        ringkasan = buat_ringkasan(self.isi, 50)
+        self.assertTrue(ringkasan.endswith('...'))
+        self.assertLessEqual(len(ringkasan), 53)
+        self.assertTrue(self.isi.startswith(ringkasan[:-3]))
+        self.assertIn(self.isi[len(ringkasan) - 3], ' ')
+    
+    def test_ringkasan_tersimpan(self):
+        """Ringkasan dihitung saat save, save(update_fields) dan bulk_create"""
+        from .models import buat_ringkasan
+        self.assertEqual(self.BERITA.ringkasan, buat_ringkasan(self.isi))
+        self.BERITA.isi_BERITA = 'Isi baru'
+        self.BERITA.save(update_fields=['isi_BERITA'])
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.ringkasan, 'Isi baru')
+        BERITA.objects.bulk_create([BERITA(judul='Bulk', isi_BERITA='Isi bulk')])
+        self.assertEqual(BERITA.objects.get(judul='Bulk').ringkasan, 'Isi bulk')
+    
+    def test_bulk_update_perbarui_ringkasan(self):
+        """PATCH /bulk/ yang mengubah isi_BERITA ikut menulis ringkasan"""
+        response = self.client.patch(
+            reverse('FITURBERITA:BERITA-bulk'),
+            [{'id': self.BERITA.id, 'isi_BERITA': 'Isi lewat bulk'}],
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.ringkasan, 'Isi lewat bulk')
+    
+    def test_fields_list(self):
+        """?fields= hanya mengembalikan field yang diminta dan tidak membaca isi_BERITA"""
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse('FITURBERITA:BERITA-list') + '?fields=id,judul,ringkasan'
+        for pengaturan in ({'ENABLED': True}, {'ENABLED': False}):
+            cache.clear()
+            with self.subTest(**pengaturan), self.settings(BERITA_SERIALIZER_CEPAT=pengaturan):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(list(response.json()['results'][0]), ['id', 'judul', 'ringkasan'])
+                self.assertFalse(any('isi_BERITA' in q['sql'] for q in queries.captured_queries))
+    
+    def test_fields_tidak_dikenal(self):
+        """Field yang tidak ada di serializer ditolak dengan 400"""
+        response = self.client.get(reverse('FITURBERITA:komentar-list') + '?fields=id,password')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', str(response.data))
+    
+    def test_fields_detail_tanpa_komentar(self):
+        """Detail/terbaru tanpa field komentar tidak memuat komentar"""
+        for url in (
+            reverse('FITURBERITA:BERITA-detail', args=[self.BERITA.id]),
+            reverse('FITURBERITA:async-BERITA-detail', args=[self.BERITA.id]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url + '?fields=id,judul', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.json(), {'id': self.BERITA.id, 'judul': 'Panjang'})
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('FITURBERITA:BERITA-terbaru') + '?fields=id,judul')
+        self.assertEqual(list(response.data[0]), ['id', 'judul'])
+
+
+class KompresiTest(APITestCase):
+    """Test kompresi response (negosiasi Accept-Encoding dan varian tersimpan di cache)"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        for i in range(5):
+            BERITA.objects.create(judul=f'BERITA {i}', isi_BERITA='Isi BERITA yang cukup panjang. ' * 20)
+        self.url = reverse('FITURBERITA:BERITA-list')
+    
+    def test_gzip_dinegosiasikan(self):
+        """Response JSON besar dikompres gzip, isi sama dengan response tanpa kompresi"""
+        import gzip
+        from django.core.cache import cache
+        asli = self.client.get(self.url, HTTP_ACCEPT='application/json')
+        self.assertFalse(asli.has_header('Content-Encoding'))
+        cache.clear()
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertLess(len(response.content), len(asli.content))
+        self.assertEqual(gzip.decompress(response.content), asli.content)
+    
+    def test_tidak_dikompres(self):
+        """Response kecil, encoding ditolak (q=0) dan HTML tidak dikompres"""
+        detail = reverse('FITURBERITA:komentar-list')
+        for url, headers in (
+            (detail, {'HTTP_ACCEPT_ENCODING': 'gzip'}),
+            (self.url, {'HTTP_ACCEPT_ENCODING': 'gzip;q=0, identity'}),
+            (self.url, {'HTTP_ACCEPT_ENCODING': 'gzip', 'HTTP_ACCEPT': 'text/html'}),
+        ):
+            with self.subTest(url=url, **headers):
+                response = self.client.get(url, **headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertFalse(response.has_header('Content-Encoding'))
+    
+    def test_pilih_encoding(self):
+        from django.test import RequestFactory
+        from .kompresi import pilih_encoding
+        factory = RequestFactory()
+        kasus = (
+            ('gzip, br', ('br', 'gzip'), 'br'),
+            ('gzip;q=1, br;q=0.5', ('br', 'gzip'), 'gzip'),
+            ('*', ('br', 'gzip'), 'br'),
+            ('*;q=0', ('gzip',), None),
+            ('br', ('gzip',), None),
+            ('', ('gzip',), None),
+        )
+        for header, tersedia, hasil in kasus:
+            with self.subTest(header=header):
+                request = factory.get('/', HTTP_ACCEPT_ENCODING=header)
+                self.assertEqual(pilih_encoding(request, tersedia), hasil)
+    
+    def test_cache_hit_memakai_varian_tersimpan(self):
+        """List halaman pertama: hit cache tidak mengompres ulang"""
+        import gzip
+        from unittest import mock
+        from . import kompresi
+        pertama = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(pertama['X-Cache'], 'MISS')
+        with mock.patch.object(kompresi, 'kompres', side_effect=AssertionError('kompres ulang')):
+            hit = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit['Content-Encoding'], 'gzip')
+        self.assertEqual(hit.content, pertama.content)
+        self.assertEqual(hit['ETag'], pertama['ETag'])
+        # ETag weak tetap cocok untuk conditional GET
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=hit['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Tanpa Accept-Encoding entry yang sama dikirim apa adanya
+        polos = self.client.get(self.url)
+        self.assertEqual(polos['X-Cache'], 'HIT')
+        self.assertEqual(gzip.decompress(hit.content), polos.content)
+    
+    def test_halaman_pertama(self):
+        from django.test import RequestFactory
+        from rest_framework.request import Request
+        from .cache import halaman_pertama
+        factory = RequestFactory()
+        kasus = (
+            ({}, True),
+            ({'page': '1', 'fields': 'id,judul'}, True),
+            ({'page': '2'}, False),
+            ({'search': 'banjir'}, False),
+            ({'paginasi': 'cursor', 'cursor': 'abc'}, False),
+        )
+        for params, hasil in kasus:
+            with self.subTest(params=params):
+                self.assertEqual(halaman_pertama(Request(factory.get('/', params))), hasil)
+
+
+class ThrottleKomentarTest(APITestCase):
+    """Test token bucket komentar (per IP / per BERITA) dan load-shedding tulis"""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.BERITA = BERITA.objects.create(judul='BERITA', isi_BERITA='Isi')
+        self.BERITA_lain = BERITA.objects.create(judul='BERITA lain', isi_BERITA='Isi')
+        self.url = reverse('FITURBERITA:komentar-list')
+    
+    def kirim(self, BERITA_obj=None, ip='10.0.0.1'):
+        data = {'nama': 'User', 'isi_komentar': 'Komentar', 'BERITA': (BERITA_obj or self.BERITA).id}
+        return self.client.post(self.url, data, format='json', REMOTE_ADDR=ip)
+    
+    def batas(self, ip=(100, 1.0), BERITA_batas=(100, 1.0)):
+        return self.settings(BERITA_THROTTLE={
+            'IP': {'KAPASITAS': ip[0], 'PER_DETIK': ip[1]},
+            'BERITA': {'KAPASITAS': BERITA_batas[0], 'PER_DETIK': BERITA_batas[1]},
+        })
+    
+    def test_bucket_per_ip(self):
+        """Burst sebesar KAPASITAS lalu 429 dengan Retry-After; baca tidak dibatasi"""
+        with self.batas(ip=(2, 0.01)):
+            self.assertEqual([self.kirim().status_code for _ in range(2)], [201, 201])
+            response = self.kirim()
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertGreater(int(response['Retry-After']), 0)
+            self.assertEqual(self.kirim(ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.1').status_code, 200)
+        self.assertEqual(Komentar.objects.count(), 3)
+    
+    def test_bucket_per_BERITA(self):
+        """Banyak IP ke satu BERITA tetap dibatasi, BERITA lain tidak terpengaruh"""
+        with self.batas(BERITA_batas=(2, 0.01)):
+            kode = [self.kirim(ip=f'10.0.1.{i}').status_code for i in range(3)]
+            self.assertEqual(kode, [201, 201, 429])
+            self.assertEqual(self.kirim(self.BERITA_lain, ip='10.0.1.9').status_code, 201)
+    
+    def test_ditolak_per_ip_tidak_memakai_bucket_BERITA(self):
+        with self.batas(ip=(1, 0.01), BERITA_batas=(2, 0.01)):
+            self.assertEqual([self.kirim().status_code for _ in range(5)], [201, 429, 429, 429, 429])
+            self.assertEqual(self.kirim(ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+    
+    def test_bulk_memakai_token_per_item(self):
+        """Bulk mengambil token sebanyak item; bulk lebih besar dari KAPASITAS selalu 429"""
+        url = reverse('FITURBERITA:komentar-bulk')
+        
+        def bulk(jumlah, BERITA_obj=None, ip='10.0.0.1'):
+            data = [
+                {'nama': 'User', 'isi_komentar': 'ok', 'BERITA': (BERITA_obj or self.BERITA).id}
+            ] * jumlah
+            return self.client.post(url, data, format='json', REMOTE_ADDR=ip)
+        
+        with self.batas(ip=(5, 0.01)):
+            self.assertEqual(bulk(3).status_code, status.HTTP_201_CREATED)
+            response = bulk(3)
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertGreater(int(response['Retry-After']), 0)
+            self.assertEqual(self.kirim().status_code, status.HTTP_201_CREATED)
+            response = bulk(6, ip='10.0.0.2')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertNotIn('Retry-After', response)
+        with self.batas(BERITA_batas=(4, 0.01)):
+            self.assertEqual(bulk(3, ip='10.0.2.1').status_code, status.HTTP_201_CREATED)
+            self.assertEqual(bulk(2, ip='10.0.2.2').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(bulk(2, self.BERITA_lain, ip='10.0.2.3').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Komentar.objects.count(), 9)
+    
+    def test_bulk_validasi_di_luar_lock_tulis(self):
+        """Item bulk divalidasi sebelum lock tulis diambil; semua gagal tidak menyentuh lock"""
+        from unittest import mock
+        from . import throttling
+        from .serializers import KomentarSerializer
+        url = reverse('FITURBERITA:komentar-bulk')
+        tulis_asli = throttling.penjaga_tulis.tulis
+        validasi_asli = KomentarSerializer.run_validation
+        dalam_lock = []
+        
+        def validasi(serializer, data):
+            dalam_lock.append(throttling.penjaga_tulis.aktif)
+            return validasi_asli(serializer, data)
+        
+        with mock.patch.object(throttling.penjaga_tulis, 'tulis', wraps=tulis_asli) as tulis, \
+                mock.patch.object(KomentarSerializer, 'run_validation', validasi):
+            response = self.client.post(url, [{'nama': 'A', 'isi_komentar': ''}], format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            tulis.assert_not_called()
+            response = self.client.post(
+                url, [{'nama': 'A', 'isi_komentar': 'ok', 'BERITA': self.BERITA.id}] * 2, format='json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            tulis.assert_called_once()
+        self.assertEqual(dalam_lock, [0, 0, 0])
+    
+    def test_ambil_token_terisi_ulang(self):
+        from django.core.cache import cache
+        from .throttling import ambil_token
+        self.assertEqual([ambil_token(cache, 'uji', 2, 0.5, sekarang=100) for _ in range(2)], [0, 0])
+        self.assertAlmostEqual(ambil_token(cache, 'uji', 2, 0.5, sekarang=100), 2.0)
+        self.assertAlmostEqual(ambil_token(cache, 'uji', 2, 0.5, sekarang=101), 1.0)
+        self.assertEqual(ambil_token(cache, 'uji', 2, 0.5, sekarang=102), 0)
+    
+    def test_konfigurasi_bucket_tidak_valid(self):
+        """PER_DETIK atau KAPASITAS 0 ditolak saat konfigurasi dibaca, bukan ZeroDivisionError"""
+        from django.core.exceptions import ImproperlyConfigured
+        from .throttling import get_config
+        for bucket in ({'KAPASITAS': 5, 'PER_DETIK': 0}, {'KAPASITAS': 0, 'PER_DETIK': 1.0}):
+            with self.subTest(bucket=bucket), self.settings(BERITA_THROTTLE={'IP': bucket}), \
+                    self.assertRaises(ImproperlyConfigured):
+                get_config()
+    
+    def test_fallback_fixed_window(self):
+        """Cache gagal: batas tetap berlaku lewat fixed window per proses"""
+        from unittest import mock
+        from . import throttling
+        jendela = throttling.JendelaTetap()
+        hasil = [jendela.ambil('k', 2, 10, sekarang=t) for t in (1, 2, 3, 11)]
+        self.assertEqual(hasil, [0, 0, 7, 0])
+        with self.batas(ip=(2, 0.01)), \
+                mock.patch.object(throttling, 'jendela_lokal', throttling.JendelaTetap()), \
+                mock.patch.object(throttling, 'ambil_token', side_effect=ConnectionError('cache mati')), \
+                self.assertLogs('FITURBERITA.throttling', 'WARNING'):
+            kode = [self.kirim().status_code for _ in range(3)]
+        self.assertEqual(kode, [201, 201, 429])
+    
+    def test_shedding_antrian_penuh(self):
+        """Antrian tulis penuh: 503 dengan Retry-After tanpa menulis, juga untuk bulk"""
+        from unittest import mock
+        from . import throttling
+        with mock.patch.object(throttling.penjaga_tulis, 'aktif', throttling.get_config()['MAKS_ANTRIAN']), \
+                self.assertLogs('FITURBERITA.throttling', 'WARNING'):
+            response = self.kirim()
+            bulk = self.client.post(
+                reverse('FITURBERITA:komentar-bulk'),
+                [{'nama': 'A', 'isi_komentar': 'ok', 'BERITA': self.BERITA.id}], format='json'
+            )
+        for hasil in (response, bulk):
+            self.assertEqual(hasil.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(hasil['Retry-After'], '1')
+        self.assertEqual(Komentar.objects.count(), 0)
+        self.assertEqual(throttling.penjaga_tulis.aktif, 0)
+        self.assertEqual(self.kirim().status_code, status.HTTP_201_CREATED)
+    
+    def test_shedding_tunggu_lock(self):
+        """Tunggu lock tinggi menolak tulis lalu meluruh sendiri"""
+        from .throttling import LayananSibuk, PenjagaTulis
+        penjaga = PenjagaTulis()
+        penjaga._catat_tunggu(2.0, 5.0, sekarang=100.0)
+        self.assertAlmostEqual(penjaga.tunggu_lock(5.0, sekarang=100.0), 2.0)
+        self.assertAlmostEqual(penjaga.tunggu_lock(5.0, sekarang=110.0), 0.5)
+        penjaga._waktu_sampel = None
+        penjaga._menunggu[object()] = 0.0  # penulis yang masih menunggu sejak lama
+        with self.assertRaises(LayananSibuk), self.assertLogs('FITURBERITA.throttling', 'WARNING'):
+            penjaga.cek()
+
+
+class BufferKomentarTest(APITestCase):
+    """Test write-behind POST komentar (FITURBERITA/buffer_komentar.py)"""
+    
+    def setUp(self):
+        import tempfile
+        from unittest import mock
+        from django.core.cache import cache
+        from . import buffer_komentar
+        cache.clear()
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        # Buffer baru per test agar antrian/jurnal tidak terbawa antar test
+        patcher = mock.patch.object(buffer_komentar, '_buffer', buffer_komentar.BufferKomentar())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: buffer_komentar._buffer.hentikan())
+        self.BERITA = BERITA.objects.create(judul='BERITA', isi_BERITA='Isi')
+        self.BERITA_lain = BERITA.objects.create(judul='BERITA lain', isi_BERITA='Isi')
+        self.url = reverse('FITURBERITA:komentar-list')
+    
+    def buffer(self, **config):
+        return self.settings(BERITA_BUFFER_KOMENTAR={
+            'ENABLED': True, 'FLUSHER_LATAR': False, 'JURNAL_DIR': self.folder.name, **config,
+        })
+    
+    def kirim(self, BERITA_obj=None, isi='Komentar'):
+        data = {'nama': 'User', 'isi_komentar': isi, 'BERITA': (BERITA_obj or self.BERITA).id}
+        return self.client.post(self.url, data, format='json')
+    
+    def test_202_lalu_flush(self):
+        """POST dijawab 202 tanpa id; komentar dan counter muncul setelah flush"""
+        import os
+        from pathlib import Path
+        from . import buffer_komentar
+        with self.buffer():
+            response = self.kirim()
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertNotIn('id', response.data['data'])
+            self.assertEqual(response.data['data']['BERITA_judul'], 'BERITA')
+            self.assertEqual(Komentar.objects.count(), 0)
+            self.assertEqual(buffer_komentar.jumlah_tertunda(), 1)
+            jurnal = Path(self.folder.name) / f'komentar-{os.getpid()}.jsonl'
+            self.assertGreater(jurnal.stat().st_size, 0)
+            
+            self.assertEqual(buffer_komentar.flush(), 1)
+        self.assertEqual(Komentar.objects.get().isi_komentar, 'Komentar')
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 1)
+        self.assertEqual(buffer_komentar.jumlah_tertunda(), 0)
+        self.assertEqual(jurnal.stat().st_size, 0)
+    
+    def test_query_per_batch_konstan(self):
+        """Counter dan invalidasi sekali per batch: jumlah query tidak tumbuh dengan jumlah komentar"""
+        import os
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from . import buffer_komentar
+        jumlah_query = []
+        with self.buffer(DURABILITAS='memori', MAKS_BARIS=100), \
+                self.settings(BERITA_THROTTLE={'ENABLED': False}):
+            for jumlah in (2, 40):
+                for i in range(jumlah):
+                    self.kirim(self.BERITA if i % 2 else self.BERITA_lain)
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(buffer_komentar.flush(), jumlah)
+                jumlah_query.append(len(queries))
+        self.assertEqual(jumlah_query[0], jumlah_query[1])
+        self.assertEqual(
+            list(BERITA.objects.order_by('id').values_list('jumlah_komentar', flat=True)), [21, 21]
+        )
+        self.assertEqual(os.listdir(self.folder.name), [])  # DURABILITAS memori: tanpa jurnal
+    
+    def test_BERITA_dihapus_dibuang(self):
+        from . import buffer_komentar
+        with self.buffer():
+            self.kirim()
+            self.kirim(self.BERITA_lain)
+            self.BERITA.delete()
+            with self.assertLogs('FITURBERITA.buffer_komentar', 'WARNING'):
+                self.assertEqual(buffer_komentar.flush(), 2)
+        self.assertEqual(list(Komentar.objects.values_list('BERITA_id', flat=True)), [self.BERITA_lain.id])
+    
+    def test_antrian_penuh_503(self):
+        with self.buffer(MAKS_ANTRIAN=1):
+            self.assertEqual(self.kirim().status_code, status.HTTP_202_ACCEPTED)
+            response = self.kirim()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+    
+    def test_pulihkan_jurnal_proses_mati(self):
+        """Jurnal proses mati diputar ulang tanpa komentar yang sudah ditandai selesai"""
+        import io
+        import json
+        from pathlib import Path
+        from django.core.management import call_command
+        baris = [
+            {'k': str(i), 'd': {'nama': 'User', 'isi_komentar': f'isi {i}', 'BERITA_id': self.BERITA.id}}
+            for i in range(3)
+        ]
+        jurnal = Path(self.folder.name) / 'komentar-999999.jsonl'
+        jurnal.write_text(
+            ''.join(json.dumps(data) + '\n' for data in baris)
+            + json.dumps({'selesai': ['0']}) + '\n'
+            + '{"k": "3", "d": {"nam'  # baris terpotong saat crash
+        )
+        with self.buffer(), self.assertLogs('FITURBERITA.buffer_komentar', 'WARNING'):
+            call_command('flush_buffer_komentar', stdout=io.StringIO())
+        self.assertEqual(
+            sorted(Komentar.objects.values_list('isi_komentar', flat=True)), ['isi 1', 'isi 2']
+        )
+        self.assertFalse(jurnal.exists())
+        self.BERITA.refresh_from_db()
+        self.assertEqual(self.BERITA.jumlah_komentar, 2)
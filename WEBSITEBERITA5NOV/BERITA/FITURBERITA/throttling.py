@@ -0,0 +1,310 @@
+"""
+FITURBERITA/throttling.py
+Rate limiting dan load-shedding untuk penulisan komentar
+
+SQLite hanya punya satu penulis: banjir komentar ke satu BERITA membuat
+penulis lain antre di busy timeout, worker habis menunggu lock dan request
+baca ikut tertahan. Dua lapis perlindungan (PelindungTulisMixin):
+
+1. Throttle token bucket (DRF throttle), state di Django cache:
+    - KomentarIPThrottle     : per IP client (REST_FRAMEWORK['NUM_PROXIES'] di belakang proxy)
+    - KomentarBERITAThrottle : per BERITA tujuan, membatasi banjir dari banyak IP
+   Bucket berisi KAPASITAS token (burst) dan terisi PER_DETIK token per
+   detik; setiap komentar mengambil satu token, juga setiap item bulk
+   (POST/PATCH /bulk/ mengambil token sebanyak item, per BERITA tujuan di
+   bucket BERITA). Token kurang: 429 dengan Retry-After; bulk yang lebih
+   besar dari KAPASITAS selalu 429 (tanpa Retry-After). Baca-tulis state
+   tidak atomik antar worker, sehingga saat bersamaan beberapa request bisa
+   lolos melebihi batas (perkiraan, bukan kuota).
+   Jika cache gagal (mis. Redis mati) dipakai fixed window per proses:
+   KAPASITAS request per jendela KAPASITAS / PER_DETIK detik.
+
+2. Load-shedding (PenjagaTulis, per proses): request tulis ditolak 503 dengan
+   Retry-After sebelum menyentuh database jika
+    - jumlah tulis yang sedang berjalan/menunggu lock >= MAKS_ANTRIAN
+    - tunggu lock tulis >= MAKS_TUNGGU_LOCK detik: penulis yang masih
+      menunggu paling lama, atau rata-rata tunggu terakhir (EWMA) yang
+      meluruh dengan PARUH_WAKTU agar shedding berhenti sendiri
+   Tunggu lock = waktu masuk transaction.atomic() (setelah validasi, hanya
+   di sekitar insert/update); dengan SQLite
+   transaction_mode IMMEDIATE (BERITA/database.py) itu adalah BEGIN IMMEDIATE
+   yang menunggu write lock. Di PostgreSQL angkanya ~0 dan hanya MAKS_ANTRIAN
+   yang berlaku.
+
+Konfigurasi di settings.BERITA_THROTTLE:
+    ENABLED          : aktif/nonaktif (throttle dan shedding)
+    ALIAS            : alias di settings.CACHES untuk state bucket
+    IP, BERITA       : {'KAPASITAS': burst, 'PER_DETIK': isi ulang token per detik}
+                       (keduanya harus > 0; untuk mematikan throttle pakai ENABLED)
+    MAKS_ANTRIAN     : batas tulis bersamaan per proses
+    MAKS_TUNGGU_LOCK : batas tunggu lock (detik)
+    PARUH_WAKTU      : paruh waktu peluruhan rata-rata tunggu lock (detik)
+    RETRY_AFTER      : Retry-After (detik) untuk 503
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger('FITURBERITA.throttling')
+
+PREFIX = 'berita:throttle'
+
+DEFAULT_CONFIG = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'IP': {'KAPASITAS': 10, 'PER_DETIK': 0.2},
+    'BERITA': {'KAPASITAS': 30, 'PER_DETIK': 1.0},
+    'MAKS_ANTRIAN': 8,
+    'MAKS_TUNGGU_LOCK': 1.0,
+    'PARUH_WAKTU': 5.0,
+    'RETRY_AFTER': 1,
+}
+
+
+def get_config():
+    """Gabungkan konfigurasi dari settings dengan default"""
+    config = {**DEFAULT_CONFIG, **getattr(settings, 'BERITA_THROTTLE', {})}
+    for scope in ('IP', 'BERITA'):
+        bucket = config[scope]
+        if not (bucket['KAPASITAS'] > 0 and bucket['PER_DETIK'] > 0):
+            raise ImproperlyConfigured(
+                f'BERITA_THROTTLE {scope} KAPASITAS dan PER_DETIK harus lebih dari 0'
+            )
+    return config
+
+
+def ambil_token(cache, key, kapasitas, per_detik, sekarang=None, jumlah=1):
+    """
+    Ambil jumlah token dari bucket di cache
+    Return 0 jika berhasil, atau detik sampai token cukup (inf jika jumlah > kapasitas)
+    """
+    if jumlah > kapasitas:
+        return math.inf
+    sekarang = time.time() if sekarang is None else sekarang
+    state = cache.get(key)
+    token, waktu = state if state is not None else (kapasitas, sekarang)
+    token = min(kapasitas, token + max(sekarang - waktu, 0) * per_detik)
+    # Bucket yang tidak disentuh sampai penuh lagi tidak perlu disimpan
+    timeout = math.ceil(kapasitas / per_detik) + 1
+    if token < jumlah:
+        cache.set(key, (token, sekarang), timeout)
+        return (jumlah - token) / per_detik
+    cache.set(key, (token - jumlah, sekarang), timeout)
+    return 0
+
+
+class JendelaTetap:
+    """Fixed window per proses (fallback jika cache tidak bisa dipakai)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hitungan = {}  # key -> (nomor jendela, jumlah)
+
+    def ambil(self, key, batas, panjang, sekarang=None, jumlah=1):
+        """Return 0 jika jumlah masih muat di bawah batas, atau detik sampai jendela berikutnya"""
+        if jumlah > batas:
+            return math.inf
+        sekarang = time.time() if sekarang is None else sekarang
+        jendela = int(sekarang // panjang)
+        with self._lock:
+            nomor, terpakai = self._hitungan.get(key, (jendela, 0))
+            if nomor != jendela:
+                # Jendela baru: buang hitungan jendela lama semua key agar dict tidak tumbuh
+                self._hitungan = {k: v for k, v in self._hitungan.items() if v[0] == jendela}
+                terpakai = 0
+            if terpakai + jumlah > batas:
+                return (jendela + 1) * panjang - sekarang
+            self._hitungan[key] = (jendela, terpakai + jumlah)
+            return 0
+
+
+jendela_lokal = JendelaTetap()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle DRF dengan token bucket di Django cache
+    Subclass mengatur scope (kunci di config) dan get_biaya()
+    """
+    scope = None
+
+    def get_biaya(self, request, view):
+        """{identitas bucket: jumlah token} untuk request ini, kosong jika tidak dibatasi"""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.tunggu = 0
+        config = get_config()
+        if not config['ENABLED']:
+            return True
+        kapasitas = config[self.scope]['KAPASITAS']
+        per_detik = config[self.scope]['PER_DETIK']
+        for ident, jumlah in self.get_biaya(request, view).items():
+            key = f'{PREFIX}:{self.scope}:{ident}'
+            try:
+                self.tunggu = ambil_token(
+                    caches[config['ALIAS']], key, kapasitas, per_detik, jumlah=jumlah
+                )
+            except Exception:
+                logger.warning('Cache throttle tidak bisa dipakai, fallback fixed window per proses', exc_info=True)
+                self.tunggu = jendela_lokal.ambil(key, kapasitas, kapasitas / per_detik, jumlah=jumlah)
+            if self.tunggu:
+                return False
+        return True
+
+    def wait(self):
+        if math.isinf(self.tunggu):
+            return None  # bulk lebih besar dari KAPASITAS: menunggu pun tidak akan lolos
+        return math.ceil(self.tunggu) or None
+
+
+def item_tulis(request):
+    """Item yang ditulis request: list body bulk, atau body create sebagai satu item"""
+    return request.data if isinstance(request.data, list) else [request.data]
+
+
+class KomentarIPThrottle(TokenBucketThrottle):
+    scope = 'IP'
+
+    def get_biaya(self, request, view):
+        jumlah = len(item_tulis(request))
+        return {self.get_ident(request): jumlah} if jumlah else {}
+
+
+class KomentarBERITAThrottle(TokenBucketThrottle):
+    scope = 'BERITA'
+
+    def get_biaya(self, request, view):
+        biaya = {}
+        for item in item_tulis(request):
+            try:
+                BERITA_id = int(item.get('BERITA'))
+            except (AttributeError, TypeError, ValueError):
+                continue  # biarkan validasi serializer yang menjawab 400
+            biaya[BERITA_id] = biaya.get(BERITA_id, 0) + 1
+        return biaya
+
+
+class LayananSibuk(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server sedang sibuk menulis data, coba lagi sebentar lagi.'
+    default_code = 'layanan_sibuk'
+
+    def __init__(self, detail=None, wait=None):
+        super().__init__(detail)
+        self.wait = wait
+
+
+class PenjagaTulis:
+    """Antrian tulis dan tunggu lock di proses ini untuk load-shedding"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.aktif = 0
+        self._menunggu = {}  # penanda tulis -> waktu mulai menunggu lock
+        self._rata_tunggu = 0.0
+        self._waktu_sampel = None
+
+    def tunggu_lock(self, paruh_waktu, sekarang=None):
+        """Perkiraan tunggu lock (detik) saat ini"""
+        sekarang = time.monotonic() if sekarang is None else sekarang
+        with self._lock:
+            terlama = max((sekarang - mulai for mulai in self._menunggu.values()), default=0.0)
+            rata = 0.0
+            if self._waktu_sampel is not None:
+                rata = self._rata_tunggu * 0.5 ** ((sekarang - self._waktu_sampel) / paruh_waktu)
+        return max(terlama, rata)
+
+    def _catat_tunggu(self, detik, paruh_waktu, sekarang):
+        if self._waktu_sampel is None:
+            self._rata_tunggu = detik
+        else:
+            bobot = 0.5 ** ((sekarang - self._waktu_sampel) / paruh_waktu)
+            self._rata_tunggu = self._rata_tunggu * bobot + detik * (1 - bobot)
+        self._waktu_sampel = sekarang
+
+    def cek(self):
+        """Lempar LayananSibuk jika antrian tulis atau tunggu lock melewati batas"""
+        config = get_config()
+        if not config['ENABLED']:
+            return
+        if self.aktif >= config['MAKS_ANTRIAN']:
+            logger.warning('Tulis ditolak: %d tulis sedang berjalan', self.aktif)
+            raise LayananSibuk(wait=config['RETRY_AFTER'])
+        tunggu = self.tunggu_lock(config['PARUH_WAKTU'])
+        if tunggu >= config['MAKS_TUNGGU_LOCK']:
+            logger.warning('Tulis ditolak: tunggu lock %.2f detik', tunggu)
+            raise LayananSibuk(wait=config['RETRY_AFTER'])
+
+    @contextmanager
+    def tulis(self):
+        """Jalankan tulis di dalam transaksi sambil mengukur antrian dan tunggu lock"""
+        paruh_waktu = get_config()['PARUH_WAKTU']
+        penanda = object()
+        with self._lock:
+            self.aktif += 1
+            self._menunggu[penanda] = time.monotonic()
+        try:
+            # savepoint=False: di dalam transaksi luar tidak menambah SAVEPOINT (lock sudah dipegang)
+            with transaction.atomic(savepoint=False):
+                sekarang = time.monotonic()
+                with self._lock:
+                    self._catat_tunggu(sekarang - self._menunggu.pop(penanda), paruh_waktu, sekarang)
+                yield
+        finally:
+            with self._lock:
+                self.aktif -= 1
+                self._menunggu.pop(penanda, None)
+
+
+penjaga_tulis = PenjagaTulis()
+
+
+class PelindungTulisMixin:
+    """
+    Mixin ViewSet (bersama BulkMixin): throttle dan load-shedding untuk action tulis
+
+    Atribut yang diatur di ViewSet:
+    - throttle_tulis_actions : action yang diberi throttle_tulis_classes
+    - throttle_tulis_classes : throttle token bucket untuk action tersebut
+    - shed_actions           : action yang ditolak 503 saat antrian/tunggu lock tinggi
+    Transaksi bulk (BulkMixin.transaksi_bulk) lewat penjaga_tulis: validasi
+    item berjalan sebelum lock tulis diambil
+    """
+    throttle_tulis_actions = ('create', 'bulk')
+    throttle_tulis_classes = ()
+    shed_actions = ('create', 'bulk')
+
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action in self.throttle_tulis_actions:
+            throttles += [throttle() for throttle in self.throttle_tulis_classes]
+        return throttles
+
+    def check_throttles(self, request):
+        # Shedding dicek lebih dulu: murah dan tidak memakai token bucket
+        if self.action in self.shed_actions:
+            penjaga_tulis.cek()
+        # Berbeda dengan DRF, berhenti di throttle pertama yang menolak: request
+        # yang ditolak per IP tidak ikut menghabiskan bucket per BERITA
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    def perform_create(self, serializer):
+        with penjaga_tulis.tulis():
+            super().perform_create(serializer)
+
+    def transaksi_bulk(self):
+        return penjaga_tulis.tulis()
@@ -5,7 +5,9 @@ URL routing untuk app FITURBERITA (REST API)
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BERITAViewSet, KomentarViewSet
+from . import async_views
+from .metrics import metrics_view
+from .views import BERITAViewSet, KomentarViewSet, CacheStatistikView
 
 # namespace app (opsional)
 app_name = "FITURBERITA"
@@ -15,8 +17,25 @@ router = DefaultRouter()
 router.register(r'BERITA', BERITAViewSet, basename='BERITA')
 router.register(r'komentar', KomentarViewSet, basename='komentar')
 
+# jalur baca async native (untuk deployment ASGI), lihat FITURBERITA/async_views.py
+async_urlpatterns = [
+    path('BERITA/', async_views.BERITA_list, name='async-BERITA-list'),
+    path('BERITA/terbaru/', async_views.BERITA_terbaru, name='async-BERITA-terbaru'),
+    path('BERITA/<int:pk>/', async_views.BERITA_detail, name='async-BERITA-detail'),
+    path('BERITA/<int:pk>/komentar/', async_views.BERITA_komentar, name='async-BERITA-komentar'),
+    path(
+        'BERITA/<int:pk>/komentar/stream/',
+        async_views.BERITA_komentar_stream,
+        name='async-BERITA-komentar-stream'
+    ),
+]
+
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/', include(async_urlpatterns)),
+    path('cache/statistik/', CacheStatistikView.as_view(), name='cache-statistik'),
+    # metrics format Prometheus (lihat FITURBERITA/metrics.py)
+    path('metrics/', metrics_view, name='metrics'),
     # auth endpoint opsional (browsable API login/logout)
     path('auth/', include('rest_framework.urls', namespace='rest_framework')),
 ]
@@ -3,20 +3,40 @@ FITURBERITA/views.py
 Views untuk API BERITA dan Komentar menggunakan ViewSet
 """
 
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, filters, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from . import buffer_komentar
+from . import cache as response_cache
+from .bulk import BulkMixin
+from .cache import cache_response
+from .conditional import (
+    conditional_response,
+    validator_detail,
+    validator_list,
+    validator_semua_BERITA,
+)
+from .export import ExportMixin
 from .models import BERITA, Komentar
+from .pagination import BERITAPagination, KomentarPagination
+from .search import FullTextSearchFilter
+from .serializer_cepat import SerializerCepatMixin
+from .signals import sinkronkan_komentar_massal
+from .throttling import KomentarBERITAThrottle, KomentarIPThrottle, PelindungTulisMixin
 from .serializers import (
     BERITASerializer, 
     BERITAListSerializer, 
     KomentarSerializer,
-    KomentarCreateSerializer
+    KomentarCreateSerializer,
+    kolom_diminta,
+    muat_komentar_terbaru,
+    perlu_komentar_terbaru,
 )
 
 
-class BERITAViewSet(viewsets.ModelViewSet):
+class BERITAViewSet(SerializerCepatMixin, BulkMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet untuk CRUD BERITA
     
@@ -28,13 +48,71 @@ class BERITAViewSet(viewsets.ModelViewSet):
     - PATCH /api/BERITA/{id}/ : Partial update BERITA
     - DELETE /api/BERITA/{id}/ : Hapus BERITA
     - GET /api/BERITA/{id}/komentar/ : List komentar untuk BERITA tertentu
+    - POST/PATCH /api/BERITA/bulk/ : Bulk create / bulk update BERITA
+    - GET /api/BERITA/export/ : Export streaming NDJSON/CSV (?jenis=csv, ?since=)
+    
+    List mendukung keyset pagination opt-in: GET /api/BERITA/?paginasi=cursor
+    Sparse fieldset di list/detail/terbaru: GET /api/BERITA/?fields=id,judul,ringkasan
     """
     queryset = BERITA.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['judul', 'isi_BERITA']  # Field yang bisa di-search
+    pagination_class = BERITAPagination
+    # FullTextSearchFilter diletakkan setelah OrderingFilter agar bisa urut by relevansi
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    search_fields = ['judul', 'isi_BERITA']  # Field yang bisa di-search (fallback LIKE)
     ordering_fields = ['tanggal', 'judul']  # Field yang bisa di-order
     ordering = ['-tanggal']  # Default ordering
     
+    # Kolom yang benar-benar dipakai serializer per action (untuk .only())
+    list_fields = [
+        'id', 'judul', 'tanggal', 'isi_BERITA', 'ringkasan', 'gambar', 'gambar_turunan',
+        'jumlah_komentar'
+    ]
+    komentar_fields = ['id', 'nama', 'tanggal', 'isi_komentar', 'BERITA']
+    
+    def get_komentar_queryset(self):
+        """Queryset komentar terurut untuk nested komentar dan action komentar"""
+        return (
+            Komentar.objects
+            .only(*self.komentar_fields)
+            .order_by('-tanggal', '-id')
+        )
+    
+    def get_kolom_diminta(self, serializer_class=None):
+        """
+        Kolom untuk ?fields= (tanggal selalu ikut untuk cursor keyset), disimpan
+        per request karena get_queryset juga dipanggil validator ETag
+        """
+        serializer_class = serializer_class or self.get_serializer_class()
+        if not hasattr(self, '_kolom_diminta'):
+            self._kolom_diminta = {}
+        if serializer_class not in self._kolom_diminta:
+            self._kolom_diminta[serializer_class] = kolom_diminta(
+                serializer_class, self.get_serializer_context(), wajib=('tanggal',)
+            )
+        return self._kolom_diminta[serializer_class]
+    
+    def get_queryset(self):
+        """
+        Bentuk queryset sesuai action agar jumlah query tetap konstan:
+        - list: proyeksi kolom dengan .only(), jumlah komentar dari counter
+        - retrieve/terbaru: nested komentar dimuat terpisah dengan LIMIT per BERITA
+          (retrieve lewat BERITASerializer, terbaru lewat muat_komentar_terbaru)
+        - komentar: hanya kolom BERITA yang dipakai di response
+        ?fields= mempersempit .only() ke kolom field yang diminta
+        """
+        queryset = super().get_queryset()
+        if self.action == 'komentar':
+            return queryset.only('id', 'judul', 'jumlah_komentar')
+        if self.pakai_serializer_cepat():
+            return queryset  # values_list() di SerializerCepat yang memilih kolom
+        if self.action in ('list', 'retrieve', 'terbaru'):
+            kolom = self.get_kolom_diminta()
+            if kolom is not None:
+                return queryset.only(*kolom)
+        if self.action == 'list':
+            return queryset.only(*self.list_fields)
+        return queryset
+    
     def get_serializer_class(self):
         """
         Gunakan serializer berbeda untuk list dan detail
@@ -45,6 +123,45 @@ class BERITAViewSet(viewsets.ModelViewSet):
             return BERITAListSerializer
         return BERITASerializer
     
+    # List dan action komentar: tuple values_list() tanpa instance model (serializer_cepat.py)
+    serializer_cepat_actions = {
+        'list': BERITAListSerializer,
+        'komentar': KomentarSerializer,
+    }
+    
+    # Bulk: response memakai serializer ringkas (tanpa nested komentar per item)
+    bulk_output_serializer_class = BERITAListSerializer
+    bulk_label = 'BERITA'
+    
+    export_fields = (
+        'id', 'judul', 'isi_BERITA', 'tanggal', 'diperbarui', 'gambar', 'jumlah_komentar'
+    )
+    export_nama = 'BERITA'
+    
+    def setelah_bulk_create(self, objs):
+        """bulk_create tidak mengirim signal: invalidasi cache sekali untuk semua item"""
+        response_cache.invalidasi(
+            scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU)
+        )
+    
+    def setelah_bulk_update(self, objs, nilai_lama):
+        response_cache.invalidasi(
+            scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+            detail_ids=[obj.pk for obj in objs]
+        )
+    
+    @cache_response(response_cache.SCOPE_LIST, prakompresi=response_cache.halaman_pertama)
+    @conditional_response(validator_list)
+    def list(self, request, *args, **kwargs):
+        """List BERITA (response di-cache, diinvalidasi oleh signals)"""
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response(response_cache.SCOPE_DETAIL, ident_kwarg='pk')
+    @conditional_response(validator_detail)
+    def retrieve(self, request, *args, **kwargs):
+        """Detail BERITA (response di-cache per id, diinvalidasi oleh signals)"""
+        return super().retrieve(request, *args, **kwargs)
+    
     def create(self, request, *args, **kwargs):
         """Override create untuk custom response"""
         serializer = self.get_serializer(data=request.data)
@@ -82,32 +199,58 @@ class BERITAViewSet(viewsets.ModelViewSet):
         )
     
     @action(detail=True, methods=['get'])
+    @conditional_response(validator_detail)
     def komentar(self, request, pk=None):
         """
-        Custom action untuk mendapatkan semua komentar dari BERITA tertentu
+        Custom action untuk mendapatkan komentar dari BERITA tertentu
         Endpoint: GET /api/BERITA/{id}/komentar/
+        
+        Dipaginasi dengan keyset (ikuti link next), ?since=<ISO datetime>
+        untuk mengambil komentar baru saja (eksklusif per detik, lihat KomentarPagination)
         """
         BERITA = self.get_object()
-        komentar = BERITA.komentar.all()
-        serializer = KomentarSerializer(komentar, many=True)
+        paginator = KomentarPagination()
+        cepat = self.get_serializer_cepat()
+        queryset = self.get_komentar_queryset().filter(BERITA=BERITA)
+        if cepat is not None:
+            queryset = cepat.siapkan(queryset)
+        else:
+            kolom = self.get_kolom_diminta(KomentarSerializer)
+            if kolom is not None:
+                queryset = queryset.only(*kolom)
+        komentar = paginator.paginate_queryset(queryset, request, view=self)
+        if cepat is not None:
+            data = cepat.serialisasi(komentar)
+        else:
+            data = KomentarSerializer(
+                komentar, many=True, context=self.get_serializer_context()
+            ).data
         return Response({
             'BERITA': BERITA.judul,
-            'jumlah_komentar': komentar.count(),
-            'komentar': serializer.data
+            'jumlah_komentar': BERITA.jumlah_komentar,
+            'komentar': data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
         })
     
     @action(detail=False, methods=['get'])
+    @cache_response(response_cache.SCOPE_TERBARU, prakompresi=True)
+    @conditional_response(validator_semua_BERITA)
     def terbaru(self, request):
         """
         Custom action untuk mendapatkan 5 BERITA terbaru
         Endpoint: GET /api/BERITA/terbaru/
         """
-        BERITA_terbaru = self.queryset[:5]
+        BERITA_terbaru = self.get_queryset()[:5]
+        if perlu_komentar_terbaru(self.get_serializer_context()):
+            BERITA_terbaru = muat_komentar_terbaru(BERITA_terbaru, self.get_komentar_queryset())
         serializer = self.get_serializer(BERITA_terbaru, many=True)
         return Response(serializer.data)
 
 
-class KomentarViewSet(viewsets.ModelViewSet):
+class KomentarViewSet(
+    PelindungTulisMixin, SerializerCepatMixin, BulkMixin, ExportMixin, viewsets.ModelViewSet
+):
     """
     ViewSet untuk CRUD Komentar
     
@@ -118,14 +261,84 @@ class KomentarViewSet(viewsets.ModelViewSet):
     - PUT /api/komentar/{id}/ : Update komentar
     - PATCH /api/komentar/{id}/ : Partial update komentar
     - DELETE /api/komentar/{id}/ : Hapus komentar
+    - POST/PATCH /api/komentar/bulk/ : Bulk create / bulk update komentar
+    - GET /api/komentar/export/ : Export streaming NDJSON/CSV (?jenis=csv, ?since=)
+    
+    List mendukung keyset pagination opt-in: GET /api/komentar/?paginasi=cursor
+    Sparse fieldset di list/detail: GET /api/komentar/?fields=id,nama
+    POST dan bulk (per item) dibatasi token bucket per IP dan per BERITA (429), create/bulk ditolak
+    503 saat antrian tulis atau tunggu lock database tinggi (FITURBERITA/throttling.py)
+    Dengan write-behind aktif POST dijawab 202 tanpa id dan ditulis per batch
+    (FITURBERITA/buffer_komentar.py)
     """
     queryset = Komentar.objects.all()
+    pagination_class = BERITAPagination
     serializer_class = KomentarSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['BERITA', 'nama']  # Field yang bisa di-filter
     ordering_fields = ['tanggal']  # Field yang bisa di-order
     ordering = ['-tanggal']  # Default ordering
     
+    def get_queryset(self):
+        """
+        Bentuk queryset sesuai action:
+        - list: cukup kolom komentar (BERITA hanya dipakai sebagai id)
+        - action lain: select_related('BERITA') agar judul/__str__ tidak lazy query
+        ?fields= di list/retrieve mempersempit .only() ke kolom field yang diminta
+        """
+        queryset = super().get_queryset()
+        if self.pakai_serializer_cepat():
+            return queryset  # values_list() di SerializerCepat yang memilih kolom
+        if self.action in ('list', 'retrieve'):
+            kolom = kolom_diminta(
+                self.get_serializer_class(), self.get_serializer_context(), wajib=('tanggal',)
+            )
+            if kolom is not None:
+                return queryset.only(*kolom)
+        if self.action == 'list':
+            return queryset.only('id', 'nama', 'tanggal', 'isi_komentar', 'BERITA')
+        return queryset.select_related('BERITA')
+    
+    serializer_cepat_actions = {'list': KomentarSerializer}
+    
+    throttle_tulis_classes = (KomentarIPThrottle, KomentarBERITAThrottle)
+    
+    bulk_label = 'Komentar'
+    
+    export_fields = ('id', 'nama', 'tanggal', 'isi_komentar', 'BERITA_id')
+    export_nama = 'komentar'
+    
+    def get_bulk_context(self, data):
+        """Muat semua BERITA yang dirujuk sekaligus (satu query untuk validasi FK)"""
+        ids = set()
+        for item in data:
+            try:
+                ids.add(int(item['BERITA']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return {'objek_relasi': {BERITA: BERITA.objects.only('id', 'judul').in_bulk(ids)}}
+    
+    def setelah_bulk_create(self, objs):
+        """bulk_create tidak mengirim signal: update counter, cache dan stream SSE sekali per batch"""
+        sinkronkan_komentar_massal(objs)
+    
+    def setelah_bulk_update(self, objs, nilai_lama):
+        selisih = {}
+        for obj in objs:
+            lama = nilai_lama[obj.pk]['BERITA_id']
+            selisih.setdefault(obj.BERITA_id, 0)
+            if lama != obj.BERITA_id:
+                selisih[lama] = selisih.get(lama, 0) - 1
+                selisih[obj.BERITA_id] += 1
+        self.sinkronkan_setelah_bulk(selisih)
+    
+    def sinkronkan_setelah_bulk(self, selisih):
+        BERITA.ubah_jumlah_komentar(selisih)
+        response_cache.invalidasi(
+            scopes=(response_cache.SCOPE_LIST, response_cache.SCOPE_TERBARU),
+            detail_ids=list(selisih)
+        )
+    
     def get_serializer_class(self):
         """Gunakan serializer berbeda untuk create"""
         if self.action == 'create':
@@ -136,6 +349,16 @@ class KomentarViewSet(viewsets.ModelViewSet):
         """Override create untuk custom response"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        if buffer_komentar.aktif():
+            # Belum ada di database: data tanpa id/tanggal, tampil setelah flush
+            buffer_komentar.tambah(serializer.validated_data)
+            return Response(
+                {
+                    'message': 'Komentar diterima dan akan segera ditampilkan',
+                    'data': serializer.data
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -166,4 +389,15 @@ class KomentarViewSet(viewsets.ModelViewSet):
         return Response(
             {'message': 'Komentar berhasil dihapus'},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+
+
+class CacheStatistikView(APIView):
+    """
+    Statistik hit/miss response cache untuk monitoring
+    Endpoint: GET /api/cache/statistik/ (khusus admin)
+    """
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response(response_cache.statistik())